@@ -0,0 +1,111 @@
+"""
+Benchmark of the Q&A document renderer.
+
+Renders synthetic interviews of 50, 500 and 5,000 Q&A pairs with `DocumentCreator` and
+reports the render and save time and the size of the resulting .docx, next to the old
+per-cell renderer that parsed shading XML and stacked `tcBorders`/`tcMar` elements on
+every cell.
+
+Usage:
+    $ python benchmarks/bench_docx.py --sizes 50 500 5000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.oxml.shared import OxmlElement, qn
+from docx.shared import Pt, RGBColor
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from openinterview.utils.doc_manager import DocumentCreator
+
+
+def synthetic_qa(pairs: int) -> dict:
+    qa_dict = {}
+    for n in range(pairs):
+        qa_dict[f"Q_{n:08x}"] = "Could you explain how you handled the migration? " * 2
+        qa_dict[f"A_{n:08x}"] = "I designed the pipeline and measured each stage. " * 8
+    return qa_dict
+
+
+class LegacyDocumentCreator(DocumentCreator):
+    """The renderer before tables were cloned from a template, kept for comparison."""
+
+    def add_qa_table(self, question, answer):
+        table = self.doc.add_table(rows=2, cols=1, style="Table Grid")
+        for row in table.rows:
+            for cell in row.cells:
+                for key in ["top", "left", "bottom", "right"]:
+                    border = OxmlElement("w:tcBorders")
+                    border_sub = OxmlElement(f"w:{key}OrTblGrid")
+                    border_sub.set(qn("w:val"), "single")
+                    border_sub.set(qn("w:sz"), "7")
+                    border_sub.set(qn("w:color"), "D3D3D3")
+                    border.append(border_sub)
+                    cell._tc.get_or_add_tcPr().append(border)
+
+        for row, text in ((0, "Q: " + question), (1, "A: " + answer)):
+            cell = table.cell(row, 0)
+            cell.text = text
+            tc_pr = cell._tc.get_or_add_tcPr()
+            if row == 0:
+                tc_pr.append(
+                    parse_xml(r'<w:shd {} w:fill="000000"/>'.format(nsdecls("w")))
+                )
+            tc_pr.append(self._margins_element("w:tcMar", 3, 3, 3, 3))
+            for side in ["top", "left", "bottom", "right"]:
+                tc_mar = OxmlElement("w:tcMar")
+                side_mar = OxmlElement(f"w:{side}")
+                side_mar.set(qn("w:w"), "80")
+                side_mar.set(qn("w:type"), "dxa")
+                tc_mar.append(side_mar)
+                tc_pr.append(tc_mar)
+            paragraph = cell.paragraphs[0]
+            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+            self.set_paragraph_spacing(paragraph, line_spacing=1.5)
+            run = paragraph.runs[0]
+            if row == 0:
+                run.font.color.rgb = RGBColor(255, 255, 255)
+            run.font.size = Pt(12)
+            run.font.bold = False
+
+        self.doc.add_paragraph()
+
+
+def bench(name, creator, qa_dict, save_dir):
+    start = time.perf_counter()
+    creator.begin_document("TeamViewer15", 11)
+    creator.add_qa_pairs(qa_dict)
+    rendered = time.perf_counter()
+    path = creator.save_document(save_dir)
+    saved = time.perf_counter()
+    size_kb = os.path.getsize(path) / 1024
+    print(
+        f"{name:<10} {len(qa_dict) // 2:>6} pairs"
+        f"  render={rendered - start:>8.3f}s  save={saved - rendered:>7.3f}s"
+        f"  size={size_kb:>9.1f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Only run the current renderer."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as save_dir:
+        creator = DocumentCreator()
+        legacy_creator = LegacyDocumentCreator()
+        for size in args.sizes:
+            qa_dict = synthetic_qa(size)
+            if not args.skip_legacy:
+                bench("legacy", legacy_creator, qa_dict, save_dir)
+            bench("template", creator, qa_dict, save_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Offline end-to-end benchmark of the interview pipeline.
+
+Runs the pipeline against deterministic fakes: `MockGenerator` stands in for the GPT and
+Claude engines, with seeded latency jitter and a configurable response size, and
+`MockSpeechClient` stands in for text-to-speech. No API credits or network are needed. The
+resume and job description come from `benchmarks/fixtures`. Scenarios:
+
+    single      one interview: prompts, generation, document and voice
+    iterations  one candidate with many generation iterations run concurrently
+    candidates  many candidates through BatchRunner
+    large_qa    a large QA set rendered by DocumentCreator
+
+Each scenario reports throughput, p50/p95 latency per run and the peak Python heap
+(tracemalloc, measured in a separate run so tracing does not skew the timings). Results can
+be saved as a baseline in `benchmarks/baselines/bench_e2e.json` and compared on later runs,
+so regressions show up in review. Timings of the fakes are fixed, so differences come from
+the pipeline itself; large_qa also depends on the CPU.
+
+With `--check`, exits with status 1 if a scenario's throughput drops, or its p95 latency or
+peak memory grows, by more than `--tolerance` against the baseline. Results are only
+comparable with the same workload options, so `--check` also fails if they differ from the
+options the baseline was recorded with; a different Python version only prints a warning.
+
+Usage:
+    $ python benchmarks/bench_e2e.py --save-baseline
+    $ python benchmarks/bench_e2e.py --check
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from typing import Callable, Dict, List
+from openinterview.batch import BatchRunner
+from openinterview.manager import InterviewManager
+from openinterview.models.mock import MockGenerator
+from openinterview.modules.voice.mock import MockSpeechClient
+from openinterview.utils.doc_manager import DocumentCreator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESUME_PATH = os.path.join(BENCH_DIR, "fixtures", "resume.txt")
+JD_PATH = os.path.join(BENCH_DIR, "fixtures", "jd.txt")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines", "bench_e2e.json")
+
+JOB = {
+    "jd": JD_PATH,
+    "resume": RESUME_PATH,
+    "position": "Principal Machine Learning Engineer",
+    "interview_type": "techQAs",
+}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Fakes:
+    """Creates the fake engine and TTS backend of every run from the command line options."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self._seed = 0
+
+    def generator(self) -> MockGenerator:
+        self._seed += 1
+        return MockGenerator(
+            latency=self.args.llm_latency,
+            jitter=self.args.llm_jitter,
+            pairs_per_response=self.args.pairs,
+            answer_sentences=self.args.answer_sentences,
+            seed=self._seed,
+        )
+
+    def speech_client(self) -> MockSpeechClient:
+        self._seed += 1
+        return MockSpeechClient(
+            latency=self.args.tts_latency, jitter=self.args.tts_jitter, seed=self._seed
+        )
+
+    def manager(self) -> InterviewManager:
+        return InterviewManager(
+            api_key=None, engine=self.generator(), speech_client=self.speech_client()
+        )
+
+
+def single(fakes: Fakes, output_dir: str) -> int:
+    fakes.manager().generate_interview(
+        **JOB, output_dir=output_dir, iteration=1, tts_workers=4
+    )
+    return 1
+
+
+def iterations(fakes: Fakes, output_dir: str) -> int:
+    count = fakes.args.iterations
+    fakes.manager().generate_qa(
+        **JOB, output_dir=output_dir, iteration=count, max_workers=4
+    )
+    return count
+
+
+def candidates(fakes: Fakes, output_dir: str) -> int:
+    count = fakes.args.candidates
+    jobs = [dict(JOB, id=f"candidate-{n:03d}") for n in range(count)]
+    runner = BatchRunner(
+        api_key=None,
+        output_dir=output_dir,
+        max_workers=4,
+        tts_workers=4,
+        use_cache=False,
+        manager_factory=fakes.manager,
+    )
+    summary = runner.run(jobs)
+    if summary["failed"]:
+        raise RuntimeError(f"Failed jobs: {summary['failures']}")
+    return count
+
+
+def large_qa(fakes: Fakes, output_dir: str) -> int:
+    generator = MockGenerator(
+        pairs_per_response=fakes.args.large_pairs,
+        answer_sentences=fakes.args.answer_sentences,
+    )
+    qa_dict = generator._postprocess_response(generator.generate_content())
+    DocumentCreator().create_qa_document(qa_dict, "TeamViewer15", 11, output_dir)
+    return len(qa_dict) // 2
+
+
+# Command line options that do not change the measured workload.
+NON_WORKLOAD_OPTIONS = ("scenarios", "baseline", "save_baseline", "check", "tolerance")
+
+
+def workload_options(args: argparse.Namespace) -> Dict[str, object]:
+    return {
+        key: value
+        for key, value in vars(args).items()
+        if key not in NON_WORKLOAD_OPTIONS
+    }
+
+
+def option_mismatches(options: Dict[str, object], baseline: dict) -> List[str]:
+    """Returns the workload options that differ from the baseline's."""
+    recorded = {
+        key: value
+        for key, value in baseline.get("options", {}).items()
+        if key not in NON_WORKLOAD_OPTIONS
+    }
+    return [
+        f"{key}: baseline {recorded.get(key)!r}, current {options.get(key)!r}"
+        for key in sorted(set(recorded) | set(options))
+        if recorded.get(key) != options.get(key)
+    ]
+
+
+# Scenario -> (function returning the units it processed, unit name).
+SCENARIOS: Dict[str, tuple] = {
+    "single": (single, "interviews"),
+    "iterations": (iterations, "iterations"),
+    "candidates": (candidates, "candidates"),
+    "large_qa": (large_qa, "pairs"),
+}
+
+
+def run_once(func: Callable[[Fakes, str], int], fakes: Fakes) -> tuple:
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(
+        io.StringIO()
+    ):
+        start = time.perf_counter()
+        units = func(fakes, output_dir)
+        return units, time.perf_counter() - start
+
+
+def bench(name: str, fakes: Fakes, runs: int) -> Dict[str, float]:
+    func, unit = SCENARIOS[name]
+    run_once(func, fakes)  # Warm up imports and caches.
+    latencies = []
+    units = 0
+    for _ in range(runs):
+        run_units, seconds = run_once(func, fakes)
+        units += run_units
+        latencies.append(seconds)
+
+    tracemalloc.start()
+    try:
+        run_once(func, fakes)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "unit": unit,
+        "throughput": round(units / sum(latencies), 3),
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float):
+    """Prints the change against the baseline and returns the regressions."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        checks = (
+            ("throughput", -1),
+            ("p95_s", 1),
+            ("peak_mib", 1),
+        )
+        changes = []
+        for key, direction in checks:
+            if not base[key]:
+                continue
+            change = result[key] / base[key] - 1
+            changes.append(f"{key} {change:+.1%}")
+            if change * direction > tolerance:
+                regressions.append(f"{name}: {key} {base[key]} -> {result[key]}")
+        print(f"  {name:<12} vs baseline: {', '.join(changes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--llm-jitter", type=float, default=0.02)
+    parser.add_argument("--tts-latency", type=float, default=0.01)
+    parser.add_argument("--tts-jitter", type=float, default=0.005)
+    parser.add_argument("--pairs", type=int, default=5, help="Q/A pairs per response.")
+    parser.add_argument("--answer-sentences", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=16)
+    parser.add_argument("--large-pairs", type=int, default=2000)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write the results as baseline."
+    )
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    fakes = Fakes(args)
+    results = {}
+    for name in args.scenarios:
+        result = bench(name, fakes, args.runs)
+        results[name] = result
+        print(
+            f"{name:<12} {result['throughput']:>10.2f} {result['unit']}/s"
+            f"  p50={result['p50_s']:>7.3f}s  p95={result['p95_s']:>7.3f}s"
+            f"  peak={result['peak_mib']:>7.2f} MiB"
+        )
+
+    regressions = []
+    options = workload_options(args)
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        python = ".".join(platform.python_version_tuple()[:2])
+        if not baseline.get("python", "").startswith(python + "."):
+            print(
+                f"Warning: the baseline was recorded on Python {baseline.get('python')},"
+                f" this is Python {platform.python_version()}."
+            )
+        mismatches = option_mismatches(options, baseline)
+        if mismatches:
+            print("Options differ from the baseline:\n  " + "\n  ".join(mismatches))
+            if args.check:
+                sys.exit("Cannot check against a baseline recorded with other options.")
+        regressions = compare(results, baseline["scenarios"], args.tolerance)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "options": options,
+                    "scenarios": results,
+                },
+                f,
+                indent=4,
+            )
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check and regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Import-time benchmark and regression guard.
+
+Imports openinterview entry points in fresh interpreters and reports the median import
+time and the heavy third-party modules each one loaded. `import openinterview` must not
+load any of them, and each public attribute may only load the dependencies of its own
+feature, e.g. `GptGenerator` loads openai but not anthropic, docx or pygame.
+
+With `--check`, exits with status 1 if an entry point loads a module it should not, fails
+to import, or if the bare package import takes longer than `--max-ms`. An entry point is
+only skipped when one of the heavy modules it is allowed to load is not installed.
+
+Usage:
+    $ python benchmarks/bench_import.py --repeat 5 --check
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from statistics import median
+
+HEAVY_MODULES = (
+    "openai",
+    "anthropic",
+    "aiohttp",
+    "httpx",
+    "requests",
+    "docx",
+    "lxml",
+    "gtts",
+    "speech_recognition",
+    "PyPDF2",
+    "pygame",
+    "IPython",
+)
+
+# Entry point -> the heavy modules it is allowed to load.
+ENTRY_POINTS = {
+    "import openinterview": (),
+    "import openinterview.cli": (),
+    "from openinterview import InterviewManager": (),
+    "from openinterview import create_system_prompt": (),
+    "from openinterview import load_file_content": (),
+    "from openinterview import LiveInterview": (),
+    "from openinterview.utils.exporters import export_qa": (),
+    "from openinterview import GptGenerator": ("openai", "aiohttp", "requests"),
+    "from openinterview import ClaudeGenerator": ("anthropic", "httpx", "aiohttp"),
+    "from openinterview import DocumentCreator": ("docx", "lxml"),
+    "from openinterview import google_tts": ("gtts", "requests"),
+}
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+try:
+    {statement}
+except ModuleNotFoundError as e:
+    print(json.dumps({{"missing": e.name}}))
+    raise SystemExit(0)
+elapsed = time.perf_counter() - start
+heavy = {heavy!r}
+loaded = sorted({{name.split(".")[0] for name in sys.modules}} & set(heavy))
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def probe(statement: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=100.0,
+        help="The budget of the bare `import openinterview` with --check.",
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Exit with status 1 on a regression."
+    )
+    args = parser.parse_args()
+
+    failures = []
+    for statement, allowed in ENTRY_POINTS.items():
+        try:
+            runs = [probe(statement) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"{statement:<55} failed: {error}")
+            failures.append(f"{statement} failed: {error}")
+            continue
+        missing = runs[0].get("missing")
+        if missing is not None:
+            print(f"{statement:<55} missing module {missing}")
+            # A missing dependency only skips the entry points that may load it.
+            if missing.split(".")[0] not in allowed:
+                failures.append(f"{statement} failed: No module named {missing!r}")
+            continue
+        milliseconds = median(run["seconds"] for run in runs) * 1000
+        unexpected = sorted(set(runs[0]["loaded"]) - set(allowed))
+        print(
+            f"{statement:<55} {milliseconds:>9.1f} ms"
+            f"  loaded={','.join(runs[0]['loaded']) or '-'}"
+        )
+        if unexpected:
+            failures.append(f"{statement} loaded {', '.join(unexpected)}")
+        if statement == "import openinterview" and milliseconds > args.max_ms:
+            failures.append(
+                f"{statement} took {milliseconds:.1f} ms (budget {args.max_ms:.0f} ms)"
+            )
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
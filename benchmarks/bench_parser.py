@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of the Q/A response parser.
+
+Runs `parse_qa_response` over a corpus of recorded model responses and reports the
+parse time and the number of recovered entries, next to a strict `ast.literal_eval`
+of the whole response (the behavior of the old eval-based `_postprocess_response`).
+
+The corpus can be a `ResponseCache` directory or a directory of `.txt` responses. Without
+`--corpus`, a synthetic corpus of well-formed, fenced, truncated and malformed responses is used.
+
+Usage:
+    $ python benchmarks/bench_parser.py --corpus .openinterview/responses --repeat 200
+"""
+
+import os
+import ast
+import json
+import time
+import random
+import argparse
+from typing import List
+from openinterview.utils.parser import parse_qa_response
+
+
+def load_corpus(corpus_dir: str) -> List[str]:
+    responses = []
+    for root, _, files in os.walk(corpus_dir):
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            if file.endswith(".json"):
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if isinstance(entry, dict) and isinstance(entry.get("response"), str):
+                    responses.append(entry["response"])
+            elif file.endswith(".txt"):
+                with open(path, "r", encoding="utf-8") as f:
+                    responses.append(f.read())
+    return responses
+
+
+def synthetic_corpus(size: int = 200, pairs: int = 10, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    responses = []
+    for n in range(size):
+        qa_dict = {}
+        for _ in range(pairs):
+            hex_code = f"{rng.getrandbits(32):08x}"
+            qa_dict[f"Q_{hex_code}"] = "Could you explain how you handled it? " * 2
+            qa_dict[f"A_{hex_code}"] = "I designed the pipeline and measured it. " * 10
+        text = repr(qa_dict)
+        kind = n % 4
+        if kind == 1:
+            text = f"Here is the result:\n```python\n{text}\n```"
+        elif kind == 2:
+            text = text[: int(len(text) * 0.8)]
+        elif kind == 3:
+            text = text.replace("', '", "' '", 1)
+        responses.append(text)
+    return responses
+
+
+def strict_parse(response_text: str) -> dict:
+    try:
+        parsed = ast.literal_eval(response_text)
+        return parsed if isinstance(parsed, dict) else {}
+    except (SyntaxError, ValueError):
+        return {}
+
+
+def bench(name, func, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(text) for text in corpus]
+    elapsed = time.perf_counter() - start
+    entries = sum(len(result) for result in results)
+    failures = sum(1 for result in results if not result)
+    per_response_us = elapsed / (repeat * len(corpus)) * 1e6
+    print(
+        f"{name:<20} {per_response_us:>10.1f} us/response"
+        f"  entries={entries:<7} empty={failures}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="ResponseCache directory or .txt responses.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        raise SystemExit(f"No responses found in {args.corpus}")
+    print(f"{len(corpus)} responses, {sum(map(len, corpus))} characters")
+    bench("strict literal_eval", strict_parse, corpus, args.repeat)
+    bench("parse_qa_response", parse_qa_response, corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,30 @@
-from .models.gpt import GptGenerator
-from .models.claude import ClaudeGenerator
+# Attributes are imported on first access, so `import openinterview` does not load
+# openai, anthropic, docx, gtts or pygame until the feature that needs them is used.
+from openinterview.utils.lazy import lazy_attributes
 
-from .manager import InterviewManager
-
-from .utils.doc_manager import DocumentCreator
-from .utils.file_manager import load_file_content
-from .utils.prompter import create_system_prompt, create_base_prompt
-
-from .modules.voice.random_play import RandomPlayer
-from .modules.voice.google import google_tts, google_stt, save_google_tts
-
-try:
-    from openinterview.modules.voice.openai import openai_tts, openai_stt
-except ImportError:
-    pass
+_LAZY_ATTRIBUTES = {
+    "GptGenerator": ".models.gpt",
+    "ClaudeGenerator": ".models.claude",
+    "MockGenerator": ".models.mock",
+    "EngineRouter": ".models.router",
+    "register_engine": ".models.registry",
+    "AsyncInterviewManager": ".manager",
+    "InterviewManager": ".manager",
+    "LiveInterview": ".live",
+    "DocumentCreator": ".utils.doc_manager",
+    "load_file_content": ".utils.file_manager",
+    "create_system_prompt": ".utils.prompter",
+    "create_base_prompt": ".utils.prompter",
+    "RandomPlayer": ".modules.voice.random_play",
+    "google_tts": ".modules.voice.google",
+    "google_stt": ".modules.voice.google",
+    "save_google_tts": ".modules.voice.google",
+    "openai_tts": ".modules.voice.openai",
+    "openai_stt": ".modules.voice.openai",
+}
 
+__all__ = list(_LAZY_ATTRIBUTES)
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
 
 __version__ = "1.0.13"
 __author__ = "daniel park <parkminwoo1991@gmail.com>"
@@ -0,0 +1,4 @@
+import sys
+from openinterview.cli import main
+
+sys.exit(main())
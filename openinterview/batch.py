@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+from .manager import InterviewManager
+from .utils.cache import ResponseCache
+
+REQUIRED_FIELDS = ("jd", "resume", "position", "interview_type")
+STAGES = ("qa", "document", "voice")
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, Any]]:
+    """
+    Loads a JSONL manifest with one interview job per line.
+
+    Each job needs 'jd', 'resume', 'position' and 'interview_type', and may set 'language',
+    'max_sentence', 'iteration' and an 'id'. Jobs without an id get one derived from their content.
+
+    Args:
+        manifest_path (str): The path of the JSONL manifest.
+
+    Returns:
+        List[Dict[str, Any]]: The jobs, each with an 'id'.
+
+    Raises:
+        ValueError: If a line is not a JSON object, a required field is missing, or two jobs share an id.
+    """
+    jobs = []
+    seen: Set[str] = set()
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError(f"Line {line_number}: a job must be a JSON object.")
+            missing = [field for field in REQUIRED_FIELDS if not job.get(field)]
+            if missing:
+                raise ValueError(
+                    f"Line {line_number}: missing required field(s) {', '.join(missing)}."
+                )
+            job = dict(job)
+            job["id"] = str(job.get("id") or job_id(job))
+            if job["id"] in seen:
+                raise ValueError(f"Line {line_number}: duplicate job id '{job['id']}'.")
+            seen.add(job["id"])
+            jobs.append(job)
+    return jobs
+
+
+def job_id(job: Dict[str, Any]) -> str:
+    """Returns a stable id derived from the content of a job."""
+    payload = json.dumps(
+        {key: value for key, value in job.items() if key != "id"},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BatchRunner:
+    """
+    Runs many interview jobs on a worker pool with checkpoint/resume.
+
+    Every finished stage of a job ('qa', 'document', 'voice') is appended to
+    `output_dir/checkpoint.jsonl`. A rerun with the same output directory skips finished jobs
+    and resumes partially finished ones from their next stage; the generated QA dictionary is
+    reloaded from `output_dir/<job id>/qa.json`. API responses are also kept in a
+    `ResponseCache` under `output_dir/.cache`, so a job interrupted during generation does not
+    pay again for the iterations it already received.
+
+    Attributes:
+        api_key (Union[str, Dict[str, str]]): The API key, or the key of each engine, passed to each InterviewManager.
+        engine (Union[str, List[str]]): The engine, or the engines to route between, passed to each InterviewManager.
+            Routed jobs share the process-wide engine statistics, so later jobs avoid a slow or failing provider.
+        output_dir (str): The root directory of job outputs and the checkpoint.
+        max_workers (int): The number of jobs run concurrently.
+        iteration (int): The default number of iterations per job.
+        tts_workers (int): The number of audio clips synthesized concurrently per job.
+        audio_archive (bool): Pack each job's audio into `voice/voice.oiva` instead of separate mp3 files.
+        speech_client (Optional[SpeechClient]): An OpenAI speech client shared by all jobs to voice them instead of gTTS.
+        manager_factory (Callable[[], InterviewManager]): Creates the InterviewManager of each job.
+        usage (Dict[str, int]): The engine token usage summed over the jobs of the last run, including
+            prompt cache reads and writes when the engine reports them.
+    """
+
+    def __init__(
+        self,
+        api_key: Union[str, Dict[str, str]],
+        engine: Union[str, List[str]] = "GPT",
+        output_dir: str = "batch_output",
+        max_workers: int = 4,
+        iteration: int = 1,
+        tts_workers: int = 4,
+        use_cache: bool = True,
+        manager_factory: Optional[Callable[[], InterviewManager]] = None,
+        prompt_caching: bool = False,
+        routing_policy: str = "failover",
+        audio_archive: bool = False,
+        speech_client=None,
+    ) -> None:
+        self.api_key = api_key
+        self.engine = engine
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.iteration = iteration
+        self.tts_workers = tts_workers
+        self.audio_archive = audio_archive
+        self.speech_client = speech_client
+        self.cache = (
+            ResponseCache(os.path.join(output_dir, ".cache")) if use_cache else None
+        )
+        self.manager_factory = manager_factory or (
+            lambda: InterviewManager(
+                api_key=self.api_key,
+                engine=self.engine,
+                cache=self.cache,
+                prompt_caching=prompt_caching,
+                routing_policy=routing_policy,
+                speech_client=self.speech_client,
+            )
+        )
+        self.checkpoint_path = os.path.join(output_dir, "checkpoint.jsonl")
+        self.usage: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def load_checkpoint(self) -> Dict[str, Set[str]]:
+        """
+        Returns the finished stages of every job recorded in the checkpoint.
+        """
+        done: Dict[str, Set[str]] = {}
+        if not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash.
+                if record.get("status") == "done":
+                    done.setdefault(record["job_id"], set()).add(record["stage"])
+        return done
+
+    def run(self, jobs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Runs all jobs that are not finished yet and returns a throughput and latency summary.
+
+        Args:
+            jobs (Iterable[Dict[str, Any]]): Jobs as returned by `load_manifest`.
+
+        Returns:
+            Dict[str, Any]: The summary with job counts, failures, wall time, throughput and per-job latency.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        done = self.load_checkpoint()
+        jobs = list(jobs)
+        pending = [job for job in jobs if not set(STAGES) <= done.get(job["id"], set())]
+        latencies: List[float] = []
+        failures: Dict[str, str] = {}
+        self.usage = {}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            futures = {
+                executor.submit(self._run_job, job, done.get(job["id"], set())): job
+                for job in pending
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    latencies.append(future.result())
+                    print(f"[done] {job['id']}")
+                except Exception as e:
+                    failures[job["id"]] = f"{type(e).__name__}: {e}"
+                    print(f"[failed] {job['id']}: {failures[job['id']]}")
+        wall_time = time.perf_counter() - start
+
+        summary = {
+            "total": len(jobs),
+            "skipped": len(jobs) - len(pending),
+            "completed": len(latencies),
+            "failed": len(failures),
+            "failures": failures,
+            "wall_time_s": round(wall_time, 3),
+            "throughput_jobs_per_min": (
+                round(len(latencies) / wall_time * 60, 3) if wall_time > 0 else 0.0
+            ),
+            "latency_s": {
+                "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                "p50": round(_percentile(latencies, 50), 3),
+                "p95": round(_percentile(latencies, 95), 3),
+                "max": round(max(latencies), 3) if latencies else 0.0,
+            },
+            "usage": dict(self.usage),
+        }
+        with open(
+            os.path.join(self.output_dir, "summary.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(summary, f, ensure_ascii=False, indent=4)
+        return summary
+
+    def _run_job(self, job: Dict[str, Any], done_stages: Set[str]) -> float:
+        start = time.perf_counter()
+        job_dir = os.path.join(self.output_dir, job["id"])
+        qa_path = os.path.join(job_dir, "qa.json")
+        language = job.get("language", "English")
+        manager = self.manager_factory()
+        try:
+            self._run_stages(
+                job, done_stages, manager, job_dir, qa_path, language, start
+            )
+        finally:
+            with self._lock:
+                for field, value in getattr(manager, "usage", {}).items():
+                    self.usage[field] = self.usage.get(field, 0) + value
+        return time.perf_counter() - start
+
+    def _run_stages(
+        self,
+        job: Dict[str, Any],
+        done_stages: Set[str],
+        manager: InterviewManager,
+        job_dir: str,
+        qa_path: str,
+        language: str,
+        start: float,
+    ) -> None:
+        if "qa" in done_stages and os.path.exists(qa_path):
+            with open(qa_path, "r", encoding="utf-8") as f:
+                qa_dict = json.load(f)
+        else:
+            qa_dict = manager.generate_qa(
+                jd=job["jd"],
+                resume=job["resume"],
+                position=job["position"],
+                interview_type=job["interview_type"],
+                language=language,
+                max_sentence=job.get("max_sentence", 6),
+                output_dir=job_dir,
+                iteration=job.get("iteration", self.iteration),
+            )
+            os.makedirs(job_dir, exist_ok=True)
+            tmp_path = qa_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(qa_dict, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, qa_path)
+            self._checkpoint(job["id"], "qa", start)
+
+        if "document" not in done_stages:
+            stage_start = time.perf_counter()
+            manager.create_document(qa_dict, job_dir)
+            self._checkpoint(job["id"], "document", stage_start)
+
+        if "voice" not in done_stages:
+            stage_start = time.perf_counter()
+            manager.create_voice(
+                qa_dict, job_dir, language, self.tts_workers, self.audio_archive
+            )
+            self._checkpoint(job["id"], "voice", stage_start)
+
+    def _checkpoint(self, job_id: str, stage: str, stage_start: float) -> None:
+        record = {
+            "job_id": job_id,
+            "stage": stage,
+            "status": "done",
+            "elapsed_s": round(time.perf_counter() - stage_start, 3),
+            "time": time.time(),
+        }
+        with self._lock:
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import argparse
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="open-interview", description="Open Interview command line tools."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="Run interview jobs from a JSONL manifest with checkpoint/resume.",
+        description="Each manifest line is a JSON object with jd, resume, position, interview_type "
+        "and optionally language, max_sentence, iteration and id. Rerunning with the same "
+        "output directory skips finished jobs and resumes partially finished ones.",
+    )
+    batch.add_argument("manifest", help="Path of the JSONL manifest.")
+    batch.add_argument(
+        "--engine",
+        default="GPT",
+        help="'GPT', 'Claude', 'Gemini' or 'Mock'. Several comma-separated engines, e.g. 'Claude,GPT', "
+        "are routed with --routing-policy.",
+    )
+    batch.add_argument(
+        "--routing-policy",
+        default="failover",
+        choices=["fastest", "cheapest", "failover"],
+        help="How requests are spread over several engines.",
+    )
+    batch.add_argument(
+        "--api-key",
+        default=None,
+        help="API key of a single engine. Defaults to $OPENAI_API_KEY, $ANTHROPIC_API_KEY or $GOOGLE_API_KEY "
+        "depending on the engine.",
+    )
+    batch.add_argument("--output-dir", default="batch_output")
+    batch.add_argument("--workers", type=int, default=4, help="Jobs run concurrently.")
+    batch.add_argument("--iteration", type=int, default=1)
+    batch.add_argument("--tts-workers", type=int, default=4)
+    batch.add_argument(
+        "--audio-archive",
+        action="store_true",
+        help="Pack each job's audio into one indexed archive instead of separate mp3 files.",
+    )
+    batch.add_argument(
+        "--voice",
+        default=None,
+        help="Voice the interviews with this OpenAI voice, e.g. 'nova', instead of gTTS. Uses $OPENAI_API_KEY.",
+    )
+    batch.add_argument(
+        "--no-cache", action="store_true", help="Do not cache API responses."
+    )
+    batch.add_argument(
+        "--prompt-caching",
+        action="store_true",
+        help="Cache the system prompt on Anthropic's side (Claude only).",
+    )
+    return parser
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    from .batch import BatchRunner, load_manifest
+    from .models.registry import get_engine
+
+    engines = [name.strip() for name in args.engine.split(",") if name.strip()]
+    api_keys = {}
+    for name in engines:
+        try:
+            spec = get_engine(name)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        api_key = (args.api_key if len(engines) == 1 else None) or os.environ.get(
+            spec.api_key_env or "", ""
+        )
+        if spec.api_key_env and not api_key:
+            print(
+                f"An API key is required for {spec.name}: pass --api-key or set ${spec.api_key_env}.",
+                file=sys.stderr,
+            )
+            return 2
+        api_keys[name] = api_key or None
+
+    speech_client = None
+    if args.voice:
+        from .modules.voice.openai import SpeechClient
+
+        try:
+            speech_client = SpeechClient(
+                voice=args.voice, pool_size=args.workers * args.tts_workers
+            )
+        except ValueError as e:
+            print(f"--voice needs $OPENAI_API_KEY: {e}", file=sys.stderr)
+            return 2
+
+    runner = BatchRunner(
+        api_key=api_keys[engines[0]] if len(engines) == 1 else api_keys,
+        engine=engines[0] if len(engines) == 1 else engines,
+        routing_policy=args.routing_policy,
+        output_dir=args.output_dir,
+        max_workers=args.workers,
+        iteration=args.iteration,
+        tts_workers=args.tts_workers,
+        audio_archive=args.audio_archive,
+        speech_client=speech_client,
+        use_cache=not args.no_cache,
+        prompt_caching=args.prompt_caching,
+    )
+    summary = runner.run(load_manifest(args.manifest))
+    print(json.dumps(summary, ensure_ascii=False, indent=4))
+    return 1 if summary["failed"] else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        return run_batch(args)
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
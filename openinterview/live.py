@@ -0,0 +1,502 @@
+import io
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from .utils.parser import parse_qa_response
+
+FOLLOW_UP_SYSTEM_PROMPT = (
+    "You are a professional interviewer running a live mock interview. Ask exactly one short, "
+    "specific follow-up question. Reply with one Python dictionary of the form "
+    '{"Q_<8 hex digits>": "<follow-up question>", "A_<same hex digits>": "<a strong answer>"}.'
+)
+
+
+class LiveTurn(NamedTuple):
+    """
+    One question of a live interview and the candidate's answer.
+
+    `source` is 'queue' for the prepared questions, 'follow-up' for a follow-up generated from
+    the answer, and 'speculative' for a follow-up prepared from the question alone while the
+    candidate was answering. `gap` is the silence in seconds between the end of the previous
+    answer and the start of this question, None for the first question.
+    """
+
+    index: int
+    question: str
+    source: str
+    answer: str
+    gap: Optional[float]
+    over_budget: bool
+
+
+class ScriptedSpeech:
+    """
+    An offline speech backend that plays a scripted candidate, for tests and demos.
+
+    Synthesized audio is the UTF-8 text itself, and each recording returns the next scripted
+    answer, so a whole session runs without a microphone, speakers or network.
+
+    Example:
+    >>> speech = ScriptedSpeech(["I led the migration."])
+    >>> speech.transcribe(speech.record())
+    'I led the migration.'
+
+    Attributes:
+        answers (List[str]): The answers given in turn; later recordings are empty.
+        tts_latency (float): The seconds synthesis takes.
+        stt_latency (float): The seconds transcription takes.
+        play_seconds (float): The seconds playback of each question takes.
+        answer_seconds (float): The seconds the candidate answers.
+        played (List[str]): The questions played so far.
+    """
+
+    def __init__(
+        self,
+        answers: Sequence[str] = (),
+        tts_latency: float = 0.0,
+        stt_latency: float = 0.0,
+        play_seconds: float = 0.0,
+        answer_seconds: float = 0.0,
+    ) -> None:
+        self.answers = list(answers)
+        self.tts_latency = tts_latency
+        self.stt_latency = stt_latency
+        self.play_seconds = play_seconds
+        self.answer_seconds = answer_seconds
+        self.played: List[str] = []
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str) -> bytes:
+        time.sleep(self.tts_latency)
+        return text.encode("utf-8")
+
+    def play(self, audio: bytes) -> None:
+        self.played.append(audio.decode("utf-8"))
+        time.sleep(self.play_seconds)
+
+    def record(self) -> bytes:
+        time.sleep(self.answer_seconds)
+        with self._lock:
+            return self.answers.pop(0).encode("utf-8") if self.answers else b""
+
+    def transcribe(self, audio: bytes) -> str:
+        time.sleep(self.stt_latency)
+        return audio.decode("utf-8")
+
+
+class MicrophoneSpeech:
+    """
+    The base of live speech backends: records answers from the microphone and plays audio with pygame.
+
+    Subclasses provide `synthesize(text) -> bytes` and `transcribe(audio) -> str`. Recording needs
+    PyAudio for `speech_recognition.Microphone`.
+
+    Attributes:
+        pause_threshold (float): The seconds of silence that end an answer.
+        answer_timeout (Optional[float]): The seconds to wait for the candidate to start speaking.
+        max_answer_seconds (Optional[float]): The longest answer recorded.
+    """
+
+    def __init__(
+        self,
+        pause_threshold: float = 2.0,
+        answer_timeout: Optional[float] = 20.0,
+        max_answer_seconds: Optional[float] = 300.0,
+    ) -> None:
+        self.pause_threshold = pause_threshold
+        self.answer_timeout = answer_timeout
+        self.max_answer_seconds = max_answer_seconds
+        self._backend = None
+
+    def play(self, audio: bytes) -> None:
+        from .modules.voice.random_play import PygameBackend
+
+        if self._backend is None:
+            self._backend = PygameBackend()
+        duration = self._backend.play(self._backend.load(audio))
+        time.sleep(duration)
+
+    def record(self) -> Any:
+        """Returns the recorded answer as `speech_recognition.AudioData`, or None if the candidate stayed silent."""
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        recognizer.pause_threshold = self.pause_threshold
+        with sr.Microphone() as source:
+            try:
+                return recognizer.listen(
+                    source,
+                    timeout=self.answer_timeout,
+                    phrase_time_limit=self.max_answer_seconds,
+                )
+            except sr.WaitTimeoutError:
+                return None
+
+
+class GoogleSpeech(MicrophoneSpeech):
+    """
+    Live speech with gTTS and the Google Web Speech API.
+
+    Long answers are split at pauses and transcribed concurrently, see `iter_transcription`.
+    """
+
+    def __init__(
+        self, lang: str = "en", language: str = "en-US", max_workers: int = 4, **kwargs
+    ) -> None:
+        super().__init__(**kwargs)
+        self.lang = lang
+        self.language = language
+        self.max_workers = max_workers
+
+    def synthesize(self, text: str) -> bytes:
+        from .modules.voice.google import google_tts_bytes
+
+        return google_tts_bytes(text, lang=self.lang)
+
+    def transcribe(self, audio: Any) -> str:
+        from .modules.voice.transcribe import (
+            google_recognizer,
+            iter_transcribe_chunks,
+            split_on_silence,
+            stitch_transcript,
+        )
+
+        if audio is None:
+            return ""
+        chunks = split_on_silence(
+            audio.get_raw_data(convert_width=2), audio.sample_rate
+        )
+        return stitch_transcript(
+            iter_transcribe_chunks(
+                chunks, google_recognizer(self.language), self.max_workers
+            )
+        )
+
+
+class OpenAISpeech(MicrophoneSpeech):
+    """
+    Live speech with OpenAI voices and transcription through a pooled SpeechClient.
+    """
+
+    def __init__(self, client: Optional[Any] = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        if client is None:
+            from .modules.voice.openai import SpeechClient
+
+            client = SpeechClient()
+        self.client = client
+
+    def synthesize(self, text: str) -> bytes:
+        return self.client.synthesize(text)
+
+    def transcribe(self, audio: Any) -> str:
+        if audio is None:
+            return ""
+        wav = io.BytesIO(audio.get_wav_data())
+        wav.name = "answer.wav"
+        return self.client.transcribe(wav).strip()
+
+
+class LiveInterview:
+    """
+    Runs a spoken mock interview in real time: play a question, record and transcribe the answer,
+    and ask a follow-up generated from it or the next prepared question.
+
+    Turns are planned against a latency budget, the longest silence allowed between the end of
+    an answer and the next question. While the candidate answers, the next prepared question
+    is synthesized and a likely follow-up is generated from the question alone and synthesized,
+    so both are ready when the answer ends. The follow-up tailored to the transcribed answer is
+    used only if it is ready within the budget; otherwise the speculative follow-up, or the next
+    prepared question, starts at once and the tailored one is discarded.
+
+    Example:
+    >>> from openinterview.models.mock import MockGenerator
+    >>> speech = ScriptedSpeech(["I sharded the database.", "By customer id.", "I mentor juniors.", "Weekly pairing."])
+    >>> session = LiveInterview(MockGenerator(), speech, ["Tell me about a migration.", "How do you grow others?"])
+    >>> [turn.source for turn in session.run()]
+    ['queue', 'follow-up', 'queue', 'follow-up']
+
+    Attributes:
+        generator: The engine generating follow-ups, e.g. GptGenerator or MockGenerator.
+        speech: The speech backend with `synthesize`, `play`, `record` and `transcribe`, e.g.
+            GoogleSpeech, OpenAISpeech or ScriptedSpeech.
+        questions (List[str]): The prepared questions, asked in order.
+        budget (float): The seconds allowed between an answer and the next question.
+        max_followups (int): The follow-ups asked per prepared question.
+        prefetch_followups (bool): Whether to prepare a follow-up while the candidate answers.
+        max_turns (Optional[int]): The maximum number of questions asked.
+        system_prompt (str): The system prompt of follow-up requests.
+        turns (List[LiveTurn]): The turns of the last run.
+    """
+
+    def __init__(
+        self,
+        generator: Any,
+        speech: Any,
+        questions: Union[Dict[str, str], Sequence[str]],
+        budget: float = 1.0,
+        max_followups: int = 1,
+        prefetch_followups: bool = True,
+        max_turns: Optional[int] = None,
+        system_prompt: str = FOLLOW_UP_SYSTEM_PROMPT,
+        on_turn: Optional[Callable[[LiveTurn], None]] = None,
+        max_workers: int = 4,
+    ) -> None:
+        """
+        Args:
+            generator: The engine generating follow-ups.
+            speech: The speech backend.
+            questions (Union[Dict[str, str], Sequence[str]]): The prepared questions, or a QA dictionary whose questions are asked.
+            budget (float, optional): The seconds allowed between an answer and the next question. Defaults to 1.
+            max_followups (int, optional): The follow-ups asked per prepared question; 0 disables them. Defaults to 1.
+            prefetch_followups (bool, optional): Prepare a follow-up while the candidate answers. Defaults to True.
+            max_turns (int, optional): The maximum number of questions asked. Defaults to None (all).
+            system_prompt (str, optional): The system prompt of follow-up requests.
+            on_turn (Callable[[LiveTurn], None], optional): Called with each finished turn.
+            max_workers (int, optional): The threads preparing audio and follow-ups in the background. Defaults to 4.
+        """
+        if isinstance(questions, dict):
+            questions = [text for key, text in questions.items() if key.startswith("Q")]
+        self.generator = generator
+        self.speech = speech
+        self.questions = list(questions)
+        self.budget = budget
+        self.max_followups = max_followups
+        self.prefetch_followups = prefetch_followups
+        self.max_turns = max_turns
+        self.system_prompt = system_prompt
+        self.on_turn = on_turn
+        self.max_workers = max_workers
+        self.turns: List[LiveTurn] = []
+        self._stopped = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._audio: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Moving average of the seconds from the end of an answer to its follow-up being ready.
+        self._tailored_seconds: Optional[float] = None
+
+    def run(self) -> List[LiveTurn]:
+        """
+        Runs the interview until the prepared questions and their follow-ups are asked, `max_turns`
+        is reached or `stop` is called.
+
+        Returns:
+            List[LiveTurn]: The turns, in order.
+        """
+        self.turns = []
+        self._stopped.clear()
+        self._audio = {}
+        queue = list(self.questions)
+        if not queue:
+            return self.turns
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            try:
+                self._run(queue)
+            finally:
+                self._executor = None
+        return self.turns
+
+    def stop(self) -> None:
+        """Ends the interview after the current turn."""
+        self._stopped.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the gap statistics of the last run.
+
+        Returns:
+            Dict[str, Any]: The number of turns, the median and maximum gap in seconds, and the
+            number of gaps over budget.
+        """
+        gaps = sorted(turn.gap for turn in self.turns if turn.gap is not None)
+        return {
+            "turns": len(self.turns),
+            "p50_gap": gaps[len(gaps) // 2] if gaps else None,
+            "max_gap": gaps[-1] if gaps else None,
+            "over_budget": sum(turn.over_budget for turn in self.turns),
+        }
+
+    def _run(self, queue: List[str]) -> None:
+        question, source = queue.pop(0), "queue"
+        audio = self._synthesize(question)
+        followups = 0
+        answer_end: Optional[float] = None
+        previous: Optional[Tuple[str, str, Future, Optional[float]]] = None
+        while True:
+            if queue:
+                # The next prepared question is synthesized during this turn.
+                self._synthesize(queue[0])
+            speculative = None
+            if self.prefetch_followups and followups < self.max_followups:
+                speculative = self._submit(self._prepare_followup, question, None)
+
+            clip = audio.result()
+            gap = None if answer_end is None else time.perf_counter() - answer_end
+            self.speech.play(clip)
+            # The previous answer is transcribed by now; recording it never delays a question.
+            if previous is not None:
+                self._finish_turn(*previous)
+            recording = self.speech.record()
+            answer_end = time.perf_counter()
+            transcript = self._submit(self.speech.transcribe, recording)
+            previous = (question, source, transcript, gap)
+
+            next_turn = None
+            if not self._stopped.is_set() and not self._turn_limit_reached():
+                next_turn = self._choose_next(
+                    question, transcript, speculative, queue, followups, answer_end
+                )
+            if next_turn is None:
+                self._finish_turn(*previous)
+                return
+            question, source, audio = next_turn
+            followups = 0 if source == "queue" else followups + 1
+
+    def _choose_next(
+        self,
+        question: str,
+        transcript: Future,
+        speculative: Optional[Future],
+        queue: List[str],
+        followups: int,
+        answer_end: float,
+    ) -> Optional[Tuple[str, str, Future]]:
+        if followups < self.max_followups:
+            tailored = self._submit(
+                self._prepare_tailored, question, transcript, answer_end
+            )
+            if (
+                self._tailored_seconds is not None
+                and self._tailored_seconds > self._wait_budget
+            ):
+                # Recent follow-ups missed the budget; do not keep the candidate waiting.
+                timeout = 0.0
+            else:
+                timeout = self._wait_budget - (time.perf_counter() - answer_end)
+            prepared = self._result(tailored, max(timeout, 0.0))
+            if prepared is not None:
+                return prepared[0], "follow-up", prepared[1]
+            # With no prepared question left, the follow-ups are worth waiting for.
+            if speculative is not None and (speculative.done() or not queue):
+                prepared = self._result(speculative)
+                if prepared is not None:
+                    return prepared[0], "speculative", prepared[1]
+            if not queue:
+                prepared = self._result(tailored)
+                if prepared is not None:
+                    return prepared[0], "follow-up", prepared[1]
+        if queue:
+            question = queue.pop(0)
+            return question, "queue", self._synthesize(question)
+        return None
+
+    @staticmethod
+    def _result(future: Future, timeout: Optional[float] = None) -> Any:
+        """Returns the result of a preparation, or None if it failed or is not ready in time."""
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+    @property
+    def _wait_budget(self) -> float:
+        # Part of the budget is kept for starting playback after the decision.
+        return self.budget - min(0.1, self.budget / 10)
+
+    def _prepare_tailored(
+        self, question: str, transcript: Future, answer_end: float
+    ) -> Optional[Tuple[str, Future]]:
+        """Prepares the follow-up to the answer and tracks how long that takes."""
+        prepared = self._prepare_followup(question, transcript.result())
+        seconds = time.perf_counter() - answer_end
+        with self._lock:
+            if self._tailored_seconds is None:
+                self._tailored_seconds = seconds
+            else:
+                self._tailored_seconds = 0.7 * self._tailored_seconds + 0.3 * seconds
+        return prepared
+
+    def _prepare_followup(
+        self, question: str, answer: Optional[str]
+    ) -> Optional[Tuple[str, Future]]:
+        """Generates a follow-up and synthesizes it; returns None if there is none."""
+        if answer is None:
+            user_prompt = (
+                f"Question: {question}\nThe candidate is answering now. Ask the follow-up "
+                "most likely to probe their answer further."
+            )
+        elif not answer.strip():
+            return None
+        else:
+            user_prompt = f"Question: {question}\nCandidate's answer: {answer}\nAsk a follow-up question about this answer."
+        followup = self._extract_question(
+            self.generator.generate_content(self.system_prompt, user_prompt)
+        )
+        if not followup:
+            return None
+        with self._lock:
+            audio = self._audio.get(followup)
+        if audio is None:
+            # Synthesized on this thread rather than queued, so no worker waits on another.
+            audio = Future()
+            audio.set_result(self.speech.synthesize(followup))
+            with self._lock:
+                self._audio.setdefault(followup, audio)
+        audio.result()
+        return followup, audio
+
+    @staticmethod
+    def _extract_question(response_text: str) -> Optional[str]:
+        qa_dict = parse_qa_response(response_text)
+        for key, value in qa_dict.items():
+            if key.startswith("Q") and isinstance(value, str) and value.strip():
+                return value.strip()
+        for line in response_text.splitlines():
+            line = line.strip().strip("\"'{}")
+            if line:
+                return line
+        return None
+
+    def _finish_turn(
+        self, question: str, source: str, transcript: Future, gap: Optional[float]
+    ) -> None:
+        try:
+            answer = transcript.result()
+        except Exception as e:
+            answer = f"Failed to convert speech to text: {e}."
+        turn = LiveTurn(
+            index=len(self.turns),
+            question=question,
+            source=source,
+            answer=answer,
+            gap=gap,
+            over_budget=gap is not None and gap > self.budget,
+        )
+        self.turns.append(turn)
+        if self.on_turn is not None:
+            self.on_turn(turn)
+
+    def _turn_limit_reached(self) -> bool:
+        # The current turn is recorded after the next question is chosen.
+        return self.max_turns is not None and len(self.turns) + 1 >= self.max_turns
+
+    def _synthesize(self, text: str) -> Future:
+        with self._lock:
+            if text not in self._audio:
+                self._audio[text] = self._submit(self.speech.synthesize, text)
+            return self._audio[text]
+
+    def _submit(self, func: Callable, *args) -> Future:
+        return self._executor.submit(func, *args)
@@ -1,7 +1,16 @@
 import os
-from .utils.doc_manager import DocumentCreator
-from .models import ClaudeGenerator, GptGenerator
-from .modules.voice.google import save_google_tts
+import asyncio
+from typing import Optional, Sequence
+from .utils.cache import ResponseCache
+from .utils.dedup import QuestionDeduplicator
+from .utils.exporters import export_qa, get_exporter
+from .utils.parser import merge_qa_dict
+from .utils.pipeline import run_pipeline
+from .utils.telemetry import instrument
+from .models.registry import create_generator, prompt_budget
+
+# Engines, python-docx and gTTS are imported where they are used, so a manager that only
+# generates Q&A does not load the document and audio dependencies, and vice versa.
 
 
 class InterviewManager:
@@ -9,31 +18,72 @@ class InterviewManager:
     Manages the creation of interview documents and audio using different AI engines.
 
     Attributes:
-        api_key (str): The API key for accessing the underlying AI services.
-        engine (str): The name of the engine to use for generating interview content. Currently supports 'GPT' or 'Claude'.
+        api_key (Union[str, Dict[str, str]]): The API key for accessing the underlying AI services.
+        engine (Union[str, Sequence[str], Any]): The engine generating interview content: a registered engine name,
+            several names routed by `routing_policy`, or a generator instance.
+        cache (Optional[ResponseCache]): The response cache shared with the engine.
+        interviewer: The generator, or the EngineRouter when several engines are given.
 
     Raises:
         ValueError: If an unsupported engine is specified.
     """
 
-    def __init__(self, api_key, engine="GPT"):
+    def __init__(
+        self,
+        api_key,
+        engine="GPT",
+        cache: Optional[ResponseCache] = None,
+        prompt_caching: bool = False,
+        routing_policy: str = "failover",
+        speech_client=None,
+    ):
         """
         Initializes the InterviewManager with an API key and engine choice.
 
         Args:
-            api_key (str): The API key required to access AI services.
-            engine (str, optional): The engine to use for content generation ('GPT' or 'Claude'). Defaults to 'GPT'.
+            api_key (Union[str, Dict[str, str]]): The API key required to access AI services, or the key of
+                each engine keyed by engine name when several engines are given.
+            engine (Union[str, Sequence[str], Any], optional): The engine to use for content generation: 'GPT', 'Claude',
+                'Gemini', 'Mock' or a name added with `register_engine`; a list of names to route requests between
+                them; or a generator instance such as an EngineRouter. Defaults to 'GPT'.
+            cache (ResponseCache, optional): A response cache to reuse earlier API responses, e.g. when re-running a job
+                after a document or TTS failure, or mode="replay" to run offline from recorded responses. Defaults to None.
+            prompt_caching (bool, optional): With Claude, cache the system prompt with the resume and job description
+                on Anthropic's side across iterations. Token usage is reported by `usage`. Defaults to False.
+            routing_policy (str, optional): With several engines, 'fastest', 'cheapest' or 'failover'. Defaults to 'failover'.
+            speech_client (SpeechClient, optional): An OpenAI speech client that voices the interview instead of
+                gTTS, e.g. `SpeechClient(voice="nova")`. Defaults to None (gTTS).
         """
         self.api_key = api_key
         self.engine = engine
+        self.cache = cache
+        self.speech_client = speech_client
+
+        # Only options that are set are passed, so engines without them do not warn.
+        options = {"cache": cache, "prompt_caching": prompt_caching or None}
+        if isinstance(engine, str):
+            self.interviewer = create_generator(engine, api_key=api_key, **options)
+        elif isinstance(engine, (list, tuple)):
+            from .models.router import EngineRouter
 
-        if engine == "GPT":
-            self.interviewer = GptGenerator(api_key=api_key)
-        elif engine == "Claude":
-            self.interviewer = ClaudeGenerator(api_key=api_key)
+            self.interviewer = EngineRouter.from_engines(
+                engine,
+                api_key=api_key,
+                policy=routing_policy,
+                **options,
+            )
         else:
-            raise ValueError("Unsupported engine. Please choose 'GPT' or 'Claude'.")
+            self.interviewer = engine
+
+    @property
+    def usage(self):
+        """
+        The token usage reported by the engine, including prompt cache reads and writes, or {} if the
+        engine does not report it.
+        """
+        return dict(getattr(self.interviewer, "usage", {}))
 
+    @instrument("generate_interview")
     def generate_interview(
         self,
         jd,
@@ -46,6 +96,14 @@ class InterviewManager:
         system_prompt=None,
         user_prompt=None,
         iteration: int = 1,
+        max_workers: int = 1,
+        tts_workers: int = 4,
+        pipeline: bool = False,
+        queue_size: int = 2,
+        export_formats: Sequence[str] = (),
+        dedup_threshold: Optional[float] = None,
+        min_novelty: Optional[float] = None,
+        audio_archive: bool = False,
     ):
         """
         Generates interview content based on the job description, resume, and other parameters. Outputs include QA documents and audio files.
@@ -61,11 +119,227 @@ class InterviewManager:
             system_prompt (str, optional): Custom prompt for the system to generate interview content. If None, a default is created. Defaults to None.
             user_prompt (str, optional): Custom prompt for the user's responses in the interview. If None, a default is created. Defaults to None.
             iteration (int, optional): The number of iterations for content generation. Defaults to 1.
+            max_workers (int, optional): The number of iterations to request concurrently. Defaults to 1.
+            tts_workers (int, optional): The number of audio clips synthesized concurrently. Defaults to 4.
+            pipeline (bool, optional): Overlap the stages: the document and audio of each iteration's batch are created
+                while later iterations are still being generated. Defaults to False.
+            queue_size (int, optional): The number of batches a pipelined stage may fall behind before generation waits. Defaults to 2.
+            export_formats (Sequence[str], optional): Additional streaming exports saved next to the document,
+                e.g. ("jsonl", "md", "html"). Defaults to ().
+            dedup_threshold (float, optional): Drop questions whose similarity to an earlier question reaches this
+                Jaccard similarity of their character trigrams, before documents and audio are created. Close rewordings score
+                about 0.75 to 0.9, unrelated questions that share phrasing up to about 0.55. Defaults to None (no dedup).
+            min_novelty (float, optional): With dedup, stop iterating once the share of new questions in an
+                iteration falls below this rate, saving API calls. Defaults to None.
+            audio_archive (bool, optional): Pack the audio into one archive, `voice/voice.oiva`, instead of
+                two mp3 files per question, see `AudioArchive`. Defaults to False.
 
         Generates:
             Documents and audio files based on the generated interview content, saved in the specified output directory.
+
+        Returns:
+            Dict[str, Any]: The generated QA dictionary.
+
+        Raises:
+            PipelineError: In pipelined mode, if a stage failed. Artifacts of the other stages are still saved.
+        """
+        system_prompt, user_prompt = self._build_prompts(
+            jd,
+            resume,
+            position,
+            interview_type,
+            language,
+            max_sentence,
+            system_prompt,
+            user_prompt,
+        )
+
+        if pipeline:
+            from .modules.voice.google import get_tts_lang
+
+            return self._generate_interview_pipelined(
+                system_prompt,
+                user_prompt,
+                iteration,
+                max_workers,
+                os.path.join(output_dir, "generated_qa"),
+                os.path.join(output_dir, "document"),
+                os.path.join(output_dir, "voice"),
+                get_tts_lang(language),
+                tts_workers,
+                queue_size,
+                export_formats,
+                self._new_deduplicator(dedup_threshold, min_novelty),
+                min_novelty,
+                audio_archive,
+            )
+
+        generated_qa_dict = self.interviewer.generate_interview_content(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            iteration=iteration,
+            max_workers=max_workers,
+            save_dir=os.path.join(output_dir, "generated_qa"),
+            deduplicator=self._new_deduplicator(dedup_threshold, min_novelty),
+            min_novelty=min_novelty,
+        )
+        self.create_document(generated_qa_dict, output_dir)
+        if export_formats:
+            self.export_qa(generated_qa_dict, output_dir, export_formats)
+        self.create_voice(
+            generated_qa_dict, output_dir, language, tts_workers, audio_archive
+        )
+        return generated_qa_dict
+
+    @instrument("generate_qa")
+    def generate_qa(
+        self,
+        jd,
+        resume,
+        position,
+        interview_type,
+        language="English",
+        max_sentence=6,
+        output_dir="output",
+        system_prompt=None,
+        user_prompt=None,
+        iteration: int = 1,
+        max_workers: int = 1,
+        dedup_threshold: Optional[float] = None,
+        min_novelty: Optional[float] = None,
+    ):
+        """
+        Runs only the generation stage of `generate_interview`.
+
+        Takes the same arguments as `generate_interview` and saves each batch under `output_dir/generated_qa`.
+
+        Returns:
+            Dict[str, Any]: The generated QA dictionary.
+        """
+        system_prompt, user_prompt = self._build_prompts(
+            jd,
+            resume,
+            position,
+            interview_type,
+            language,
+            max_sentence,
+            system_prompt,
+            user_prompt,
+        )
+        return self.interviewer.generate_interview_content(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            iteration=iteration,
+            max_workers=max_workers,
+            save_dir=os.path.join(output_dir, "generated_qa"),
+            deduplicator=self._new_deduplicator(dedup_threshold, min_novelty),
+            min_novelty=min_novelty,
+        )
+
+    @instrument("create_document")
+    def create_document(self, qa_dict, output_dir="output"):
+        """
+        Runs only the document stage of `generate_interview`.
+
+        Args:
+            qa_dict (Dict[str, Any]): The generated QA dictionary.
+            output_dir (str, optional): The output directory; the document is saved under `output_dir/document`. Defaults to "output".
+
+        Returns:
+            str: The path of the saved document.
+        """
+        from .utils.doc_manager import DocumentCreator
+
+        document_creator = DocumentCreator()
+        return document_creator.create_qa_document(
+            qa_dict, "TeamViewer15", 11, os.path.join(output_dir, "document")
+        )
+
+    @instrument("export_qa")
+    def export_qa(self, qa_dict, output_dir="output", formats=("jsonl",)):
+        """
+        Exports the QA dictionary to streaming formats in a single pass.
+
+        Args:
+            qa_dict (Dict[str, Any]): The generated QA dictionary.
+            output_dir (str, optional): The output directory; files are saved under `output_dir/document`. Defaults to "output".
+            formats (Sequence[str], optional): The export formats, see `openinterview.utils.exporters`. Defaults to ("jsonl",).
+
+        Returns:
+            Dict[str, str]: The path of each exported file, keyed by format.
+        """
+        return export_qa(qa_dict, os.path.join(output_dir, "document"), formats)
+
+    @instrument("create_voice")
+    def create_voice(
+        self,
+        qa_dict,
+        output_dir="output",
+        language="English",
+        tts_workers: int = 4,
+        audio_archive: bool = False,
+    ):
+        """
+        Runs only the audio stage of `generate_interview`.
+
+        Args:
+            qa_dict (Dict[str, Any]): The generated QA dictionary.
+            output_dir (str, optional): The output directory; audio is saved under `output_dir/voice`. Defaults to "output".
+            language (str, optional): The language for the interview. Defaults to "English".
+            tts_workers (int, optional): The number of audio clips synthesized concurrently. Defaults to 4.
+            audio_archive (bool, optional): Append the clips to `voice/voice.oiva` instead of writing mp3 files. Defaults to False.
         """
+        from .modules.voice.google import get_tts_lang
+
+        voice_dir = os.path.join(output_dir, "voice")
+        archive = self._open_audio_archive(voice_dir) if audio_archive else None
+        try:
+            self._save_voice(
+                qa_dict, voice_dir, get_tts_lang(language), tts_workers, archive=archive
+            )
+        finally:
+            if archive is not None:
+                archive.close()
+
+    def _save_voice(self, qa_dict, voice_dir, tts_lang, tts_workers, **options):
+        """Voices a QA dictionary with the speech client if set, else gTTS."""
+        if self.speech_client is not None:
+            self.speech_client.save_qa_dict(
+                qa_dict,
+                voice_dir,
+                max_workers=tts_workers,
+                archive=options.get("archive"),
+            )
+            return
+        from .modules.voice.google import save_google_tts
+
+        save_google_tts(
+            qa_dict, voice_dir, lang=tts_lang, max_workers=tts_workers, **options
+        )
+
+    @staticmethod
+    def _open_audio_archive(voice_dir):
+        from .modules.voice.archive import ARCHIVE_EXTENSION, AudioArchive
+
+        return AudioArchive(os.path.join(voice_dir, "voice" + ARCHIVE_EXTENSION), "a")
+
+    @instrument("build_prompts")
+    def _build_prompts(
+        self,
+        jd,
+        resume,
+        position,
+        interview_type,
+        language,
+        max_sentence,
+        system_prompt,
+        user_prompt,
+    ):
         if not system_prompt:
+            options = {}
+            budget = self._system_prompt_budget()
+            if budget is not None:
+                options["max_tokens"] = budget
             system_prompt = self.interviewer.create_system_prompt(
                 jd=jd,
                 candidate_resume=resume,
@@ -73,20 +347,247 @@ class InterviewManager:
                 interview_type=interview_type,
                 language=language,
                 max_sentence=max_sentence,
+                **options,
             )
         if not user_prompt:
             user_prompt = self.interviewer.create_base_prompt("generateQAs")
+        return system_prompt, user_prompt
 
-        generated_qa_dict = self.interviewer.generate_interview_content(
+    def _system_prompt_budget(self):
+        """Returns the system prompt token budget of the engine, or of the smallest routed engine."""
+        engines = getattr(self.interviewer, "engines", None)
+        generators = engines.values() if engines else [self.interviewer]
+        budgets = [
+            prompt_budget(getattr(generator, "model", None)) for generator in generators
+        ]
+        budgets = [budget for budget in budgets if budget is not None]
+        return min(budgets) if budgets else None
+
+    @staticmethod
+    def _new_deduplicator(dedup_threshold, min_novelty):
+        if dedup_threshold is None and min_novelty is None:
+            return None
+        if dedup_threshold is None:
+            return QuestionDeduplicator()
+        return QuestionDeduplicator(threshold=dedup_threshold)
+
+    def _generate_interview_pipelined(
+        self,
+        system_prompt,
+        user_prompt,
+        iteration,
+        max_workers,
+        save_dir,
+        document_dir,
+        voice_dir,
+        tts_lang,
+        tts_workers,
+        queue_size,
+        export_formats=(),
+        deduplicator=None,
+        min_novelty=None,
+        audio_archive=False,
+    ):
+        """
+        Runs generation, document assembly and TTS as overlapping stages connected by bounded queues.
+        """
+        from .utils.doc_manager import DocumentCreator
+
+        generated_qa_dict = {}
+
+        def new_batches():
+            for _, batch_qa_dict in self.interviewer.iter_interview_batches(
+                system_prompt,
+                user_prompt,
+                iteration,
+                save_dir,
+                max_workers=max_workers,
+                deduplicator=deduplicator,
+                min_novelty=min_novelty,
+            ):
+                new_qa_dict = merge_qa_dict(generated_qa_dict, batch_qa_dict)
+                if new_qa_dict:
+                    yield new_qa_dict
+
+        document_creator = DocumentCreator()
+        document_creator.begin_document("TeamViewer15", 11)
+        archive = self._open_audio_archive(voice_dir) if audio_archive else None
+        exporters = [
+            get_exporter(export_format, document_dir)
+            for export_format in export_formats
+        ]
+        stages = {
+            f"export-{exporter.extension}": (exporter.write_pairs, exporter.close)
+            for exporter in exporters
+        }
+        try:
+            run_pipeline(
+                new_batches(),
+                {
+                    **stages,
+                    "document": (
+                        document_creator.add_qa_pairs,
+                        lambda: document_creator.save_document(document_dir),
+                    ),
+                    "voice": (
+                        lambda batch_qa_dict: self._save_voice(
+                            batch_qa_dict,
+                            voice_dir,
+                            tts_lang,
+                            tts_workers,
+                            archive=archive,
+                        ),
+                        None,
+                    ),
+                },
+                queue_size=queue_size,
+            )
+        finally:
+            # Closed once every stage has stopped, whether the pipeline succeeded or not.
+            if archive is not None:
+                archive.close()
+        return generated_qa_dict
+
+
+class AsyncInterviewManager(InterviewManager):
+    """
+    The asyncio counterpart of InterviewManager, for embedding in async services.
+
+    Generation runs on the event loop through the engine's asyncio generator, e.g.
+    AsyncGptGenerator or AsyncClaudeGenerator, so a request does not hold a thread while
+    waiting for the API. Loading prompt files, building the document and synthesizing audio
+    still block, so they run in the default executor.
+
+    Example:
+    >>> async with AsyncInterviewManager(api_key=key, engine="GPT") as manager:  # doctest: +SKIP
+    ...     qa_dict = await manager.generate_interview(jd, resume, "AI Researcher", "techQAs", iteration=5, max_concurrency=5)
+
+    Raises:
+        ValueError: If an unsupported engine is specified.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        engine="GPT",
+        cache: Optional[ResponseCache] = None,
+        prompt_caching: bool = False,
+        max_concurrent_requests: Optional[int] = None,
+        base_url: Optional[str] = None,
+        speech_client=None,
+    ):
+        """
+        Initializes the AsyncInterviewManager with an API key and engine choice.
+
+        Args:
+            api_key (str): The API key required to access AI services.
+            engine (str, optional): The engine to use for content generation; a registered engine with an asyncio
+                generator, e.g. 'GPT', 'Claude' or 'Mock'. Defaults to 'GPT'.
+            cache (ResponseCache, optional): A response cache to reuse earlier API responses. Defaults to None.
+            prompt_caching (bool, optional): With Claude, cache the system prompt on Anthropic's side. Defaults to False.
+            max_concurrent_requests (int, optional): The maximum number of API requests in flight across all
+                interviews generated by this manager. Defaults to None (no limit).
+            base_url (str, optional): The API base URL, e.g. a local mock server. Defaults to the provider's API.
+            speech_client (SpeechClient, optional): An OpenAI speech client that voices the interview instead of gTTS.
+        """
+        self.api_key = api_key
+        self.engine = engine
+        self.cache = cache
+        self.speech_client = speech_client
+
+        self.interviewer = create_generator(
+            engine,
+            api_key=api_key,
+            asynchronous=True,
+            cache=cache,
+            prompt_caching=prompt_caching or None,
+            base_url=base_url,
+            max_concurrent_requests=max_concurrent_requests,
+        )
+
+    async def generate_interview(
+        self,
+        jd,
+        resume,
+        position,
+        interview_type,
+        language="English",
+        max_sentence=6,
+        output_dir="output",
+        system_prompt=None,
+        user_prompt=None,
+        iteration: int = 1,
+        max_concurrency: int = 1,
+        tts_workers: int = 4,
+        export_formats: Sequence[str] = (),
+        dedup_threshold: Optional[float] = None,
+        min_novelty: Optional[float] = None,
+        audio_archive: bool = False,
+    ):
+        """
+        Generates interview content, documents and audio like `InterviewManager.generate_interview`.
+
+        Takes the same arguments, except that `max_concurrency` replaces `max_workers` and there is no
+        pipelined mode; the document, exports and audio are created concurrently once generation is done.
+
+        Returns:
+            Dict[str, Any]: The generated QA dictionary.
+        """
+        loop = asyncio.get_running_loop()
+        system_prompt, user_prompt = await loop.run_in_executor(
+            None,
+            self._build_prompts,
+            jd,
+            resume,
+            position,
+            interview_type,
+            language,
+            max_sentence,
+            system_prompt,
+            user_prompt,
+        )
+        generated_qa_dict = await self.interviewer.generate_interview_content(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             iteration=iteration,
             save_dir=os.path.join(output_dir, "generated_qa"),
+            max_concurrency=max_concurrency,
+            deduplicator=self._new_deduplicator(dedup_threshold, min_novelty),
+            min_novelty=min_novelty,
         )
+        stages = [
+            loop.run_in_executor(
+                None, self.create_document, generated_qa_dict, output_dir
+            ),
+            loop.run_in_executor(
+                None,
+                self.create_voice,
+                generated_qa_dict,
+                output_dir,
+                language,
+                tts_workers,
+                audio_archive,
+            ),
+        ]
+        if export_formats:
+            stages.append(
+                loop.run_in_executor(
+                    None,
+                    self.export_qa,
+                    generated_qa_dict,
+                    output_dir,
+                    export_formats,
+                )
+            )
+        await asyncio.gather(*stages)
+        return generated_qa_dict
 
-        document_creator = DocumentCreator()
-        document_creator.create_qa_document(
-            generated_qa_dict, "TeamViewer15", 11, os.path.join(output_dir, "document")
-        )
+    async def aclose(self) -> None:
+        """Closes the engine's connection pool."""
+        await self.interviewer.aclose()
+
+    async def __aenter__(self):
+        return self
 
-        save_google_tts(generated_qa_dict, os.path.join(output_dir, "voice"))
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
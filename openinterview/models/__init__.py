@@ -1,2 +1,22 @@
-from openinterview.models.claude import ClaudeGenerator
-from openinterview.models.gpt import GptGenerator
+from openinterview.utils.lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "ClaudeGenerator": "openinterview.models.claude",
+    "GptGenerator": "openinterview.models.gpt",
+    "AsyncClaudeGenerator": "openinterview.models.async_claude",
+    "AsyncGptGenerator": "openinterview.models.async_gpt",
+    "GeminiGenerator": "openinterview.models.gemini",
+    "MockGenerator": "openinterview.models.mock",
+    "AsyncMockGenerator": "openinterview.models.mock",
+    "GeneratorMixin": "openinterview.models.base",
+    "EngineRouter": "openinterview.models.router",
+    "EngineStats": "openinterview.models.router",
+    "get_engine_stats": "openinterview.models.router",
+    "register_engine": "openinterview.models.registry",
+    "create_generator": "openinterview.models.registry",
+    "get_engine": "openinterview.models.registry",
+    "available_engines": "openinterview.models.registry",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -0,0 +1,203 @@
+import os
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from openinterview.models.base import _iteration_scope
+from openinterview.utils.concurrency import aiter_ordered
+from openinterview.utils.dedup import QuestionDeduplicator, report_novelty
+from openinterview.utils.parser import QAStreamParser, merge_qa_dict
+from openinterview.utils.telemetry import span
+
+
+class AsyncGeneratorMixin:
+    """
+    The asyncio versions of the iteration methods shared by the async generators.
+
+    Subclasses provide `async generate_content(system_prompt, user_prompt, stream=False)` and
+    `aclose()`, set `max_concurrent_requests`, and derive from a synchronous generator whose
+    `GeneratorMixin` methods parse and save responses; the result files and deduplication
+    behave exactly like the synchronous generators'.
+    """
+
+    max_concurrent_requests: Optional[int] = None
+    _request_semaphore: Optional[asyncio.Semaphore] = None
+
+    def _request_slot(self):
+        """
+        Returns a context manager bounding the API requests in flight across all callers of
+        this generator to `max_concurrent_requests`.
+        """
+        if not self.max_concurrent_requests:
+            return contextlib.AsyncExitStack()
+        if self._request_semaphore is None:
+            # Created lazily so the semaphore belongs to the running event loop.
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._request_semaphore
+
+    async def generate_interview_content(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        max_concurrency: int = 1,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate interview content by interacting with the model.
+
+        Args:
+            system_prompt (str): The initial prompt to start the conversation.
+            user_prompt (str): The prompt sent on every iteration.
+            iteration (int): The number of iterations to generate interview content.
+            save_dir (str): The directory path to save the generated interview content.
+            max_concurrency (int, optional): The number of iterations requested concurrently. Defaults to 1 (sequential).
+            deduplicator (Optional[QuestionDeduplicator]): Drops near-duplicate questions across iterations. Defaults to None.
+            min_novelty (Optional[float]): With a deduplicator, stop iterating once the share of new questions
+                in an iteration falls below this rate. Defaults to None (always run all iterations).
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the generated interview content.
+        """
+        total_qa_dict: Dict[str, Any] = {}
+        async for _, batch_qa_dict in self.aiter_interview_batches(
+            system_prompt,
+            user_prompt,
+            iteration,
+            save_dir,
+            max_concurrency=max_concurrency,
+            deduplicator=deduplicator,
+            min_novelty=min_novelty,
+        ):
+            merge_qa_dict(total_qa_dict, batch_qa_dict)
+
+        print(
+            f"Each response saved in cached folder: {os.path.join(save_dir, 'cached')}"
+        )
+        return total_qa_dict
+
+    async def aiter_interview_batches(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        max_concurrency: int = 1,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yields the QA dictionary of each iteration in iteration order.
+
+        The asyncio counterpart of `iter_interview_batches`. Stopping early, e.g. on low
+        novelty, cancels the requests that are still running.
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: The iteration index and the QA dictionary of that iteration.
+        """
+        cached_dir = os.path.join(save_dir, "cached")
+        os.makedirs(cached_dir, exist_ok=True)
+
+        # As in `iter_interview_batches`, concurrent requests all see the history as of now.
+        concurrent = max_concurrency > 1 and iteration > 1
+
+        async def run_iteration(i: int) -> Tuple[Dict[str, Any], str]:
+            with _iteration_scope(i), span(
+                "generate_content", engine=type(self).__name__
+            ) as s:
+                response_text = await self.generate_content(system_prompt, user_prompt)
+                if s.recording:
+                    self._record_response(s, system_prompt, user_prompt, response_text)
+            batch_qa_dict = self._parse_response(response_text)
+            self._save_batch(cached_dir, i, batch_qa_dict, response_text)
+            return batch_qa_dict, response_text
+
+        history_scope = (
+            self._independent_requests(system_prompt)
+            if concurrent
+            else contextlib.nullcontext()
+        )
+        batches = aiter_ordered(run_iteration, iteration, max_concurrency)
+        try:
+            with history_scope:
+                async for i, (batch_qa_dict, response_text) in batches:
+                    if concurrent:
+                        self._add_turn(user_prompt, response_text)
+                    if deduplicator is None:
+                        yield i, batch_qa_dict
+                        continue
+                    yield i, deduplicator.filter_qa_dict(batch_qa_dict, iteration=i)
+                    if report_novelty(deduplicator.stats[-1], min_novelty):
+                        break
+        finally:
+            await batches.aclose()
+
+    async def aiter_interview_content(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Streams interview content and yields each Q/A pair as soon as it has been parsed.
+
+        The asyncio counterpart of `iter_interview_content`.
+
+        Yields:
+            Dict[str, str]: A dict with the `Q_<id>` and `A_<id>` entries of one pair.
+        """
+        cached_dir = os.path.join(save_dir, "cached")
+        os.makedirs(cached_dir, exist_ok=True)
+
+        for i in range(iteration):
+            batch_qa_dict: Dict[str, str] = {}
+            total = duplicates = 0
+            with _iteration_scope(i):
+                pairs = await self.generate_content(
+                    system_prompt, user_prompt, stream=True
+                )
+            async for qa_pair in pairs:
+                batch_qa_dict.update(qa_pair)
+                if deduplicator is not None:
+                    questions = [
+                        value for key, value in qa_pair.items() if key.startswith("Q_")
+                    ]
+                    total += len(questions)
+                    if questions and not deduplicator.add(questions[0]):
+                        duplicates += 1
+                        continue
+                yield qa_pair
+            self._save_batch(cached_dir, i, batch_qa_dict)
+            if deduplicator is not None:
+                stats = deduplicator.record_batch(i, total, duplicates)
+                if report_novelty(stats, min_novelty):
+                    break
+
+    @staticmethod
+    async def _aiter_text(text: str) -> AsyncIterator[str]:
+        yield text
+
+    async def _parse_stream(
+        self, chunks: AsyncIterator[str], on_done
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Feeds streamed text to a QAStreamParser and yields pairs as they complete."""
+        parser = QAStreamParser()
+        async for chunk in chunks:
+            for pair in parser.feed(chunk):
+                yield pair
+        pairs, leftovers = parser.close()
+        for pair in pairs:
+            yield pair
+        if leftovers:
+            yield leftovers
+        on_done(parser.text)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
@@ -0,0 +1,192 @@
+import asyncio
+import anthropic
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from openinterview.models.async_base import AsyncGeneratorMixin
+from openinterview.models.claude import ClaudeGenerator
+from openinterview.utils.cache import ResponseCache
+from openinterview.utils.rate_limit import RateLimiter
+
+
+class AsyncClaudeGenerator(AsyncGeneratorMixin, ClaudeGenerator):
+    """
+    The asyncio counterpart of ClaudeGenerator.
+
+    Requests go through one `anthropic.AsyncAnthropic` client per generator, whose HTTP
+    connection pool keeps connections alive across requests. Prompts, prompt caching, usage
+    tracking, response caching, parsing and result files behave exactly like ClaudeGenerator.
+
+    Example:
+    >>> async with AsyncClaudeGenerator(api_key=key, max_concurrent_requests=4) as generator:  # doctest: +SKIP
+    ...     qa_dict = await generator.generate_interview_content(system_prompt, user_prompt, 5, "output", max_concurrency=5)
+
+    Args:
+        model (str): The version of Claude model to be used. Defaults to "claude-3-opus-20240229".
+        api_key (str): The API key required for accessing Anthropic's services.
+        cache (ResponseCache, optional): The response cache for read-through, write-through or offline replay.
+        rate_limiter (RateLimiter, optional): The rate limiter of API calls. Defaults to the process-wide 'anthropic' limiter.
+        prompt_caching (bool, optional): Mark the system prompt and user prompt as cacheable. Defaults to False.
+        base_url (str, optional): The API base URL, e.g. a local mock server. Defaults to None (the Anthropic API).
+        max_concurrent_requests (int, optional): The maximum number of requests in flight across all callers.
+            Defaults to None (no limit).
+        client (anthropic.AsyncAnthropic, optional): A client to share with other generators; it is not closed by `aclose`.
+    """
+
+    def __init__(
+        self,
+        model: str = "claude-3-opus-20240229",
+        api_key: str = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        prompt_caching: bool = False,
+        base_url: Optional[str] = None,
+        max_concurrent_requests: Optional[int] = None,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+    ):
+        super().__init__(
+            model=model,
+            api_key=api_key,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            prompt_caching=prompt_caching,
+            base_url=base_url,
+        )
+        self._owns_client = client is None
+        self.client = client or anthropic.AsyncAnthropic(
+            api_key=self.api_key, base_url=base_url
+        )
+        self.max_concurrent_requests = max_concurrent_requests
+
+    async def generate_content(
+        self,
+        system_prompt: Union[str, List[str]],
+        user_prompt: str = "",
+        stream: bool = False,
+        **kwargs,
+    ) -> Union[str, AsyncIterator[Dict[str, str]]]:
+        """
+        Generates content based on provided prompts.
+
+        Args:
+            system_prompt (Union[str, List[str]]): The system prompt, or up to three system blocks, see ClaudeGenerator.
+            user_prompt (str): The user prompt. Defaults to "".
+            stream (bool): If True, streams the message and returns an async iterator that yields each
+                Q/A pair as a dict as soon as it has been parsed. Defaults to False.
+
+        Returns:
+            Union[str, AsyncIterator[Dict[str, str]]]: The generated content, or an async iterator of Q/A pairs if `stream` is True.
+        """
+        self._add_message("user", user_prompt)
+        messages = list(self.messages)
+        key = None
+        response_text = None
+        if self.cache is not None:
+            key = self._cache_key(
+                provider="anthropic",
+                model=self.model,
+                system=system_prompt,
+                messages=messages,
+                **kwargs,
+            )
+        if stream:
+            return self._astream_content(system_prompt, messages, key, **kwargs)
+
+        if key is not None:
+            response_text = self.cache.read(key)
+        if response_text is None:
+            response_text = await self._acreate_message(
+                system_prompt, messages, **kwargs
+            )
+            if key is not None:
+                self.cache.write(key, response_text)
+        return response_text
+
+    async def aclose(self) -> None:
+        """Closes the HTTP connection pool unless the client was passed in."""
+        if self._owns_client:
+            await self.client.close()
+
+    async def _acreate_message(
+        self, system_prompt: Any, messages: List[Dict[str, Any]], **kwargs
+    ) -> str:
+        """
+        Sends the messages to the API and returns the response text.
+        """
+        try:
+            async with self._request_slot():
+                response = await self.rate_limiter.acall(
+                    lambda: self.client.messages.create(
+                        model=self.model,
+                        max_tokens=4096,
+                        temperature=0.0,
+                        system=self._system_param(system_prompt),
+                        messages=self._messages_param(messages),
+                        **kwargs,
+                    ),
+                    tokens=self._estimate_tokens(system_prompt, messages),
+                )
+            self._record_usage(response.usage)
+            return response.content[0].text
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
+
+    async def _astream_content(
+        self,
+        system_prompt: Any,
+        messages: List[Dict[str, Any]],
+        key: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Streams the message and yields Q/A pairs as they complete.
+        """
+        cached = self.cache.read(key) if key is not None else None
+
+        def on_done(response_text: str) -> None:
+            if cached is None and key is not None:
+                self.cache.write(key, response_text)
+
+        chunks = (
+            self._aiter_text(cached)
+            if cached is not None
+            else self._astream_message(system_prompt, messages, **kwargs)
+        )
+        async for pair in self._parse_stream(chunks, on_done):
+            yield pair
+
+    async def _astream_message(
+        self, system_prompt: Any, messages: List[Dict[str, Any]], **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Sends the messages to the API with streaming and yields the text deltas.
+        """
+
+        async def open_stream():
+            stream_manager = self.client.messages.stream(
+                model=self.model,
+                max_tokens=4096,
+                temperature=0.0,
+                system=self._system_param(system_prompt),
+                messages=self._messages_param(messages),
+                **kwargs,
+            )
+            return stream_manager, await stream_manager.__aenter__()
+
+        try:
+            async with self._request_slot():
+                # The request is sent on entering the stream; retries only happen before any text is yielded.
+                stream_manager, stream = await self.rate_limiter.acall(
+                    open_stream,
+                    tokens=self._estimate_tokens(system_prompt, messages),
+                )
+                try:
+                    async for text in stream.text_stream:
+                        yield text
+                    self._record_usage((await stream.get_final_message()).usage)
+                finally:
+                    await stream_manager.__aexit__(None, None, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
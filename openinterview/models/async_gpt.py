@@ -0,0 +1,204 @@
+import asyncio
+import openai  # Must use v0.28 $ pip install -q -U openai==0.28
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from ..utils.cache import ResponseCache
+from ..utils.history import ConversationHistory
+from ..utils.rate_limit import RateLimiter
+from ..utils.tokens import estimate_message_tokens
+from .async_base import AsyncGeneratorMixin
+from .gpt import GptGenerator
+
+
+class AsyncGptGenerator(AsyncGeneratorMixin, GptGenerator):
+    """The asyncio counterpart of GptGenerator.
+
+    Requests use `openai.ChatCompletion.acreate` over one aiohttp session per generator, so
+    connections are pooled and kept alive across requests instead of opened per request.
+    Prompts, history, caching, parsing and result files behave exactly like GptGenerator.
+
+    Example:
+    >>> async with AsyncGptGenerator(api_key=key, max_concurrent_requests=8) as generator:  # doctest: +SKIP
+    ...     qa_dict = await generator.generate_interview_content(system_prompt, user_prompt, 5, "output", max_concurrency=5)
+
+    Attributes:
+        api_base (Optional[str]): The API base URL, e.g. a local mock server.
+        max_connections (int): The size of the connection pool.
+        max_concurrent_requests (Optional[int]): The maximum number of requests in flight across all callers.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-3.5-turbo",
+        api_key: Optional[str] = None,
+        history: Optional[ConversationHistory] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        api_base: Optional[str] = None,
+        max_connections: int = 16,
+        max_concurrent_requests: Optional[int] = None,
+        session: Any = None,
+    ) -> None:
+        """Initializes the AsyncGptGenerator object with a model and an API key.
+
+        Args:
+            model (str): The model version of GPT to use. Defaults to "gpt-3.5-turbo".
+            api_key (Optional[str]): The API key for OpenAI. If not provided, raises a ValueError.
+            history (Optional[ConversationHistory]): The history manager and its token budget.
+            cache (Optional[ResponseCache]): The response cache for read-through, write-through or offline replay.
+            rate_limiter (Optional[RateLimiter]): The rate limiter of API calls. Defaults to the process-wide 'openai' limiter.
+            api_base (Optional[str]): The API base URL, e.g. "http://127.0.0.1:8000/v1". Defaults to OpenAI.
+            max_connections (int): The size of the connection pool. Defaults to 16.
+            max_concurrent_requests (Optional[int]): The maximum number of requests in flight. Defaults to None (no limit).
+            session (Optional[aiohttp.ClientSession]): A session to share with other clients; it is not closed by `aclose`.
+
+        Raises:
+            ValueError: If the API key is not provided.
+        """
+        super().__init__(
+            model=model,
+            api_key=api_key,
+            history=history,
+            cache=cache,
+            rate_limiter=rate_limiter,
+        )
+        self.api_base = api_base
+        self.max_connections = max_connections
+        self.max_concurrent_requests = max_concurrent_requests
+        self._session = session
+        self._owns_session = session is None
+
+    async def generate_content(
+        self, system_prompt: str, user_prompt: str = "", stream: bool = False, **kwargs
+    ) -> Union[str, AsyncIterator[Dict[str, str]]]:
+        """
+        Generates content based on the provided prompts.
+
+        Args:
+            system_prompt (str): Describes the context or task for the model.
+            user_prompt (str): Specific user input for the model to respond to.
+            stream (bool): If True, streams the completion and returns an async iterator that yields each
+                Q/A pair as a dict as soon as it has been parsed. Defaults to False.
+
+        Returns:
+            Union[str, AsyncIterator[Dict[str, str]]]: The generated content, or an async iterator of Q/A pairs if `stream` is True.
+        """
+        with self._lock:
+            messages, record = self._history_messages(system_prompt, user_prompt)
+
+        key = None
+        response_text = None
+        if self.cache is not None:
+            key = self._cache_key(
+                provider="openai", model=self.model, messages=messages, **kwargs
+            )
+        if stream:
+            return self._astream_content(messages, key, record=record, **kwargs)
+
+        if key is not None:
+            response_text = self.cache.read(key)
+        if response_text is None:
+            response_text = await self._acreate_completion(messages, **kwargs)
+            if key is not None:
+                self.cache.write(key, response_text)
+        if record:
+            with self._lock:
+                self._add_message("assistant", response_text)
+        return response_text
+
+    async def aclose(self) -> None:
+        """Closes the connection pool unless it was passed in."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+            self._owns_session = True
+        return self._session
+
+    async def _acreate(self, messages: List[Dict[str, str]], **kwargs):
+        # openai 0.28 sends async requests through the session in `openai.aiosession`;
+        # without one it opens a new connection for every request.
+        token = openai.aiosession.set(await self._get_session())
+        try:
+            return await openai.ChatCompletion.acreate(
+                model=self.model,
+                messages=messages,
+                api_key=self.api_key,
+                api_base=self.api_base,
+                **kwargs,
+            )
+        finally:
+            openai.aiosession.reset(token)
+
+    async def _acreate_completion(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> str:
+        """Sends the messages to the API and returns the response text."""
+        prompt_tokens = estimate_message_tokens(messages)
+        with self._lock:
+            self.request_tokens.append(prompt_tokens)
+        try:
+            async with self._request_slot():
+                response = await self.rate_limiter.acall(
+                    lambda: self._acreate(messages, **kwargs), tokens=prompt_tokens
+                )
+            response_text: str = response.choices[0].message["content"]
+            return response_text
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
+
+    async def _astream_content(
+        self,
+        messages: List[Dict[str, str]],
+        key: Optional[str] = None,
+        record: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Streams the completion of the messages and yields Q/A pairs as they complete."""
+        cached = self.cache.read(key) if key is not None else None
+
+        def on_done(response_text: str) -> None:
+            if cached is None and key is not None:
+                self.cache.write(key, response_text)
+            if record:
+                with self._lock:
+                    self._add_message("assistant", response_text)
+
+        chunks = (
+            self._aiter_text(cached)
+            if cached is not None
+            else self._astream_completion(messages, **kwargs)
+        )
+        async for pair in self._parse_stream(chunks, on_done):
+            yield pair
+
+    async def _astream_completion(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]:
+        """Sends the messages to the API with streaming and yields the text deltas."""
+        prompt_tokens = estimate_message_tokens(messages)
+        with self._lock:
+            self.request_tokens.append(prompt_tokens)
+        try:
+            async with self._request_slot():
+                # The request is sent by acreate(); retries only happen before any text is yielded.
+                response = await self.rate_limiter.acall(
+                    lambda: self._acreate(messages, stream=True, **kwargs),
+                    tokens=prompt_tokens,
+                )
+                async for chunk in response:
+                    delta = chunk["choices"][0]["delta"].get("content")
+                    if delta:
+                        yield delta
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
@@ -0,0 +1,384 @@
+import os
+import copy
+import json
+import time
+import contextlib
+import contextvars
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from openinterview.utils.concurrency import iter_ordered
+from openinterview.utils.dedup import (
+    QuestionDeduplicator,
+    dedup_batches,
+    report_novelty,
+)
+from openinterview.models.registry import prompt_budget
+from openinterview.utils.parser import merge_qa_dict, parse_qa_response
+from openinterview.utils import prompter
+from openinterview.utils.telemetry import record_span, span
+from openinterview.utils.tokens import estimate_tokens
+
+# The iteration of the request being sent, see `_iteration_scope`.
+_ITERATION: "contextvars.ContextVar[Optional[int]]" = contextvars.ContextVar(
+    "openinterview_iteration", default=None
+)
+
+
+@contextlib.contextmanager
+def _iteration_scope(i: int) -> Iterator[None]:
+    """Keys the response cache entries of the requests made inside the block on iteration `i`."""
+    token = _ITERATION.set(i)
+    try:
+        yield
+    finally:
+        _ITERATION.reset(token)
+
+
+class GeneratorMixin:
+    """
+    The iteration, parsing and prompt methods shared by the interview generators.
+
+    Subclasses provide `generate_content(system_prompt, user_prompt, stream=False)`, which
+    returns the response text, or an iterator of Q/A pair dicts if `stream` is True. Engines
+    may override `create_system_prompt` and `create_base_prompt` with prompts tuned for
+    their model; the defaults are the engine-neutral prompts of `openinterview.utils.prompter`.
+    """
+
+    # The history requests are built from inside `_independent_requests`.
+    _history_snapshot: Any = None
+
+    def generate_interview_content(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        max_workers: int = 1,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate interview content by interacting with the model.
+
+        This method interacts with the model for the specified number of iterations,
+        generating interview content based on the system prompt and the user prompt.
+        It saves the generated content in JSON format to the specified directory. If an
+        iteration repeats a key, the first value is kept, see `merge_qa_dict`.
+
+        Args:
+            system_prompt (str): The initial prompt to start the conversation.
+            user_prompt (str): The prompt sent on every iteration.
+            iteration (int): The number of iterations to generate interview content.
+            save_dir (str): The directory path to save the generated interview content.
+            max_workers (int, optional): The number of iterations to request concurrently. Defaults to 1 (sequential).
+            deduplicator (Optional[QuestionDeduplicator]): Drops near-duplicate questions across iterations. Defaults to None.
+            min_novelty (Optional[float]): With a deduplicator, stop iterating once the share of new questions
+                in an iteration falls below this rate. Defaults to None (always run all iterations).
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the generated interview content.
+        """
+        total_qa_dict: Dict[str, Any] = {}
+        for _, batch_qa_dict in self.iter_interview_batches(
+            system_prompt,
+            user_prompt,
+            iteration,
+            save_dir,
+            max_workers=max_workers,
+            deduplicator=deduplicator,
+            min_novelty=min_novelty,
+        ):
+            merge_qa_dict(total_qa_dict, batch_qa_dict)
+
+        print(
+            f"Each response saved in cached folder: {os.path.join(save_dir, 'cached')}"
+        )
+        return total_qa_dict
+
+    def iter_interview_batches(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        max_workers: int = 1,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yields the QA dictionary of each iteration in iteration order.
+
+        Each batch is saved to `cached/batch_output_{i}_*.json` under `save_dir`. With
+        `max_workers > 1` the iterations are requested concurrently, but batches are
+        still yielded and indexed in order so the merged result is deterministic.
+
+        Args:
+            system_prompt (str): The initial prompt to start the conversation.
+            user_prompt (str): The prompt sent on every iteration.
+            iteration (int): The number of iterations to generate interview content.
+            save_dir (str): The directory path to save the generated interview content.
+            max_workers (int, optional): The number of iterations to request concurrently. Defaults to 1 (sequential).
+            deduplicator (Optional[QuestionDeduplicator]): Drops near-duplicate questions across iterations. Defaults to None.
+            min_novelty (Optional[float]): With a deduplicator, stop iterating once the share of new questions
+                in an iteration falls below this rate. Defaults to None (always run all iterations).
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: The iteration index and the QA dictionary of that iteration.
+        """
+        cached_dir = os.path.join(save_dir, "cached")
+        os.makedirs(cached_dir, exist_ok=True)
+
+        concurrent = max_workers > 1 and iteration > 1
+
+        def run_iteration(i: int) -> Tuple[Dict[str, Any], str]:
+            with _iteration_scope(i), span(
+                "generate_content", engine=type(self).__name__
+            ) as s:
+                response_text = self.generate_content(system_prompt, user_prompt)
+                if s.recording:
+                    self._record_response(s, system_prompt, user_prompt, response_text)
+            batch_qa_dict = self._parse_response(response_text)
+            self._save_batch(cached_dir, i, batch_qa_dict, response_text)
+            return batch_qa_dict, response_text
+
+        def ordered_batches() -> Iterator[Tuple[int, Dict[str, Any]]]:
+            if not concurrent:
+                for i, (batch_qa_dict, _) in iter_ordered(run_iteration, iteration):
+                    yield i, batch_qa_dict
+                return
+            # Concurrent requests must not depend on which one finished first, so they
+            # all see the history as of now and are told apart by their iteration in
+            # the response cache; their turns are added in iteration order.
+            with self._independent_requests(system_prompt):
+                results = iter_ordered(run_iteration, iteration, max_workers)
+                for i, (batch_qa_dict, response_text) in results:
+                    self._add_turn(user_prompt, response_text)
+                    yield i, batch_qa_dict
+
+        batches = ordered_batches()
+        if deduplicator is not None:
+            # Saved batch files keep the raw response; only the yielded batches are filtered.
+            batches = dedup_batches(batches, deduplicator, min_novelty)
+        yield from batches
+
+    def iter_interview_content(
+        self,
+        system_prompt: Any,
+        user_prompt: str,
+        iteration: int,
+        save_dir: str,
+        deduplicator: Optional[QuestionDeduplicator] = None,
+        min_novelty: Optional[float] = None,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Streams interview content and yields each Q/A pair as soon as it has been parsed.
+
+        Iterations run one after another. Each iteration's pairs are still saved to
+        `cached/batch_output_{i}_*.json` under `save_dir` once the iteration finishes.
+
+        Args:
+            system_prompt (str): The initial prompt to start the conversation.
+            user_prompt (str): The prompt sent on every iteration.
+            iteration (int): The number of iterations to generate interview content.
+            save_dir (str): The directory path to save the generated interview content.
+            deduplicator (Optional[QuestionDeduplicator]): Skips pairs whose question duplicates an earlier one. Defaults to None.
+            min_novelty (Optional[float]): With a deduplicator, stop iterating once the share of new questions
+                in an iteration falls below this rate. Defaults to None (always run all iterations).
+
+        Yields:
+            Dict[str, str]: A dict with the `Q_<id>` and `A_<id>` entries of one pair.
+        """
+        cached_dir = os.path.join(save_dir, "cached")
+        os.makedirs(cached_dir, exist_ok=True)
+
+        for i in range(iteration):
+            batch_qa_dict: Dict[str, str] = {}
+            total = duplicates = 0
+            start = time.perf_counter()
+            # The cache key is taken when the stream is opened, not while it is consumed.
+            with _iteration_scope(i):
+                pairs = self.generate_content(system_prompt, user_prompt, stream=True)
+            for qa_pair in pairs:
+                batch_qa_dict.update(qa_pair)
+                if deduplicator is not None:
+                    questions = [
+                        value for key, value in qa_pair.items() if key.startswith("Q_")
+                    ]
+                    total += len(questions)
+                    if questions and not deduplicator.add(questions[0]):
+                        duplicates += 1
+                        continue
+                yield qa_pair
+            # Timed by hand: a span held open across `yield` would also time the consumer.
+            record_span(
+                "generate_content",
+                time.perf_counter() - start,
+                engine=type(self).__name__,
+                stream=True,
+                pairs=len(batch_qa_dict) // 2,
+            )
+            self._save_batch(cached_dir, i, batch_qa_dict)
+            if deduplicator is not None:
+                stats = deduplicator.record_batch(i, total, duplicates)
+                if report_novelty(stats, min_novelty):
+                    break
+
+    @contextlib.contextmanager
+    def _independent_requests(self, system_prompt: Any) -> Iterator[None]:
+        """
+        Sends the requests made inside the block with the conversation history as of entry.
+
+        Without it, concurrent iterations would each see whichever turns had finished, so
+        their requests, and the response cache keys derived from them, would depend on
+        scheduling. Replies are not added to the history inside the block; add them in a
+        fixed order with `_add_turn`. Engines without a `history` are unaffected.
+        """
+        history = getattr(self, "history", None)
+        if history is None:
+            yield
+            return
+        with self._lock:
+            history.add("system", system_prompt)
+            self._history_snapshot = copy.deepcopy(history)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._history_snapshot = None
+
+    def _history_messages(
+        self, system_prompt: Any, user_prompt: str
+    ) -> Tuple[List[Dict[str, str]], bool]:
+        """
+        Adds the prompts to the history and returns the messages to send. Call with `_lock` held.
+
+        Returns:
+            Tuple[List[Dict[str, str]], bool]: The messages, and whether the reply should be
+                added to the history, which is False inside `_independent_requests`.
+        """
+        snapshot = self._history_snapshot
+        history = self.history if snapshot is None else copy.deepcopy(snapshot)
+        history.add("system", system_prompt)
+        history.add("user", user_prompt)
+        return history.messages, snapshot is None
+
+    def _cache_key(self, **request: Any) -> str:
+        """
+        Returns the response cache key of a request, see `ResponseCache.make_key`.
+
+        The requests of an interview can be identical, e.g. Claude only sends the first
+        prompt, or concurrent requests all see the same history, so the key of a request
+        made within an iteration also includes its index. Every iteration is then recorded
+        and replayed separately, whatever the order the requests were sent in.
+        """
+        iteration = _ITERATION.get()
+        if iteration is not None:
+            request["iteration"] = iteration
+        return self.cache.make_key(**request)
+
+    def _add_turn(self, user_prompt: str, response_text: str) -> None:
+        """Adds an exchange requested inside `_independent_requests` to the history."""
+        history = getattr(self, "history", None)
+        if history is None:
+            return
+        with self._lock:
+            history.add("user", user_prompt)
+            history.add("assistant", response_text)
+
+    def _postprocess_response(self, response_text: str) -> Dict[str, Any]:
+        """
+        Process the response text and return a dictionary.
+
+        Args:
+            response_text (str): The response text to be processed.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the processed response. Empty if no Q/A entry could be recovered.
+        """
+        return parse_qa_response(response_text)
+
+    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+        """Runs `_postprocess_response` in a span that counts responses without any Q/A entry."""
+        with span("postprocess_response") as s:
+            batch_qa_dict: Dict[str, Any] = self._postprocess_response(response_text)
+            if not batch_qa_dict:
+                s.add("parse_failures")
+        return batch_qa_dict
+
+    @staticmethod
+    def _record_response(
+        s: Any, system_prompt: Any, user_prompt: str, response_text: str
+    ) -> None:
+        """Sets the estimated token counts and the size of a response on its span."""
+        if not isinstance(system_prompt, str):
+            # Content blocks, e.g. Claude's cached system prompt.
+            system_prompt = " ".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in system_prompt
+            )
+        s.set(
+            "prompt_tokens",
+            estimate_tokens(system_prompt) + estimate_tokens(user_prompt),
+        )
+        s.set("completion_tokens", estimate_tokens(response_text or ""))
+        s.set("response_bytes", len((response_text or "").encode("utf-8")))
+
+    @staticmethod
+    def _save_batch(
+        cached_dir: str,
+        i: int,
+        batch_qa_dict: Dict[str, Any],
+        response_text: Optional[str] = None,
+    ) -> None:
+        batch_file_path = os.path.join(
+            cached_dir,
+            f"batch_output_{i}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.json",
+        )
+        with open(batch_file_path, "w", encoding="utf-8") as f:
+            json.dump(batch_qa_dict, f, ensure_ascii=False, indent=4)
+        if not batch_qa_dict and response_text:
+            # Keep the raw response for inspection instead of rendering it as a question.
+            with open(
+                batch_file_path[: -len(".json")] + "_unparsed.txt",
+                "w",
+                encoding="utf-8",
+            ) as f:
+                f.write(response_text)
+
+    @staticmethod
+    def create_system_prompt(
+        position: str = "AI researcher",
+        jd: str = None,
+        interview_type: str = "base",
+        language: str = "English",
+        candidate_resume: str = None,
+        interviewer_resume: str = "",
+        max_sentence: Any = 10,
+        custom_prompt: str = "",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Generates a custom interview prompt. Arguments ending in .pdf or .txt are read from the file.
+
+        The documents are normalized and cut to fit `max_tokens`, or `prompt_budget(model)`,
+        see `prompter.build_system_prompt`.
+        """
+        return prompter.create_system_prompt(
+            candidate_resume=candidate_resume,
+            jd=jd,
+            interviewer_resume=interviewer_resume,
+            interview_type=interview_type,
+            position=position,
+            language=language,
+            max_sentence=max_sentence,
+            custom_prompt=custom_prompt,
+            max_tokens=max_tokens if max_tokens is not None else prompt_budget(model),
+        )
+
+    @staticmethod
+    def create_base_prompt(interview_type: str) -> str:
+        """
+        Generates a base prompt based on the interview type.
+        """
+        return prompter.create_base_prompt(interview_type)
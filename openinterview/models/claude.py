@@ -1,18 +1,51 @@
-import os
-import json
+import threading
 import anthropic
-from datetime import datetime
-from typing import List, Dict, Any
-from openinterview.utils.file_manager import load_file_content
+from typing import List, Dict, Any, Iterator, Optional, Union
+from openinterview.models.base import GeneratorMixin
+from openinterview.models.registry import prompt_budget
+from openinterview.utils.cache import ResponseCache
+from openinterview.utils import prompter
+from openinterview.utils.parser import QAStreamParser
+from openinterview.utils.rate_limit import RateLimiter, get_rate_limiter
+from openinterview.utils.tokens import estimate_message_tokens, estimate_tokens
 
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
 
-class ClaudeGenerator:
+
+# The instruction of each interview type, tuned for this model.
+INSTRUCTIONS = {
+    "generalQAs": "Inquire about both technical skills and personal qualities. Ask in-depth and professionally, pressing for truth about strengths and weaknesses, and ask sequentially to gauge depth of knowledge.",
+    "generalTechQAs": "Overall, ask professional questions about basic concepts commonly used, referencing the given position or resume. For example, if it's for an AI Researcher position, ask simple questions about the basic principles of CNN and the differences between CNN and ViT.",
+    "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
+    "techQAsFromExperts": "Create questions from your expertise related to the position.",
+    "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
+    "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
+    "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
+}
+
+
+class ClaudeGenerator(GeneratorMixin):
     """
     Class for conducting interviews using Claude, an AI model from Anthropic.
 
     Args:
         model (str): The version of Claude model to be used. Defaults to "claude-3-opus-20240229".
         api_key (str): The API key required for accessing Anthropic's services.
+        cache (ResponseCache, optional): The response cache for read-through, write-through or offline replay.
+            Defaults to None (no cache).
+        rate_limiter (RateLimiter, optional): The rate limiter of API calls. Defaults to the process-wide
+            'anthropic' limiter, see `configure_rate_limiter`.
+        prompt_caching (bool, optional): Mark the system prompt, which holds the resume and job description,
+            and the user prompt as cacheable, so repeated iterations read them from Anthropic's prompt cache
+            instead of processing them again. Defaults to False.
+        base_url (str, optional): The API base URL, e.g. a local stub of the Messages API. Defaults to None
+            (the Anthropic API).
 
     Raises:
         ValueError: If API key is not provided.
@@ -22,9 +55,21 @@ class ClaudeGenerator:
         api_key (str): The API key for accessing Anthropic's services.
         client: An instance of the Anthropic client.
         messages (List[Dict[str, Any]]): A list to store interview messages.
+        cache (Optional[ResponseCache]): The response cache consulted before calling the API.
+        usage (Dict[str, int]): The total 'input_tokens', 'output_tokens', 'cache_creation_input_tokens',
+            'cache_read_input_tokens' and 'requests' reported by the API.
+        last_usage (Dict[str, int]): The token usage of the last API response.
     """
 
-    def __init__(self, model: str = "claude-3-opus-20240229", api_key: str = None):
+    def __init__(
+        self,
+        model: str = "claude-3-opus-20240229",
+        api_key: str = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        prompt_caching: bool = False,
+        base_url: Optional[str] = None,
+    ):
         if not api_key:
             raise ValueError(
                 "API key is required. Visit https://console.anthropic.com/"
@@ -32,107 +77,215 @@ class ClaudeGenerator:
         self.model = model
         self.api_key = api_key
         self.client = anthropic.Anthropic(
-            api_key=self.api_key
+            api_key=self.api_key, base_url=base_url
         )  # Initialize the client.
         self.messages: List[Dict[str, Any]] = []
+        self.cache = cache
+        self.prompt_caching = prompt_caching
+        self._rate_limiter = rate_limiter
+        self.usage: Dict[str, int] = dict.fromkeys(USAGE_FIELDS + ("requests",), 0)
+        self.last_usage: Dict[str, int] = {}
+        self._usage_lock = threading.Lock()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter or get_rate_limiter("anthropic")
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """The share of input tokens read from the prompt cache."""
+        total = (
+            self.usage["input_tokens"]
+            + self.usage["cache_creation_input_tokens"]
+            + self.usage["cache_read_input_tokens"]
+        )
+        return self.usage["cache_read_input_tokens"] / total if total else 0.0
 
     def generate_content(
-        self, system_prompt: str, user_prompt: str = "", **kwargs
-    ) -> str:
+        self,
+        system_prompt: Union[str, List[str]],
+        user_prompt: str = "",
+        stream: bool = False,
+        **kwargs,
+    ) -> Union[str, Iterator[Dict[str, str]]]:
         """
         Generates content based on provided prompts.
 
         Args:
-            system_prompt (str): The system prompt.
+            system_prompt (Union[str, List[str]]): The system prompt, or up to three system blocks ordered from the
+                most to the least stable, e.g. [resume and job description, interview-type instructions]. With
+                prompt caching, each block ends a cacheable prefix, so requests sharing the first block reuse it.
             user_prompt (str): The user prompt. Defaults to "".
+            stream (bool): If True, streams the message and returns an iterator that yields each
+                Q/A pair as a dict as soon as it has been parsed. Defaults to False.
 
         Returns:
-            str: The generated content.
+            Union[str, Iterator[Dict[str, str]]]: The generated content, or an iterator of Q/A pairs if `stream` is True.
         """
         self._add_message("user", user_prompt)
-        try:
-            response = self.client.messages.create(
+        messages = list(self.messages)
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(
+                provider="anthropic",
                 model=self.model,
-                max_tokens=4096,
-                temperature=0.0,
                 system=system_prompt,
-                messages=self.messages,
+                messages=messages,
                 **kwargs,
             )
+        if stream:
+            return self._stream_content(system_prompt, messages, key, **kwargs)
+        if key is None:
+            return self._create_message(system_prompt, messages, **kwargs)
+        return self.cache.fetch(
+            key, lambda: self._create_message(system_prompt, messages, **kwargs)
+        )
+
+    def _create_message(
+        self, system_prompt: str, messages: List[Dict[str, Any]], **kwargs
+    ) -> str:
+        """
+        Sends the messages to the API and returns the response text.
+        """
+        try:
+            response = self.rate_limiter.call(
+                lambda: self.client.messages.create(
+                    model=self.model,
+                    max_tokens=4096,
+                    temperature=0.0,
+                    system=self._system_param(system_prompt),
+                    messages=self._messages_param(messages),
+                    **kwargs,
+                ),
+                tokens=self._estimate_tokens(system_prompt, messages),
+            )
+            self._record_usage(response.usage)
             return response.content[0].text
         except Exception as e:
             raise Exception(f"APIErrorOccurred: {str(e)}")
 
-    def _add_message(self, role: str, content: str) -> None:
+    def _stream_content(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, Any]],
+        key: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator[Dict[str, str]]:
         """
-        Adds a message to the interview.
-
-        Args:
-            role (str): The role of the participant adding the message.
-            content (str): The content of the message.
+        Streams the message and yields Q/A pairs as they complete.
         """
-        if not self.messages or not self.messages[0].get("role"):
-            self.messages = [{"role": role, "content": content}]
+        cached = self.cache.read(key) if key is not None else None
 
-    def generate_interview_content(
-        self, system_prompt: str, user_prompt: str, iteration: int, save_dir: str
-    ) -> Dict[str, Any]:
+        parser = QAStreamParser()
+        chunks = (
+            [cached]
+            if cached is not None
+            else self._stream_message(system_prompt, messages, **kwargs)
+        )
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        pairs, leftovers = parser.close()
+        yield from pairs
+        if leftovers:
+            yield leftovers
+
+        if cached is None and key is not None:
+            self.cache.write(key, parser.text)
+
+    def _stream_message(
+        self, system_prompt: str, messages: List[Dict[str, Any]], **kwargs
+    ) -> Iterator[str]:
+        """
+        Sends the messages to the API with streaming and yields the text deltas.
         """
-        Generate interview content by interacting with the model.
 
-        This method interacts with the model for the specified number of iterations,
-        generating interview content based on the system prompt and a list of user prompts.
-        It saves the generated content in JSON format to the specified directory.
+        def open_stream():
+            stream_manager = self.client.messages.stream(
+                model=self.model,
+                max_tokens=4096,
+                temperature=0.0,
+                system=self._system_param(system_prompt),
+                messages=self._messages_param(messages),
+                **kwargs,
+            )
+            return stream_manager, stream_manager.__enter__()
 
-        Args:
-            system_prompt (str): The initial prompt to start the conversation.
-            user_prompts (str): A list of prompts from users to continue the conversation.
-            iteration (int): The number of iterations to generate interview content.
-            save_dir (str): The directory path to save the generated interview content.
+        try:
+            # The request is sent on entering the stream; retries only happen before any text is yielded.
+            stream_manager, stream = self.rate_limiter.call(
+                open_stream,
+                tokens=self._estimate_tokens(system_prompt, messages),
+            )
+            try:
+                for text in stream.text_stream:
+                    yield text
+                self._record_usage(stream.get_final_message().usage)
+            finally:
+                stream_manager.__exit__(None, None, None)
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
 
-        Returns:
-            Dict[str, Any]: A dictionary containing the generated interview content.
+    def _system_param(
+        self, system_prompt: Union[str, List[str]]
+    ) -> Union[str, List[Dict[str, Any]]]:
+        """
+        Builds the `system` request parameter, marking each block as cacheable with prompt caching.
+        """
+        if isinstance(system_prompt, str):
+            if not self.prompt_caching:
+                return system_prompt
+            system_prompt = [system_prompt]
+        if self.prompt_caching and len(system_prompt) > 3:
+            # The API allows four cache breakpoints; one is used for the messages.
+            raise ValueError("At most three system blocks can be cached.")
+        blocks = []
+        for text in system_prompt:
+            block: Dict[str, Any] = {"type": "text", "text": text}
+            if self.prompt_caching:
+                block["cache_control"] = EPHEMERAL_CACHE_CONTROL
+            blocks.append(block)
+        return blocks
 
-        Raises:
-            None
+    def _messages_param(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Marks the last message as the end of the cacheable prefix with prompt caching.
         """
-        total_qa_dict: Dict[str, Any] = {}
-        cached_dir = os.path.join(save_dir, "cached")
-        os.makedirs(cached_dir, exist_ok=True)
+        if not self.prompt_caching or not messages:
+            return messages
+        last = messages[-1]
+        content = last["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        content = [dict(block) for block in content]
+        content[-1]["cache_control"] = EPHEMERAL_CACHE_CONTROL
+        return messages[:-1] + [{**last, "content": content}]
 
-        for i in range(iteration):
-            response_text = self.generate_content(system_prompt, user_prompt)
-            batch_qa_dict = self._postprocess_response(response_text)
-            batch_file_path = os.path.join(
-                cached_dir,
-                f"batch_output_{i}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.json",
-            )
-            with open(batch_file_path, "w", encoding="utf-8") as f:
-                json.dump(batch_qa_dict, f, ensure_ascii=False, indent=4)
-            total_qa_dict.update(
-                batch_qa_dict if isinstance(batch_qa_dict, dict) else {}
-            )
+    @staticmethod
+    def _estimate_tokens(
+        system_prompt: Union[str, List[str]], messages: List[Dict[str, Any]]
+    ) -> int:
+        if not isinstance(system_prompt, str):
+            system_prompt = "\n\n".join(system_prompt)
+        return estimate_tokens(system_prompt) + estimate_message_tokens(messages)
 
-        print(f"Each response saved in cached folder: {cached_dir}")
-        return total_qa_dict
+    def _record_usage(self, usage: Any) -> None:
+        last_usage = {field: getattr(usage, field, None) or 0 for field in USAGE_FIELDS}
+        with self._usage_lock:
+            self.last_usage = last_usage
+            for field, value in last_usage.items():
+                self.usage[field] += value
+            self.usage["requests"] += 1
 
-    def _postprocess_response(self, response_text: str) -> Dict[str, Any]:
+    def _add_message(self, role: str, content: str) -> None:
         """
-        Postprocesses the response text.
+        Adds a message to the interview.
 
         Args:
-            response_text (str): The response text to be postprocessed.
-
-        Returns:
-            Dict[str, Any]: The postprocessed response as a dictionary.
+            role (str): The role of the participant adding the message.
+            content (str): The content of the message.
         """
-        try:
-            return eval(response_text)
-        except SyntaxError:
-            return {
-                "UnparsedPayload"
-                + datetime.now().strftime("%Y%m%d%H%M%S%f"): response_text
-            }
+        if not self.messages or not self.messages[0].get("role"):
+            self.messages = [{"role": role, "content": content}]
 
     def _reset_messages(self) -> None:
         self.messages = []
@@ -147,40 +300,26 @@ class ClaudeGenerator:
         interviewer_resume: str = "",
         max_sentence: int = 10,
         custom_prompt: str = "",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
     ) -> str:
         """
-        Generates a custom interview prompt.
-        """
-        if jd and jd.endswith((".pdf", ".txt")):
-            jd = load_file_content(jd)
-        if candidate_resume and candidate_resume.endswith((".pdf", ".txt")):
-            candidate_resume = load_file_content(candidate_resume)
-        if interviewer_resume and interviewer_resume.endswith((".pdf", ".txt")):
-            candidate_resume = load_file_content(candidate_resume)
-
-        base = f"You are a helpful assistant and the {interview_type} interviewer for a candidate for the {position} position. Please formulate questions based on the interviewee resume as follow:\n\n{candidate_resume}.\n\nand job description as follow:\n\n{jd}.\nWrite in {language} and create answers containing at least {max_sentence} sentences each."
-
-        if interviewer_resume:
-            base += f"Given the interviewer's career background, craft sharp questions for the candidate based on the interviewer's experience and expertise.\n- Resume of interviewer:\n{interviewer_resume}"
-        instructions = {
-            "generalQAs": "Inquire about both technical skills and personal qualities. Ask in-depth and professionally, pressing for truth about strengths and weaknesses, and ask sequentially to gauge depth of knowledge.",
-            "generalTechQAs": "Overall, ask professional questions about basic concepts commonly used, referencing the given position or resume. For example, if it's for an AI Researcher position, ask simple questions about the basic principles of CNN and the differences between CNN and ViT.",
-            "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
-            "techQAsFromExperts": "Create questions from your expertise related to the position.",
-            "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
-            "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
-            "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
-        }
-        specific_instructions = instructions.get(
-            interview_type,
-            "Inquire about both technical skills and personal qualities.",
-        )
-        prompt = f"{base}\n\n{specific_instructions}"
+        Generates a custom interview prompt. Arguments ending in .pdf or .txt are read from the file.
 
-        return (
-            prompt + f"\nAdditional Instructions: {custom_prompt}"
-            if custom_prompt
-            else prompt
+        The documents are normalized and cut to fit `max_tokens`, or `prompt_budget(model)`,
+        see `prompter.build_system_prompt`.
+        """
+        return prompter.create_system_prompt(
+            candidate_resume=candidate_resume,
+            jd=jd,
+            interviewer_resume=interviewer_resume,
+            interview_type=interview_type,
+            position=position,
+            language=language,
+            max_sentence=max_sentence,
+            custom_prompt=custom_prompt,
+            instructions=INSTRUCTIONS,
+            max_tokens=max_tokens if max_tokens is not None else prompt_budget(model),
         )
 
     @staticmethod
@@ -1 +1,144 @@
-# To-Do: Using official API and python-gemini-api package
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Union
+from openinterview.models.base import GeneratorMixin
+from openinterview.utils.cache import ResponseCache
+from openinterview.utils.history import ConversationHistory
+from openinterview.utils.parser import QAStreamParser
+from openinterview.utils.rate_limit import RateLimiter, get_rate_limiter
+from openinterview.utils.tokens import estimate_message_tokens
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class GeminiGenerator(GeneratorMixin):
+    """
+    A minimal Google Gemini engine over the `generateContent` REST endpoint.
+
+    Requests are sent with `requests` instead of an SDK; streaming is emulated by parsing the
+    complete response, so pairs arrive together once the request finishes.
+
+    Attributes:
+        model (str): The Gemini model, e.g. "gemini-1.5-flash".
+        api_key (str): The Google AI Studio API key.
+        api_base (str): The API base URL.
+        history (ConversationHistory): The bounded conversation history sent with each request.
+        cache (Optional[ResponseCache]): The response cache consulted before calling the API.
+        rate_limiter (RateLimiter): The rate limiter and retry policy of API calls.
+        timeout (float): The request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        model: str = "gemini-1.5-flash",
+        api_key: Optional[str] = None,
+        history: Optional[ConversationHistory] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        api_base: str = GEMINI_API_BASE,
+        timeout: float = 120.0,
+    ) -> None:
+        if not api_key:
+            raise ValueError(
+                "API key is required. Visit https://aistudio.google.com/app/apikey"
+            )
+        import requests
+
+        self.model = model
+        self.api_key = api_key
+        self.api_base = api_base.rstrip("/")
+        self.history = history if history is not None else ConversationHistory()
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter or get_rate_limiter("gemini")
+
+    def generate_content(
+        self, system_prompt: str, user_prompt: str = "", stream: bool = False, **kwargs
+    ) -> Union[str, Iterator[Dict[str, str]]]:
+        """
+        Generates content based on the provided prompts.
+
+        Args:
+            system_prompt (str): Describes the context or task for the model.
+            user_prompt (str): Specific user input for the model to respond to.
+            stream (bool): If True, returns an iterator that yields each Q/A pair. Defaults to False.
+
+        Returns:
+            Union[str, Iterator[Dict[str, str]]]: The generated content, or an iterator of Q/A pairs if `stream` is True.
+        """
+        with self._lock:
+            messages, record = self._history_messages(system_prompt, user_prompt)
+
+        if self.cache is None:
+            response_text = self._generate(messages, **kwargs)
+        else:
+            key = self._cache_key(
+                provider="google", model=self.model, messages=messages, **kwargs
+            )
+            response_text = self.cache.fetch(
+                key, lambda: self._generate(messages, **kwargs)
+            )
+        if record:
+            with self._lock:
+                self.history.add("assistant", response_text)
+        if stream:
+            return self._iter_pairs(response_text)
+        return response_text
+
+    def _generate(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Sends the messages to the API and returns the response text."""
+        body: Dict[str, Any] = {
+            "contents": [
+                {
+                    "role": "model" if message["role"] == "assistant" else "user",
+                    "parts": [{"text": message["content"]}],
+                }
+                for message in messages
+                if message["role"] != "system"
+            ],
+            "generationConfig": {"temperature": 0.0, **kwargs},
+        }
+        system = [
+            message["content"] for message in messages if message["role"] == "system"
+        ]
+        if system:
+            body["systemInstruction"] = {"parts": [{"text": "\n\n".join(system)}]}
+
+        def post():
+            response = self.session.post(
+                f"{self.api_base}/models/{self.model}:generateContent",
+                # A header rather than a query parameter keeps the key out of error messages.
+                headers={"x-goog-api-key": self.api_key},
+                json=body,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            data = self.rate_limiter.call(
+                post, tokens=estimate_message_tokens(messages)
+            )
+            parts = data["candidates"][0]["content"]["parts"]
+            return "".join(part.get("text", "") for part in parts)
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
+
+    @staticmethod
+    def _iter_pairs(response_text: str) -> Iterator[Dict[str, str]]:
+        parser = QAStreamParser()
+        yield from parser.feed(response_text)
+        pairs, leftovers = parser.close()
+        yield from pairs
+        if leftovers:
+            yield leftovers
+
+    def _reset_messages(self) -> None:
+        """Resets the conversation history."""
+        with self._lock:
+            self.history.reset()
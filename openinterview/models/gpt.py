@@ -1,29 +1,60 @@
-import os
-import json
+import threading
 import openai  # Must use v0.28 $ pip install -q -U openai==0.28
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from ..utils.file_manager import load_file_content
-
-
-class GptGenerator:
+from typing import List, Dict, Any, Iterator, Optional, Union
+from ..utils.cache import ResponseCache
+from ..utils import prompter
+from ..utils.history import ConversationHistory
+from ..utils.parser import QAStreamParser
+from ..utils.rate_limit import RateLimiter, get_rate_limiter
+from ..utils.tokens import estimate_message_tokens
+from .base import GeneratorMixin
+from .registry import prompt_budget
+
+# The instruction of each interview type, tuned for this model.
+INSTRUCTIONS = {
+    "generalQAs": "Inquire about both technical skills and personal qualities. Ask in-depth and professionally, pressing for truth about strengths and weaknesses, and ask sequentially to gauge depth of knowledge.",
+    "generalTechQAs": "Overall, ask professional questions about basic concepts commonly used, referencing the given position or resume. For example, if it's for an AI Researcher position, ask simple questions about the basic principles of CNN and the differences between CNN and ViT. Using 'I' not 'The candidate'.",
+    "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
+    "techQAsFromExperts": "Create questions from your expertise related to the position.",
+    "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
+    "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
+    "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
+}
+
+
+class GptGenerator(GeneratorMixin):
     """A class for managing GPT-based interviews.
 
     Attributes:
         api_key (str): The API key for authentication with OpenAI.
         model (str): The model version of GPT to use for generating interview content.
         client: The OpenAI client configured with the provided API key.
-        messages (List[Dict[str, str]]): A list of message dictionaries for interview conversations.
+        history (ConversationHistory): The bounded conversation history sent with each request.
+        messages (List[Dict[str, str]]): The message list sent with the next request.
+        request_tokens (List[int]): The estimated number of prompt tokens sent per call.
+        cache (Optional[ResponseCache]): The response cache consulted before calling the API.
+        rate_limiter (RateLimiter): The rate limiter and retry policy of API calls.
     """
 
     def __init__(
-        self, model: str = "gpt-3.5-turbo", api_key: Optional[str] = None
+        self,
+        model: str = "gpt-3.5-turbo",
+        api_key: Optional[str] = None,
+        history: Optional[ConversationHistory] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ) -> None:
         """Initializes the GptGenerator object with a model and an API key.
 
         Args:
             model (str): The model version of GPT to use. Defaults to "gpt-3.5-turbo".
             api_key (Optional[str]): The API key for OpenAI. If not provided, raises a ValueError.
+            history (Optional[ConversationHistory]): The history manager and its token budget. Defaults to a
+                history that keeps the system prompt once, the last exchange and a list of earlier questions.
+            cache (Optional[ResponseCache]): The response cache for read-through, write-through or offline replay.
+                Defaults to None (no cache).
+            rate_limiter (Optional[RateLimiter]): The rate limiter of API calls. Defaults to the process-wide
+                'openai' limiter, see `configure_rate_limiter`.
 
         Raises:
             ValueError: If the API key is not provided.
@@ -33,112 +64,140 @@ class GptGenerator:
         if not self.api_key:
             raise ValueError("API key is required. Visit https://platform.openai.com/")
         self.client = openai.ChatCompletion(api_key=self.api_key)
-        self.messages: List[Dict[str, str]] = []
+        self.history = history if history is not None else ConversationHistory()
+        self.request_tokens: List[int] = []
+        self.cache = cache
+        self._rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        return self.history.messages
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter or get_rate_limiter("openai")
+
+    @property
+    def last_request_tokens(self) -> int:
+        """The estimated number of prompt tokens sent by the last call."""
+        return self.request_tokens[-1] if self.request_tokens else 0
 
     def generate_content(
-        self, system_prompt: str, user_prompt: str = "", **kwargs
-    ) -> str:
+        self, system_prompt: str, user_prompt: str = "", stream: bool = False, **kwargs
+    ) -> Union[str, Iterator[Dict[str, str]]]:
         """
         Generates content based on the provided prompts.
 
         Args:
             system_prompt (str): Describes the context or task for the model.
             user_prompt (str): Specific user input for the model to respond to.
+            stream (bool): If True, streams the completion and returns an iterator that yields each
+                Q/A pair as a dict as soon as it has been parsed. Defaults to False.
 
         Returns:
-            str: The generated content or an error message if generation fails.
+            Union[str, Iterator[Dict[str, str]]]: The generated content, or an iterator of Q/A pairs if `stream` is True.
         """
-        self._add_message("system", system_prompt)
-        self._add_message("user", user_prompt)
+        with self._lock:
+            messages, record = self._history_messages(system_prompt, user_prompt)
 
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(
+                provider="openai", model=self.model, messages=messages, **kwargs
+            )
+        if stream:
+            return self._stream_content(messages, key, record=record, **kwargs)
+
+        if key is None:
+            response_text = self._create_completion(messages, **kwargs)
+        else:
+            response_text = self.cache.fetch(
+                key, lambda: self._create_completion(messages, **kwargs)
+            )
+
+        if record:
+            with self._lock:
+                self._add_message("assistant", response_text)
+        return response_text
+
+    def _create_completion(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Sends the messages to the API and returns the response text."""
+        prompt_tokens = estimate_message_tokens(messages)
+        with self._lock:
+            self.request_tokens.append(prompt_tokens)
         try:
-            response = self.client.create(
-                model=self.model, messages=self.messages, **kwargs
+            response = self.rate_limiter.call(
+                lambda: self.client.create(
+                    model=self.model, messages=messages, **kwargs
+                ),
+                tokens=prompt_tokens,
             )
             response_text: str = response.choices[0].message["content"]
             return response_text
         except Exception as e:
             raise Exception(f"APIErrorOccurred: {str(e)}")
 
-    def _add_message(self, role: str, content: str) -> None:
-        """Adds a message to the conversation history."""
-        self.messages.append({"role": role, "content": content})
-
-    def generate_interview_content(
-        self, system_prompt: str, user_prompt: str, iteration: int, save_dir: str
-    ) -> Dict[str, Any]:
-        """
-        Generate interview content by interacting with the model.
-
-        This method interacts with the model for the specified number of iterations,
-        generating interview content based on the system prompt and a list of user prompts.
-        It saves the generated content in JSON format to the specified directory.
-
-        Args:
-            system_prompt (str): The initial prompt to start the conversation.
-            user_prompts (List[str]): A list of prompts from users to continue the conversation.
-            iteration (int): The number of iterations to generate interview content.
-            save_dir (str): The directory path to save the generated interview content.
-
-        Returns:
-            Dict[str, Any]: A dictionary containing the generated interview content.
-
-        Raises:
-            None
-        """
-        total_qa_dict: Dict[str, Any] = {}
-
-        cached_dir = os.path.join(save_dir, "cached")
-        os.makedirs(cached_dir, exist_ok=True)
-
-        for i in range(iteration):
-            response_text = self.generate_content(system_prompt, user_prompt)
-            batch_qa_dict: Dict[str, Any] = self._postprocess_response(response_text)
-            batch_file_path = os.path.join(
-                cached_dir,
-                f"batch_output_{i}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.json",
-            )
-            with open(batch_file_path, "w", encoding="utf-8") as f:
-                json.dump(batch_qa_dict, f, ensure_ascii=False, indent=4)
-            if isinstance(batch_qa_dict, dict):
-                total_qa_dict.update(batch_qa_dict)
-            total_qa_dict.update(
-                batch_qa_dict if isinstance(batch_qa_dict, dict) else {}
+    def _stream_content(
+        self,
+        messages: List[Dict[str, str]],
+        key: Optional[str] = None,
+        record: bool = True,
+        **kwargs,
+    ) -> Iterator[Dict[str, str]]:
+        """Streams the completion of the messages and yields Q/A pairs as they complete."""
+        cached = self.cache.read(key) if key is not None else None
+
+        parser = QAStreamParser()
+        chunks = (
+            [cached]
+            if cached is not None
+            else self._stream_completion(messages, **kwargs)
+        )
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        pairs, leftovers = parser.close()
+        yield from pairs
+        if leftovers:
+            yield leftovers
+
+        if cached is None and key is not None:
+            self.cache.write(key, parser.text)
+        if record:
+            with self._lock:
+                self._add_message("assistant", parser.text)
+
+    def _stream_completion(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> Iterator[str]:
+        """Sends the messages to the API with streaming and yields the text deltas."""
+        prompt_tokens = estimate_message_tokens(messages)
+        with self._lock:
+            self.request_tokens.append(prompt_tokens)
+        try:
+            # The request is sent by create(); retries only happen before any text is yielded.
+            response = self.rate_limiter.call(
+                lambda: self.client.create(
+                    model=self.model, messages=messages, stream=True, **kwargs
+                ),
+                tokens=prompt_tokens,
             )
+            for chunk in response:
+                delta = chunk["choices"][0]["delta"].get("content")
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise Exception(f"APIErrorOccurred: {str(e)}")
 
-        print(f"Each response saved in cached folder: {cached_dir}")
-        return total_qa_dict
-
-    def _postprocess_response(self, response_text: str) -> Dict[str, Any]:
-        """
-        Process the response text and return a dictionary.
-
-        Args:
-            response_text (str): The response text to be processed.
-
-        Returns:
-            Dict[str, Any]: A dictionary containing the processed response.
-
-        Raises:
-            None
-        """
-        try:
-            parsed_response = eval(response_text)
-            if isinstance(parsed_response, dict):
-                return parsed_response
-        except:
-            try:
-                cleaned_code = response_text.strip("`").strip("python").strip()
-                return eval(cleaned_code)
-            except:
-                return {
-                    "UnparsedPayload"
-                    + datetime.now().strftime("%Y%m%d%H%M%S%f"): response_text
-                }
+    def _add_message(self, role: str, content: str) -> None:
+        """Adds a message to the conversation history."""
+        self.history.add(role, content)
 
     def _reset_messages(self) -> None:
         """Resets the conversation history."""
-        self.messages = []
+        with self._lock:
+            self.history.reset()
+            self.request_tokens = []
 
     @staticmethod
     def create_system_prompt(
@@ -150,40 +209,26 @@ class GptGenerator:
         interviewer_resume: str = "",
         max_sentence: Any = 10,
         custom_prompt: str = "",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
     ) -> str:
         """
-        Generates a custom interview prompt.
-        """
-        if jd and jd.endswith((".pdf", ".txt")):
-            jd = load_file_content(jd)
-        if candidate_resume and candidate_resume.endswith((".pdf", ".txt")):
-            candidate_resume = load_file_content(candidate_resume)
-        if interviewer_resume and interviewer_resume.endswith((".pdf", ".txt")):
-            candidate_resume = load_file_content(candidate_resume)
-
-        base = f"You are a helpful assistant and the {interview_type} interviewer for a candidate for the {position} position. Please formulate questions based on the interviewee resume as follow:\n\n{candidate_resume}.\n\nand job description as follow:\n\n{jd}.\nWrite in {language} and create answers containing at least {max_sentence} sentences each."
-
-        if interviewer_resume:
-            base += f"Given the interviewer's career background, craft sharp questions for the candidate based on the interviewer's experience and expertise.\n- Resume of interviewer:\n{interviewer_resume}"
-        instructions = {
-            "generalQAs": "Inquire about both technical skills and personal qualities. Ask in-depth and professionally, pressing for truth about strengths and weaknesses, and ask sequentially to gauge depth of knowledge.",
-            "generalTechQAs": "Overall, ask professional questions about basic concepts commonly used, referencing the given position or resume. For example, if it's for an AI Researcher position, ask simple questions about the basic principles of CNN and the differences between CNN and ViT. Using 'I' not 'The candidate'.",
-            "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
-            "techQAsFromExperts": "Create questions from your expertise related to the position.",
-            "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
-            "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
-            "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
-        }
-        specific_instructions = instructions.get(
-            interview_type,
-            "Inquire about both technical skills and personal qualities.",
-        )
-        prompt = f"{base}\n\n{specific_instructions}"
+        Generates a custom interview prompt. Arguments ending in .pdf or .txt are read from the file.
 
-        return (
-            prompt + f"\nAdditional Instructions: {custom_prompt}"
-            if custom_prompt
-            else prompt
+        The documents are normalized and cut to fit `max_tokens`, or `prompt_budget(model)`,
+        see `prompter.build_system_prompt`.
+        """
+        return prompter.create_system_prompt(
+            candidate_resume=candidate_resume,
+            jd=jd,
+            interviewer_resume=interviewer_resume,
+            interview_type=interview_type,
+            position=position,
+            language=language,
+            max_sentence=max_sentence,
+            custom_prompt=custom_prompt,
+            instructions=INSTRUCTIONS,
+            max_tokens=max_tokens if max_tokens is not None else prompt_budget(model),
         )
 
     @staticmethod
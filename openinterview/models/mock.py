@@ -0,0 +1,214 @@
+import random
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Union
+from openinterview.models.async_base import AsyncGeneratorMixin
+from openinterview.models.base import GeneratorMixin
+from openinterview.utils.parser import QAStreamParser
+from openinterview.utils.rate_limit import Clock
+
+_TOPICS = (
+    "data pipeline",
+    "model deployment",
+    "code review",
+    "team conflict",
+    "on-call incident",
+    "database migration",
+    "feature flag rollout",
+    "memory leak",
+    "API design",
+    "mentoring",
+    "load testing",
+    "customer escalation",
+)
+_PROMPTS = (
+    "How did you approach the {topic} in your last role?",
+    "What would you change about the {topic} you led?",
+    "Walk me through a hard decision during the {topic}.",
+    "Which metrics told you the {topic} was working?",
+    "What went wrong with the {topic} and how did you recover?",
+)
+_SENTENCES = (
+    "I owned the {topic} end to end and measured the result before and after the change.",
+    "First I wrote down the constraints and agreed on a rollback plan with the team.",
+    "We shipped it in small steps behind a flag and watched the error rate at each step.",
+    "The main trade-off was speed against safety, and I chose to stage the rollout.",
+    "Afterwards I documented what we learned so the next team could reuse the approach.",
+)
+
+
+class MockGenerator(GeneratorMixin):
+    """
+    An offline engine that returns synthetic Q&A responses without calling any API.
+
+    Responses use the same Python dict format as the model engines, so parsing, deduplication,
+    documents, exports and routing can be exercised without credentials. Latency and failures
+    can be injected, and changed at any time, to simulate a slow or failing provider. With a
+    `jitter` and a `seed`, the latency of each request varies but is reproducible, which makes
+    the engine suitable for benchmarks.
+
+    Example:
+    >>> generator = MockGenerator(pairs_per_response=2)
+    >>> sorted(generator._postprocess_response(generator.generate_content("system")))[:2]
+    ['A_0000001a', 'A_0000001b']
+
+    Attributes:
+        model (str): The model name reported to routers and caches.
+        latency (float): The seconds every request takes on average.
+        jitter (float): The maximum seconds a request is faster or slower than `latency`.
+        error_rate (float): The probability of a request failing with an APIErrorOccurred exception.
+        pairs_per_response (int): The number of Q/A pairs per response.
+        answer_sentences (int): The number of sentences per answer, which sets the response size.
+        responses (Optional[List[str]]): Fixed responses returned in turn instead of synthetic ones.
+        clock (Clock): The clock used for latency; use FakeClock in tests.
+        requests (int): The number of requests received.
+    """
+
+    def __init__(
+        self,
+        model: str = "mock",
+        api_key: Optional[str] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        pairs_per_response: int = 5,
+        responses: Optional[List[str]] = None,
+        seed: int = 1,
+        clock: Optional[Clock] = None,
+        jitter: float = 0.0,
+        answer_sentences: int = 1,
+    ) -> None:
+        self.model = model
+        self.api_key = api_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.pairs_per_response = pairs_per_response
+        self.answer_sentences = answer_sentences
+        self.responses = responses
+        self.clock = clock or Clock()
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._next_id = 0x1A
+        self._lock = threading.Lock()
+
+    def generate_content(
+        self,
+        system_prompt: Any = "",
+        user_prompt: str = "",
+        stream: bool = False,
+        **kwargs,
+    ) -> Union[str, Iterator[Dict[str, str]]]:
+        """
+        Returns a synthetic response after `latency` seconds.
+
+        Args:
+            system_prompt (Any): Ignored.
+            user_prompt (str): Ignored.
+            stream (bool): If True, returns an iterator that yields each Q/A pair. Defaults to False.
+
+        Returns:
+            Union[str, Iterator[Dict[str, str]]]: The response text, or an iterator of Q/A pairs if `stream` is True.
+
+        Raises:
+            Exception: An injected 'APIErrorOccurred' failure.
+        """
+        if stream:
+            return self._stream_content()
+        self.clock.sleep(self._request_latency())
+        return self._next_response()
+
+    def _stream_content(self) -> Iterator[Dict[str, str]]:
+        self.clock.sleep(self._request_latency())
+        parser = QAStreamParser()
+        response_text = self._next_response()
+        # Feed the response in small chunks like a streaming API would.
+        for start in range(0, len(response_text), 64):
+            yield from parser.feed(response_text[start : start + 64])
+        pairs, leftovers = parser.close()
+        yield from pairs
+        if leftovers:
+            yield leftovers
+
+    def _request_latency(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            offset = self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency + offset)
+
+    def _next_response(self) -> str:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise Exception("APIErrorOccurred: mock engine failure")
+            if self.responses:
+                return self.responses[(self.requests - 1) % len(self.responses)]
+            entries = []
+            for _ in range(self.pairs_per_response):
+                identifier = f"{self._next_id:08x}"
+                self._next_id += 1
+                topic = self._random.choice(_TOPICS)
+                question = self._random.choice(_PROMPTS).format(topic=topic)
+                answer = " ".join(
+                    _SENTENCES[n % len(_SENTENCES)].format(topic=topic)
+                    for n in range(max(1, self.answer_sentences))
+                )
+                entries.append(f'    "Q_{identifier}": "{question}",')
+                entries.append(f'    "A_{identifier}": "{answer}",')
+        return "{\n" + "\n".join(entries) + "\n}"
+
+
+class AsyncMockGenerator(AsyncGeneratorMixin, MockGenerator):
+    """
+    The asyncio counterpart of MockGenerator; latency is awaited instead of slept.
+
+    Attributes:
+        max_concurrent_requests (Optional[int]): The maximum number of requests in flight across all callers.
+    """
+
+    def __init__(
+        self,
+        model: str = "mock",
+        api_key: Optional[str] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        pairs_per_response: int = 5,
+        responses: Optional[List[str]] = None,
+        seed: int = 1,
+        clock: Optional[Clock] = None,
+        max_concurrent_requests: Optional[int] = None,
+        jitter: float = 0.0,
+        answer_sentences: int = 1,
+    ) -> None:
+        super().__init__(
+            model=model,
+            api_key=api_key,
+            latency=latency,
+            error_rate=error_rate,
+            pairs_per_response=pairs_per_response,
+            responses=responses,
+            seed=seed,
+            clock=clock,
+            jitter=jitter,
+            answer_sentences=answer_sentences,
+        )
+        self.max_concurrent_requests = max_concurrent_requests
+
+    async def generate_content(
+        self,
+        system_prompt: Any = "",
+        user_prompt: str = "",
+        stream: bool = False,
+        **kwargs,
+    ):
+        """
+        Returns a synthetic response after `latency` seconds, see MockGenerator.
+        """
+        async with self._request_slot():
+            await self.clock.async_sleep(self._request_latency())
+            response_text = self._next_response()
+        if stream:
+            return self._parse_stream(self._aiter_text(response_text), lambda _: None)
+        return response_text
+
+    async def aclose(self) -> None:
+        """Nothing to close; present for the async generator interface."""
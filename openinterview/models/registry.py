@@ -0,0 +1,251 @@
+import inspect
+import warnings
+import importlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# USD per 1K input and output tokens, used by the 'cheapest' routing policy.
+MODEL_COSTS: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "claude-3-opus-20240229": (0.015, 0.075),
+    "claude-3-sonnet-20240229": (0.003, 0.015),
+    "claude-3-haiku-20240307": (0.00025, 0.00125),
+    "gemini-1.5-flash": (0.00035, 0.00105),
+    "gemini-1.5-pro": (0.0035, 0.0105),
+    "mock": (0.0, 0.0),
+}
+
+# Tokens of the context window kept free of the system prompt for the user prompt, the
+# conversation history and the response (Claude requests up to 4096 output tokens).
+DEFAULT_RESERVED_TOKENS = 6144
+
+# Context window in tokens by model name prefix, used to budget system prompts.
+MODEL_CONTEXT_TOKENS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "claude-2": 100000,
+    "claude-3": 200000,
+    "gemini-1.5-flash": 1048576,
+    "gemini-1.5-pro": 2097152,
+}
+
+
+class EngineSpec:
+    """
+    Describes an interview engine that can be created by name.
+
+    Generator classes may be given as 'module:Class' paths, which are imported only when the
+    engine is created, so registering an engine does not load its SDK.
+
+    Attributes:
+        name (str): The engine name, e.g. 'GPT'. Lookups are case-insensitive.
+        generator (Union[type, str]): The synchronous generator class or its 'module:Class' path.
+        async_generator (Optional[Union[type, str]]): The asyncio generator class or its path, if any.
+        api_key_env (Optional[str]): The environment variable holding the API key; None if no key is needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        generator: Union[type, str],
+        async_generator: Optional[Union[type, str]] = None,
+        api_key_env: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.generator = generator
+        self.async_generator = async_generator
+        self.api_key_env = api_key_env
+
+    def load(self, asynchronous: bool = False) -> type:
+        """
+        Returns the generator class, importing it on first use.
+
+        Raises:
+            ValueError: If `asynchronous` is True and the engine has no asyncio generator.
+        """
+        target = self.async_generator if asynchronous else self.generator
+        if target is None:
+            raise ValueError(f"Engine '{self.name}' has no asyncio generator.")
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(":")
+            target = getattr(importlib.import_module(module_name), class_name)
+        return target
+
+    def __repr__(self) -> str:
+        return f"EngineSpec({self.name!r})"
+
+
+ENGINES: Dict[str, EngineSpec] = {}
+
+# Generator options known under another name by some engines, e.g. the OpenAI generators
+# call the base URL `api_base`. Options are renamed only if the generator lacks the name.
+OPTION_ALIASES: Dict[str, str] = {"base_url": "api_base"}
+
+
+def register_engine(
+    name: str,
+    generator: Union[type, str],
+    async_generator: Optional[Union[type, str]] = None,
+    api_key_env: Optional[str] = None,
+) -> EngineSpec:
+    """
+    Adds or replaces an engine, e.g. a local model server or a test double.
+
+    The generator must provide `generate_content(system_prompt, user_prompt, stream=False)`;
+    subclassing `GeneratorMixin` adds the iteration methods `InterviewManager` uses.
+
+    Example:
+    >>> spec = register_engine("Echo", "my_package.echo:EchoGenerator")  # doctest: +SKIP
+    >>> InterviewManager(api_key=None, engine="Echo")  # doctest: +SKIP
+
+    Returns:
+        EngineSpec: The registered engine.
+    """
+    spec = EngineSpec(name, generator, async_generator, api_key_env)
+    ENGINES[name.lower()] = spec
+    return spec
+
+
+def get_engine(name: str) -> EngineSpec:
+    """
+    Returns the engine registered under `name`.
+
+    Raises:
+        ValueError: If no such engine is registered.
+    """
+    try:
+        return ENGINES[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported engine '{name}'. Choose one of {', '.join(available_engines())}."
+        )
+
+
+def available_engines() -> List[str]:
+    """Returns the names of the registered engines."""
+    return [spec.name for spec in ENGINES.values()]
+
+
+def create_generator(
+    engine: str, api_key: Optional[str] = None, asynchronous: bool = False, **options
+) -> Any:
+    """
+    Creates the generator of a registered engine.
+
+    Options the generator does not accept are dropped with a warning, so engine-specific
+    settings such as `prompt_caching` can be given to a router over several engines. An
+    option found in `OPTION_ALIASES`, e.g. `base_url`, is passed under the generator's name.
+
+    Args:
+        engine (str): The engine name, e.g. 'GPT', 'Claude', 'Gemini' or 'Mock'.
+        api_key (str, optional): The API key of the engine.
+        asynchronous (bool, optional): Create the asyncio generator. Defaults to False.
+        **options: Generator options such as `model`, `cache` or `prompt_caching`. None values are dropped.
+
+    Returns:
+        The generator.
+
+    Raises:
+        ValueError: If the engine is not registered, or has no asyncio generator when `asynchronous` is True.
+    """
+    spec = get_engine(engine)
+    generator_class = spec.load(asynchronous)
+    parameters = inspect.signature(generator_class).parameters
+    accepts_any = any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+    kwargs = {}
+    unsupported = []
+    for name, value in options.items():
+        if value is None:
+            continue
+        if not accepts_any and name not in parameters:
+            alias = OPTION_ALIASES.get(name)
+            if alias not in parameters:
+                unsupported.append(name)
+                continue
+            name = alias
+        kwargs[name] = value
+    if unsupported:
+        warnings.warn(
+            f"Engine '{spec.name}' does not support {', '.join(unsupported)}; ignored.",
+            stacklevel=2,
+        )
+    return generator_class(api_key=api_key, **kwargs)
+
+
+def get_model_cost(model: str) -> Optional[float]:
+    """
+    Returns the USD price of 1K input plus 1K output tokens of a model, or None if unknown.
+
+    Example:
+    >>> get_model_cost("gpt-3.5-turbo")
+    0.002
+    """
+    costs = MODEL_COSTS.get(model)
+    return round(sum(costs), 6) if costs is not None else None
+
+
+def get_context_window(model: Optional[str]) -> Optional[int]:
+    """
+    Returns the context window of a model in tokens, or None if unknown.
+
+    Dated and suffixed versions match the longest known prefix.
+
+    Example:
+    >>> get_context_window("gpt-4-turbo-2024-04-09")
+    128000
+    """
+    if not model:
+        return None
+    matches = [prefix for prefix in MODEL_CONTEXT_TOKENS if model.startswith(prefix)]
+    return MODEL_CONTEXT_TOKENS[max(matches, key=len)] if matches else None
+
+
+def prompt_budget(
+    model: Optional[str], reserved_tokens: int = DEFAULT_RESERVED_TOKENS
+) -> Optional[int]:
+    """
+    Returns the system prompt token budget of a model: its context window minus `reserved_tokens`.
+
+    Example:
+    >>> prompt_budget("gpt-4")
+    2048
+
+    Returns:
+        Optional[int]: The budget, or None if the model's context window is unknown.
+    """
+    context_window = get_context_window(model)
+    if context_window is None:
+        return None
+    return max(context_window - reserved_tokens, 0)
+
+
+register_engine(
+    "GPT",
+    "openinterview.models.gpt:GptGenerator",
+    "openinterview.models.async_gpt:AsyncGptGenerator",
+    api_key_env="OPENAI_API_KEY",
+)
+register_engine(
+    "Claude",
+    "openinterview.models.claude:ClaudeGenerator",
+    "openinterview.models.async_claude:AsyncClaudeGenerator",
+    api_key_env="ANTHROPIC_API_KEY",
+)
+register_engine(
+    "Gemini",
+    "openinterview.models.gemini:GeminiGenerator",
+    api_key_env="GOOGLE_API_KEY",
+)
+register_engine(
+    "Mock",
+    "openinterview.models.mock:MockGenerator",
+    "openinterview.models.mock:AsyncMockGenerator",
+)
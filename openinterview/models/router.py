@@ -0,0 +1,381 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from openinterview.models.base import GeneratorMixin
+from openinterview.models.registry import create_generator, get_model_cost
+from openinterview.utils.rate_limit import Clock
+
+ROUTING_POLICIES = ("fastest", "cheapest", "failover")
+
+
+class EngineStats:
+    """
+    Rolling latency and error statistics of one engine and model.
+
+    The last `window` requests are kept, so the statistics follow a provider that slows down
+    or starts failing, and recover once it is healthy again.
+
+    Attributes:
+        engine (str): The engine name.
+        model (str): The model name.
+        requests (int): The number of requests recorded since creation.
+        errors (int): The number of failed requests recorded since creation.
+        consecutive_errors (int): The number of failures since the last success.
+        last_error (Optional[str]): The message of the last failure.
+    """
+
+    def __init__(self, engine: str, model: str, window: int = 50) -> None:
+        self.engine = engine
+        self.model = model
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_request_at: Optional[float] = None
+        self.last_error_at: Optional[float] = None
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(
+        self, latency: float, now: float, error: Optional[BaseException] = None
+    ) -> None:
+        """Records the latency in seconds of a request, and its error if it failed."""
+        with self._lock:
+            self.requests += 1
+            self.last_request_at = now
+            self._samples.append((latency, error is None))
+            if error is None:
+                self.consecutive_errors = 0
+                return
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = str(error)
+            self.last_error_at = now
+
+    @property
+    def samples(self) -> int:
+        """The number of requests in the window."""
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        """The share of failed requests in the window."""
+        with self._lock:
+            samples = list(self._samples)
+        return sum(not ok for _, ok in samples) / len(samples) if samples else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the q-th percentile (0-100) latency in seconds of the successful requests in the window.
+
+        Example:
+        >>> stats = EngineStats("Mock", "mock")
+        >>> for latency in (0.3, 0.1, 0.2):
+        ...     stats.record(latency, now=0.0)
+        >>> stats.percentile(50)
+        0.2
+        """
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(q / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the statistics as a JSON-serializable dict."""
+        return {
+            "engine": self.engine,
+            "model": self.model,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "error_rate": self.error_rate,
+            "p50": self.p50,
+            "p95": self.p95,
+            "last_error": self.last_error,
+        }
+
+
+_engine_stats: Dict[Tuple[str, str], EngineStats] = {}
+_engine_stats_lock = threading.Lock()
+
+
+def get_engine_stats(engine: str, model: str, window: int = 50) -> EngineStats:
+    """
+    Returns the process-wide statistics of an engine and model, shared by all routers, so
+    that jobs started later, e.g. by `BatchRunner`, benefit from what earlier jobs measured.
+    """
+    with _engine_stats_lock:
+        key = (engine, model)
+        if key not in _engine_stats:
+            _engine_stats[key] = EngineStats(engine, model, window)
+        return _engine_stats[key]
+
+
+def reset_engine_stats() -> None:
+    """Forgets the process-wide engine statistics."""
+    with _engine_stats_lock:
+        _engine_stats.clear()
+
+
+class EngineRouter(GeneratorMixin):
+    """
+    Routes each request to one of several engines according to a policy, with failover.
+
+    Policies:
+        - 'fastest': the healthy engine with the lowest median latency. Engines without recent
+          measurements are tried first, so a provider that was slow is probed again after
+          `probe_interval` seconds and gets traffic back once it is fast.
+        - 'cheapest': the healthy engine with the lowest price per token, see `MODEL_COSTS`.
+        - 'failover': the first healthy engine in the given order.
+
+    An engine is unhealthy for `cooldown` seconds after `max_consecutive_errors` failures in
+    a row, or while more than `max_error_rate` of its last requests failed. Unhealthy engines
+    are only tried when all healthy ones fail. A request that fails on one engine is retried
+    on the next, so a job only fails when every engine does; a stream only fails over before
+    its first pair has been yielded.
+
+    The router has the generator interface, so it can be used wherever a generator is, e.g.
+    as the engine of `InterviewManager`.
+
+    Example:
+    >>> router = EngineRouter({"Fast": MockGenerator(latency=0.01), "Slow": MockGenerator(latency=0.5)})  # doctest: +SKIP
+    >>> qa_dict = router.generate_interview_content(system_prompt, user_prompt, 5, "output")  # doctest: +SKIP
+    >>> router.stats["Slow"]["p50"]  # doctest: +SKIP
+
+    Attributes:
+        engines (Dict[str, Any]): The generators, keyed by engine name, in order of preference.
+        policy (str): 'fastest', 'cheapest' or 'failover'.
+        last_engine (Optional[str]): The engine that served the last successful request.
+    """
+
+    def __init__(
+        self,
+        engines: Union[Dict[str, Any], Sequence[Any]],
+        policy: str = "fastest",
+        max_error_rate: float = 0.5,
+        max_consecutive_errors: int = 3,
+        min_samples: int = 5,
+        cooldown: float = 30.0,
+        probe_interval: float = 60.0,
+        window: int = 50,
+        stats: Optional[Dict[str, EngineStats]] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        """
+        Args:
+            engines (Union[Dict[str, Any], Sequence[Any]]): The generators keyed by engine name, or a list of
+                generators named after their class. The order is the preference order.
+            policy (str, optional): The routing policy. Defaults to 'fastest'.
+            max_error_rate (float, optional): The error rate in the window above which an engine is unhealthy. Defaults to 0.5.
+            max_consecutive_errors (int, optional): The failures in a row after which an engine is unhealthy. Defaults to 3.
+            min_samples (int, optional): The requests in the window needed before the error rate counts. Defaults to 5.
+            cooldown (float, optional): The seconds an unhealthy engine is avoided after its last failure. Defaults to 30.
+            probe_interval (float, optional): The seconds after which an engine's latency is measured again. Defaults to 60.
+            window (int, optional): The number of recent requests the statistics cover. Defaults to 50.
+            stats (Dict[str, EngineStats], optional): The statistics per engine name. Defaults to the
+                process-wide statistics of each engine and model, see `get_engine_stats`.
+            clock (Clock, optional): The clock used for latency; use FakeClock in tests.
+
+        Raises:
+            ValueError: If there are no engines or the policy is unknown.
+        """
+        if not isinstance(engines, dict):
+            engines = {type(generator).__name__: generator for generator in engines}
+        if not engines:
+            raise ValueError("At least one engine is required.")
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(
+                f"Unsupported routing policy '{policy}'. Choose one of {', '.join(ROUTING_POLICIES)}."
+            )
+        self.engines: Dict[str, Any] = dict(engines)
+        self.policy = policy
+        self.max_error_rate = max_error_rate
+        self.max_consecutive_errors = max_consecutive_errors
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.clock = clock or Clock()
+        self.last_engine: Optional[str] = None
+        self._stats = {
+            name: (stats or {}).get(name)
+            or get_engine_stats(name, getattr(generator, "model", ""), window)
+            for name, generator in self.engines.items()
+        }
+
+    @classmethod
+    def from_engines(
+        cls,
+        engines: Sequence[str],
+        api_key: Union[str, Dict[str, str], None] = None,
+        policy: str = "fastest",
+        **options,
+    ) -> "EngineRouter":
+        """
+        Creates a router over registered engines.
+
+        Args:
+            engines (Sequence[str]): The engine names in order of preference, e.g. ["Claude", "GPT"].
+            api_key (Union[str, Dict[str, str]], optional): The API key of each engine, keyed by engine name.
+            policy (str, optional): The routing policy. Defaults to 'fastest'.
+            **options: Passed to `create_generator` for every engine, e.g. `cache`. Options an engine does
+                not support, e.g. `prompt_caching` for GPT, are dropped for it with a warning.
+
+        Returns:
+            EngineRouter: The router.
+        """
+        keys = api_key if isinstance(api_key, dict) else {}
+        return cls(
+            {
+                name: create_generator(
+                    name,
+                    api_key=keys.get(name, None if keys else api_key),
+                    **options,
+                )
+                for name in engines
+            },
+            policy=policy,
+        )
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """The rolling statistics of each engine, with its health and price."""
+        now = self.clock.monotonic()
+        return {
+            name: {
+                **stats.snapshot(),
+                "healthy": self._is_healthy(stats, now),
+                "cost_per_1k_tokens": get_model_cost(stats.model),
+            }
+            for name, stats in self._stats.items()
+        }
+
+    @property
+    def usage(self) -> Dict[str, int]:
+        """The token usage summed over the engines that report it."""
+        total: Dict[str, int] = {}
+        for generator in self.engines.values():
+            for key, value in getattr(generator, "usage", {}).items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def rank(self) -> List[str]:
+        """Returns the engine names in the order they would be tried for the next request."""
+        now = self.clock.monotonic()
+        order = list(self.engines)
+        healthy = [name for name in order if self._is_healthy(self._stats[name], now)]
+        unhealthy = sorted(
+            (name for name in order if name not in healthy),
+            key=lambda name: self._stats[name].last_error_at or 0.0,
+        )
+        if self.policy == "fastest":
+            healthy.sort(key=lambda name: self._latency_key(self._stats[name], now))
+        elif self.policy == "cheapest":
+            healthy.sort(key=self._cost_key)
+        return healthy + unhealthy
+
+    def generate_content(
+        self,
+        system_prompt: Any,
+        user_prompt: str = "",
+        stream: bool = False,
+        **kwargs,
+    ) -> Union[str, Iterator[Dict[str, str]]]:
+        """
+        Generates content on the engine chosen by the policy, failing over on errors.
+
+        Args:
+            system_prompt (Any): The system prompt.
+            user_prompt (str): The user prompt. Defaults to "".
+            stream (bool): If True, returns an iterator that yields each Q/A pair. Defaults to False.
+
+        Returns:
+            Union[str, Iterator[Dict[str, str]]]: The generated content, or an iterator of Q/A pairs if `stream` is True.
+
+        Raises:
+            Exception: The error of the last engine tried, if every engine failed.
+        """
+        if stream:
+            return self._stream_content(system_prompt, user_prompt, **kwargs)
+        last_error: Optional[Exception] = None
+        for name in self.rank():
+            start = self.clock.monotonic()
+            try:
+                response_text = self.engines[name].generate_content(
+                    system_prompt, user_prompt, **kwargs
+                )
+            except Exception as e:
+                self._record(name, start, e)
+                last_error = e
+                continue
+            self._record(name, start)
+            return response_text
+        raise last_error
+
+    def _stream_content(
+        self, system_prompt: Any, user_prompt: str, **kwargs
+    ) -> Iterator[Dict[str, str]]:
+        last_error: Optional[Exception] = None
+        for name in self.rank():
+            start = self.clock.monotonic()
+            yielded = False
+            try:
+                for qa_pair in self.engines[name].generate_content(
+                    system_prompt, user_prompt, stream=True, **kwargs
+                ):
+                    yielded = True
+                    yield qa_pair
+            except Exception as e:
+                self._record(name, start, e)
+                if yielded:
+                    raise
+                last_error = e
+                continue
+            self._record(name, start)
+            return
+        raise last_error
+
+    def _record(
+        self, name: str, start: float, error: Optional[BaseException] = None
+    ) -> None:
+        now = self.clock.monotonic()
+        self._stats[name].record(now - start, now, error)
+        if error is None:
+            self.last_engine = name
+
+    def _is_healthy(self, stats: EngineStats, now: float) -> bool:
+        if stats.last_error_at is None or now - stats.last_error_at >= self.cooldown:
+            return True
+        if stats.consecutive_errors >= self.max_consecutive_errors:
+            return False
+        return not (
+            stats.samples >= self.min_samples and stats.error_rate > self.max_error_rate
+        )
+
+    def _latency_key(self, stats: EngineStats, now: float) -> float:
+        p50 = stats.p50
+        if p50 is None or now - (stats.last_request_at or 0.0) >= self.probe_interval:
+            return -1.0  # Not measured recently: probe it.
+        return p50
+
+    def _cost_key(self, name: str) -> Tuple[float, float]:
+        stats = self._stats[name]
+        cost = get_model_cost(stats.model)
+        return (float("inf") if cost is None else cost, stats.p50 or 0.0)
+
+    def create_system_prompt(self, **kwargs) -> Any:
+        """Generates the system prompt of the first engine, see its `create_system_prompt`."""
+        return next(iter(self.engines.values())).create_system_prompt(**kwargs)
+
+    def create_base_prompt(self, interview_type: str) -> str:
+        """Generates the base prompt of the first engine, see its `create_base_prompt`."""
+        return next(iter(self.engines.values())).create_base_prompt(interview_type)
@@ -1,7 +1,21 @@
-from openinterview.modules.voice.google import google_tts, google_stt, save_google_tts
-from openinterview.modules.voice.random_play import RandomPlayer
+from openinterview.utils.lazy import lazy_attributes
 
-try:
-    from openinterview.modules.voice.openai import openai_tts, openai_stt
-except ImportError:
-    pass
+_LAZY_ATTRIBUTES = {
+    "google_tts": "openinterview.modules.voice.google",
+    "google_stt": "openinterview.modules.voice.google",
+    "save_google_tts": "openinterview.modules.voice.google",
+    "get_tts_lang": "openinterview.modules.voice.google",
+    "google_tts_bytes": "openinterview.modules.voice.google",
+    "AudioArchive": "openinterview.modules.voice.archive",
+    "iter_transcription": "openinterview.modules.voice.transcribe",
+    "stitch_transcript": "openinterview.modules.voice.transcribe",
+    "MockRecognizer": "openinterview.modules.voice.transcribe",
+    "RandomPlayer": "openinterview.modules.voice.random_play",
+    "openai_tts": "openinterview.modules.voice.openai",
+    "openai_stt": "openinterview.modules.voice.openai",
+    "SpeechClient": "openinterview.modules.voice.openai",
+    "MockSpeechClient": "openinterview.modules.voice.mock",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
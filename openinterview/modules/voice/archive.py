@@ -0,0 +1,379 @@
+import io
+import os
+import mmap
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+ARCHIVE_EXTENSION = ".oiva"
+INDEX_EXTENSION = ".idx"
+
+_ARCHIVE_MAGIC = b"OIVA\x01\x00\x00\x00"
+_INDEX_MAGIC = b"OIVI\x01\x00\x00\x00"
+# key length, data length, duration in seconds
+_RECORD_HEADER = struct.Struct("<HIf")
+# archive size the index covers, entry count
+_INDEX_HEADER = struct.Struct("<QI")
+# key length, data offset, data length, duration in seconds
+_INDEX_ENTRY = struct.Struct("<HQIf")
+
+# MPEG audio frame tables: bitrates in kbps by [MPEG-1][layer], sample rates by version.
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+class ArchiveEntry(NamedTuple):
+    """The location of a clip in an AudioArchive."""
+
+    offset: int
+    length: int
+    duration: float
+
+
+def mp3_duration(data: bytes) -> float:
+    """
+    Returns the duration in seconds of MP3 data by walking its MPEG frame headers.
+
+    Only headers are parsed, so this is fast and needs no audio library. Returns 0.0 if no
+    frame is found.
+
+    Example:
+    >>> frame = b"\\xff\\xf3\\x44\\xc4" + bytes(92)  # MPEG-2 Layer III, 32 kbps, 24 kHz
+    >>> round(mp3_duration(frame * 100), 3)
+    2.4
+    """
+    position = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # ID3v2 size is a 28-bit syncsafe integer.
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        position = 10 + size
+    duration = 0.0
+    end = len(data) - 4
+    while position <= end:
+        if data[position] != 0xFF or data[position + 1] & 0xE0 != 0xE0:
+            position += 1
+            continue
+        header = int.from_bytes(data[position : position + 4], "big")
+        version = (header >> 19) & 0x3
+        layer = 4 - ((header >> 17) & 0x3)
+        bitrate_index = (header >> 12) & 0xF
+        sample_rate_index = (header >> 10) & 0x3
+        padding = (header >> 9) & 0x1
+        if (
+            version == 1
+            or layer == 4
+            or bitrate_index in (0, 15)
+            or sample_rate_index == 3
+        ):
+            position += 1
+            continue
+        mpeg1 = version == 3
+        bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+        if layer == 1:
+            samples = 384
+            frame_length = (12 * bitrate // sample_rate + padding) * 4
+        else:
+            samples = 1152 if layer == 2 or mpeg1 else 576
+            frame_length = samples // 8 * bitrate // sample_rate + padding
+        duration += samples / sample_rate
+        position += max(frame_length, 1)
+    return duration
+
+
+class AudioArchive:
+    """
+    An append-only archive of audio clips with an offset index, one file per interview.
+
+    A large batch writes two small mp3 files into a directory per question; an archive holds
+    all clips of an interview in a single file instead, which is much faster to create,
+    copy and upload. Each record stores its key, length and duration in front of the audio,
+    so the archive is self-describing. A compact binary index of key -> (offset, length,
+    duration) is kept next to it in `<archive>.idx`; if it is missing or stale, e.g. after a
+    crash, it is rebuilt by reading only the record headers.
+
+    Clips are read through a read-only memory map, so random access for playback does not
+    copy the archive into memory. Adding a key again appends the new clip, and the latest
+    one wins.
+
+    Example:
+    >>> with AudioArchive("output/voice/voice.oiva", "a") as archive:  # doctest: +SKIP
+    ...     archive.add("1a2b3c4d/question.mp3", mp3_bytes)
+    >>> AudioArchive("output/voice/voice.oiva").extract("output/voice")  # doctest: +SKIP
+
+    Attributes:
+        path (str): The path of the archive.
+        mode (str): 'r' to read, 'a' to create or append.
+        entries (Dict[str, ArchiveEntry]): The location of each clip.
+    """
+
+    def __init__(self, path: str, mode: str = "r") -> None:
+        if mode not in ("r", "a"):
+            raise ValueError("mode must be 'r' or 'a'.")
+        self.path = path
+        self.mode = mode
+        self.entries: Dict[str, ArchiveEntry] = {}
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._retired_maps: List[mmap.mmap] = []
+        self._size = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        self.open()
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_EXTENSION
+
+    def open(self) -> "AudioArchive":
+        """Opens the archive and loads its index."""
+        if self._file is not None:
+            return self
+        if self.mode == "a":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if not os.path.exists(self.path):
+                with open(self.path, "wb") as f:
+                    f.write(_ARCHIVE_MAGIC)
+            self._file = open(self.path, "r+b")
+        else:
+            self._file = open(self.path, "rb")
+        if self._file.read(len(_ARCHIVE_MAGIC)) != _ARCHIVE_MAGIC:
+            self._file.close()
+            self._file = None
+            raise ValueError(f"{self.path} is not an audio archive.")
+        self._size = os.fstat(self._file.fileno()).st_size
+        if not self._load_index():
+            self._rebuild_index()
+        return self
+
+    def close(self) -> None:
+        """Writes the index and closes the archive."""
+        with self._lock:
+            if self._file is None:
+                return
+            self.flush()
+            for mapped in self._retired_maps + [self._mmap]:
+                try:
+                    if mapped is not None:
+                        mapped.close()
+                except BufferError:
+                    pass  # A caller still holds a view; the map is freed with it.
+            self._mmap = None
+            self._retired_maps = []
+            self._file.close()
+            self._file = None
+
+    def flush(self) -> None:
+        """Pushes appended clips to disk and rewrites the index."""
+        with self._lock:
+            if self.mode != "a" or not self._dirty:
+                return
+            self._file.flush()
+            self._write_index()
+            self._dirty = False
+
+    def add(
+        self, key: str, data: bytes, duration: Optional[float] = None
+    ) -> ArchiveEntry:
+        """
+        Appends a clip.
+
+        Args:
+            key (str): The clip key, by convention the relative path of the loose file, e.g. '1a2b3c4d/question.mp3'.
+            data (bytes): The encoded audio.
+            duration (float, optional): The duration in seconds. Defaults to the duration of the MP3 frames in `data`.
+
+        Returns:
+            ArchiveEntry: The location of the clip.
+        """
+        if self.mode != "a":
+            raise ValueError("The archive is opened read-only.")
+        encoded_key = key.encode("utf-8")
+        if duration is None:
+            duration = mp3_duration(data)
+        with self._lock:
+            self._file.seek(self._size)
+            self._file.write(_RECORD_HEADER.pack(len(encoded_key), len(data), duration))
+            self._file.write(encoded_key)
+            offset = self._size + _RECORD_HEADER.size + len(encoded_key)
+            self._file.write(data)
+            self._size = offset + len(data)
+            entry = ArchiveEntry(offset, len(data), duration)
+            self.entries[key] = entry
+            self._dirty = True
+        return entry
+
+    def add_file(self, key: str, file_path: str) -> ArchiveEntry:
+        """Appends the clip stored at `file_path`."""
+        with open(file_path, "rb") as f:
+            return self.add(key, f.read())
+
+    def keys(self) -> List[str]:
+        """Returns the clip keys in the order they were first added."""
+        return list(self.entries)
+
+    def view(self, key: str) -> memoryview:
+        """
+        Returns a zero-copy view of a clip from the memory map.
+
+        The view is only valid until the archive is closed.
+
+        Raises:
+            KeyError: If the archive has no such clip.
+        """
+        entry = self.entries[key]
+        with self._lock:
+            self._file.flush()
+            if self._mmap is None or len(self._mmap) < entry.offset + entry.length:
+                # Appended since the archive was mapped: map the new size. Views of the old
+                # map may still be in use, so it is only closed with the archive.
+                if self._mmap is not None:
+                    self._retired_maps.append(self._mmap)
+                self._mmap = mmap.mmap(
+                    self._file.fileno(), self._size, access=mmap.ACCESS_READ
+                )
+            return memoryview(self._mmap)[entry.offset : entry.offset + entry.length]
+
+    def read(self, key: str) -> bytes:
+        """Returns the bytes of a clip."""
+        return bytes(self.view(key))
+
+    def open_clip(self, key: str) -> io.BytesIO:
+        """Returns a clip as a file-like object, e.g. for `pygame.mixer.music.load`."""
+        return io.BytesIO(self.view(key))
+
+    def extract(self, save_dir: str, keys: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Writes clips back to loose files under `save_dir`, using each key as the relative path.
+
+        Args:
+            save_dir (str): The directory to write to.
+            keys (Iterable[str], optional): The clips to extract. Defaults to all.
+
+        Returns:
+            List[str]: The paths written.
+        """
+        paths = []
+        root = os.path.abspath(save_dir)
+        for key in self.keys() if keys is None else keys:
+            path = os.path.abspath(os.path.join(root, key))
+            if os.path.commonpath([root, path]) != root:
+                raise ValueError(f"Clip key '{key}' points outside {save_dir}.")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(self.view(key))
+            paths.append(path)
+        return paths
+
+    @classmethod
+    def pack_directory(
+        cls, directory: str, path: str, extensions: Tuple[str, ...] = (".mp3",)
+    ) -> "AudioArchive":
+        """
+        Packs the loose clips of a directory, e.g. the output of `save_google_tts`, into an archive.
+
+        Returns:
+            AudioArchive: The archive, opened for appending.
+        """
+        archive = cls(path, "a")
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for file in sorted(files):
+                if file.endswith(extensions):
+                    file_path = os.path.join(root, file)
+                    key = os.path.relpath(file_path, directory).replace(os.sep, "/")
+                    archive.add_file(key, file_path)
+        archive.flush()
+        return archive
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        if data[: len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+            return False
+        position = len(_INDEX_MAGIC)
+        entries = {}
+        try:
+            archive_size, count = _INDEX_HEADER.unpack_from(data, position)
+            if archive_size != self._size:
+                return False  # Clips were appended after the index was written.
+            position += _INDEX_HEADER.size
+            for _ in range(count):
+                key_length, offset, length, duration = _INDEX_ENTRY.unpack_from(
+                    data, position
+                )
+                position += _INDEX_ENTRY.size
+                if position + key_length > len(data) or offset + length > self._size:
+                    return False
+                key = data[position : position + key_length].decode("utf-8")
+                position += key_length
+                entries[key] = ArchiveEntry(offset, length, duration)
+        except (struct.error, UnicodeDecodeError):
+            return False  # A truncated or corrupt index; the caller rebuilds it.
+        self.entries = entries
+        return True
+
+    def _rebuild_index(self) -> None:
+        entries = {}
+        position = len(_ARCHIVE_MAGIC)
+        self._file.seek(position)
+        while position + _RECORD_HEADER.size <= self._size:
+            key_length, length, duration = _RECORD_HEADER.unpack(
+                self._file.read(_RECORD_HEADER.size)
+            )
+            offset = position + _RECORD_HEADER.size + key_length
+            if offset + length > self._size:
+                break  # A record cut short by a crash.
+            key = self._file.read(key_length).decode("utf-8")
+            entries[key] = ArchiveEntry(offset, length, duration)
+            position = offset + length
+            self._file.seek(position)
+        if position != self._size and self.mode == "a":
+            self._file.truncate(position)
+        self._size = position
+        self.entries = entries
+        self._dirty = self.mode == "a"
+
+    def _write_index(self) -> None:
+        parts = [_INDEX_MAGIC, _INDEX_HEADER.pack(self._size, len(self.entries))]
+        for key, entry in self.entries.items():
+            encoded_key = key.encode("utf-8")
+            parts.append(
+                _INDEX_ENTRY.pack(
+                    len(encoded_key), entry.offset, entry.length, entry.duration
+                )
+            )
+            parts.append(encoded_key)
+        tmp_path = f"{self.index_path}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(tmp_path, self.index_path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __enter__(self) -> "AudioArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
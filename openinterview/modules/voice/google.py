@@ -1,18 +1,83 @@
 # To-Do: Need QA and error handling
+import io
 import os
+import uuid
+import warnings
 from gtts import gTTS
-from typing import Dict
-import speech_recognition as sr
+from gtts.lang import tts_langs
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Union
+from openinterview.utils.concurrency import iter_ordered
+from openinterview.utils.rate_limit import get_rate_limiter
+from openinterview.utils.telemetry import instrument, span
 
+if TYPE_CHECKING:
+    from openinterview.modules.voice.archive import AudioArchive
 
-def google_tts(text, save_dir, lang="en"):
+
+def get_tts_lang(language: str) -> str:
+    """
+    Converts an interview language such as "English" or "Korean" to a gTTS language code.
+
+    Parameters:
+    - language (str): A language name or a gTTS language code, e.g. "English", "ko" or "zh-CN".
+
+    Returns:
+    - str: The gTTS language code. Falls back to 'en' with a warning if the language is not supported.
+    """
+    langs = tts_langs()
+    if language in langs:
+        return language
+    name = language.strip().lower()
+    for code, lang_name in langs.items():
+        if code.lower() == name or lang_name.lower() == name:
+            return code
+    for code, lang_name in langs.items():
+        if lang_name.lower().startswith(name + " ("):
+            return code
+    warnings.warn(f"Language '{language}' is not supported by gTTS. Using 'en'.")
+    return "en"
+
+
+def google_tts_bytes(text: str, lang: str = "en") -> bytes:
+    """
+    Synthesizes speech with Google's Text-to-Speech API and returns the MP3 bytes.
+
+    Requests go through the 'google_tts' rate limiter, which retries throttled requests.
+
+    Parameters:
+    - text (str): The text to be converted to speech.
+    - lang (str): The language of the text (default is English, 'en').
+
+    Returns:
+    - bytes: The MP3 audio.
+    """
+    tts = gTTS(text=text, lang=lang)
+
+    def synthesize():
+        # Rebuilt on every attempt so a retry never appends to partial audio.
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+    with span("google_tts") as s:
+        data = get_rate_limiter("google_tts").call(synthesize)
+        s.set("bytes", len(data))
+    return data
+
+
+def google_tts(text, save_dir, lang="en", file_name="tts.mp3"):
     """
     Generates and saves a spoken version of the input text using Google's Text-to-Speech API.
 
+    The audio is written to a unique temporary file and atomically renamed to `file_name`,
+    so concurrent calls never collide and a failed call never leaves a partial file.
+    Requests go through the 'google_tts' rate limiter, which retries throttled requests.
+
     Parameters:
     - text (str): The text to be converted to speech.
     - save_dir (str): Directory where the speech file will be saved.
     - lang (str): The language of the text (default is English, 'en').
+    - file_name (str): The name of the speech file (default is 'tts.mp3').
 
     Returns:
     - str: The file path of the saved speech file.
@@ -24,19 +89,49 @@ def google_tts(text, save_dir, lang="en"):
     """
     tts = gTTS(text=text, lang=lang)
     os.makedirs(save_dir, exist_ok=True)
-    save_path = f"{save_dir}/tts.mp3"
-    tts.save(save_path)
+    save_path = os.path.join(save_dir, file_name)
+    tmp_path = f"{save_path}.{uuid.uuid4().hex}.part"
+
+    def synthesize():
+        # Reopened on every attempt so a retry never appends to a partial file.
+        with open(tmp_path, "wb") as f:
+            tts.write_to_fp(f)
+
+    try:
+        with span("google_tts") as s:
+            get_rate_limiter("google_tts").call(synthesize)
+            if s.recording:
+                s.set("bytes", os.path.getsize(tmp_path))
+        os.replace(tmp_path, save_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
     return save_path
 
 
-def google_stt(audio_file_path: str, recognizer: str = "google") -> str:
+def google_stt(
+    audio_file_path: str,
+    recognizer: Union[str, Callable] = "google",
+    chunked: bool = False,
+    max_workers: int = 4,
+    **vad_options,
+) -> str:
     """
     Converts speech in an audio file to text using various Speech Recognition APIs.
 
+    By default the recording is sent as one request, which stops at the first long pause and
+    stalls on multi-minute answers. With `chunked=True` it is split at pauses into chunks of at
+    most 30 seconds, which are transcribed concurrently and joined in order; use
+    `iter_transcription` from `openinterview.modules.voice.transcribe` for partial results.
+
     Args:
         audio_file_path (str): The file path of the audio file to be transcribed.
-        recognizer (str): The speech recognition service to use. Options include 'google', 'bing', 'google_cloud',
-                          'houndify', 'ibm', 'sphinx', 'wit'. Default is 'google'.
+        recognizer (Union[str, Callable]): The speech recognition service to use. Options include 'google', 'bing', 'google_cloud',
+                          'houndify', 'ibm', 'sphinx', 'wit'. Default is 'google'. With `chunked`, 'mock' or a callable
+                          taking an `AudioChunk` and returning its text is also accepted.
+        chunked (bool): Transcribe long recordings in concurrent chunks split at pauses. Default is False.
+        max_workers (int): The maximum number of chunks transcribed concurrently with `chunked`. Default is 4.
+        **vad_options: Options of `split_on_silence` with `chunked`, e.g. `max_chunk` or `min_silence`.
 
     Returns:
         str: The text transcription of the audio file. Returns an error message if conversion fails or file format is incompatible.
@@ -49,6 +144,11 @@ def google_stt(audio_file_path: str, recognizer: str = "google") -> str:
         >>> print(text)
         'Hello, world!'
     """
+    if chunked:
+        return _chunked_stt(audio_file_path, recognizer, max_workers, **vad_options)
+
+    import speech_recognition as sr
+
     r = sr.Recognizer()
     try:
         with sr.AudioFile(audio_file_path) as source:
@@ -70,12 +170,45 @@ def google_stt(audio_file_path: str, recognizer: str = "google") -> str:
         return f"Failed to convert speech to text: {e}."
 
 
-def save_google_tts(qa_dict: Dict[str, str], save_dir: str) -> None:
+def _chunked_stt(
+    audio_file_path: str,
+    recognizer: Union[str, Callable],
+    max_workers: int,
+    **vad_options,
+) -> str:
+    from openinterview.modules.voice.transcribe import (
+        iter_transcription,
+        stitch_transcript,
+    )
+
+    try:
+        segments = list(
+            iter_transcription(
+                audio_file_path, recognizer, max_workers=max_workers, **vad_options
+            )
+        )
+    except (EOFError, ValueError) as e:
+        return f"Error processing audio file: {e}. Ensure file is a compatible format (WAV, AIFF, FLAC)."
+    errors = [segment.error for segment in segments if segment.error]
+    if segments and len(errors) == len(segments):
+        return f"Failed to convert speech to text: {errors[0]}."
+    return stitch_transcript(segments)
+
+
+@instrument("save_google_tts")
+def save_google_tts(
+    qa_dict: Dict[str, str],
+    save_dir: str,
+    lang: str = "en",
+    max_workers: int = 4,
+    archive: Optional["AudioArchive"] = None,
+) -> None:
     """
     Generates and saves spoken versions of questions and answers from a dictionary
     using Google's Text-to-Speech API. Each question and answer pair is saved in
     a directory named after the hex code in the dictionary key, with separate MP3 files
-    for the question and the answer.
+    for the question and the answer, or appended to an AudioArchive under the same
+    relative paths, e.g. '1a2b3c4d/question.mp3'.
 
     Parameters:
     - qa_dict (Dict[str, str]): A dictionary where keys are prefixed with 'Q_' or 'A_'
@@ -83,19 +216,39 @@ def save_google_tts(qa_dict: Dict[str, str], save_dir: str) -> None:
       for each key is the text of the question or answer.
     - save_dir (str): The base directory where the MP3 files will be saved. Directories
       named after the hex codes in the keys will be created here.
+    - lang (str): The gTTS language code of the texts (default is 'en'). See `get_tts_lang`.
+    - max_workers (int): The maximum number of clips synthesized concurrently (default is 4).
+    - archive (AudioArchive, optional): An archive opened for appending. If given, clips are
+      appended to it in key order instead of being written as files under `save_dir`.
 
     Note:
-    This function requires the google_tts function to be defined, which takes a text
-    string, a directory to save the MP3 file, and a language code, then generates and
-    saves the spoken version of the text as an MP3 file in the specified directory.
+    Each clip is written directly to its own target path with an atomic rename, so the
+    clips can be synthesized concurrently without sharing a temporary file. gTTS opens
+    its own connection per clip and has no public way to share one, so the concurrency
+    comes from the worker pool only.
 
     No return value. Files are saved to disk.
     """
+    jobs = []
     for key, text in qa_dict.items():
         prefix = "Q" if key.startswith("Q") else "A"
         hex_code = key.split("_")[-1]
-        hex_save_dir = os.path.join(save_dir, hex_code)
         file_name = "question.mp3" if prefix == "Q" else "answer.mp3"
-        full_save_path = os.path.join(hex_save_dir, file_name)
-        google_tts(text, hex_save_dir, "en")
-        os.rename(os.path.join(hex_save_dir, "tts.mp3"), full_save_path)
+        jobs.append((text, os.path.join(save_dir, hex_code), file_name))
+
+    if archive is not None:
+        for i, data in iter_ordered(
+            lambda i: google_tts_bytes(jobs[i][0], lang=lang),
+            len(jobs),
+            max_workers,
+        ):
+            hex_code = os.path.basename(jobs[i][1])
+            archive.add(f"{hex_code}/{jobs[i][2]}", data)
+        archive.flush()
+        return
+    for _ in iter_ordered(
+        lambda i: google_tts(jobs[i][0], jobs[i][1], lang=lang, file_name=jobs[i][2]),
+        len(jobs),
+        max_workers,
+    ):
+        pass
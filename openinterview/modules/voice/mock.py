@@ -0,0 +1,91 @@
+import os
+import random
+import threading
+from typing import IO, Iterator, Optional, Union
+from openinterview.modules.voice.openai import SpeechClient
+from openinterview.utils.rate_limit import Clock
+
+# A silent MPEG-1 Layer III frame header (128 kbps, 44.1 kHz, mono); mock audio repeats it.
+_MP3_FRAME = b"\xff\xfb\x90\xc4" + bytes(413)
+
+
+class MockSpeechClient(SpeechClient):
+    """
+    An offline stand-in for SpeechClient for tests and benchmarks.
+
+    Synthesizes `bytes_per_char` bytes of silent MP3 frames per character of text after
+    `latency` seconds, plus or minus a reproducible `jitter`, without network access. Pass it
+    to InterviewManager or BatchRunner as `speech_client` to run the voice stage offline.
+
+    Example:
+    >>> client = MockSpeechClient(bytes_per_char=10)
+    >>> len(client.synthesize("Tell me about yourself."))
+    230
+
+    Attributes:
+        latency (float): The seconds every clip takes on average.
+        jitter (float): The maximum seconds a clip is faster or slower than `latency`.
+        bytes_per_char (int): The audio size per character of text.
+        clock (Clock): The clock used for latency; use FakeClock in tests.
+        requests (int): The number of clips synthesized.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bytes_per_char: int = 200,
+        response_format: str = "mp3",
+        seed: int = 1,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.model = "mock"
+        self.voice = "mock"
+        self.response_format = response_format
+        self.latency = latency
+        self.jitter = jitter
+        self.bytes_per_char = bytes_per_char
+        self.chunk_size = 16384
+        self.clock = clock or Clock()
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def iter_speech(self, text: str, **options) -> Iterator[bytes]:
+        """
+        Yields the mock audio of `text` in chunks after the simulated latency.
+        """
+        with self._lock:
+            self.requests += 1
+            offset = (
+                self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0
+            )
+        self.clock.sleep(max(0.0, self.latency + offset))
+        size = len(text) * self.bytes_per_char
+        audio = _MP3_FRAME * (size // len(_MP3_FRAME) + 1)
+        for start in range(0, size, self.chunk_size):
+            yield audio[start : min(start + self.chunk_size, size)]
+
+    def save_speech(
+        self, text: str, output: Union[str, IO[bytes]], **options
+    ) -> Optional[str]:
+        """
+        Writes the mock audio of `text` to a file path or a writable binary sink.
+        """
+        if not isinstance(output, (str, os.PathLike)):
+            for chunk in self.iter_speech(text, **options):
+                output.write(chunk)
+            return None
+        save_path = os.fspath(output)
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        with open(save_path, "wb") as f:
+            for chunk in self.iter_speech(text, **options):
+                f.write(chunk)
+        return save_path
+
+    def transcribe(self, audio: Union[str, IO[bytes]], **options) -> str:
+        """Returns an empty transcription."""
+        return ""
+
+    def close(self) -> None:
+        pass
@@ -1,6 +1,291 @@
-# To-Do: Need QA and error handling
-from pathlib import Path
-from openai import OpenAI
+import os
+import uuid
+import threading
+from typing import IO, TYPE_CHECKING, Dict, Iterator, Optional, Union
+from openinterview.utils.concurrency import iter_ordered
+from openinterview.utils.rate_limit import get_rate_limiter
+
+if TYPE_CHECKING:
+    from openinterview.modules.voice.archive import AudioArchive
+
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+
+class SpeechClient:
+    """
+    A reusable client for OpenAI's text-to-speech and speech-to-text endpoints.
+
+    All requests share one `requests.Session` with a connection pool of `pool_size` keep-alive
+    connections, so clips after the first skip connection and TLS setup. Speech is streamed in
+    `chunk_size` pieces straight to a file or any writable sink instead of being buffered in
+    memory. Requests go through the 'openai_audio' rate limiter, which retries throttled requests.
+
+    Example:
+    >>> with SpeechClient(voice="nova") as client:  # doctest: +SKIP
+    ...     client.save_speech("Tell me about yourself.", "output/question.mp3")
+    ...     client.save_qa_dict(qa_dict, "output/voice", max_workers=8)
+
+    Attributes:
+        api_key (str): The OpenAI API key.
+        api_base (str): The API base URL.
+        model (str): The text-to-speech model.
+        voice (str): The voice, e.g. 'alloy', 'echo', 'fable', 'onyx', 'nova' or 'shimmer'.
+        response_format (str): The audio format, e.g. 'mp3', 'opus', 'aac' or 'flac'.
+        timeout (float): The request timeout in seconds.
+        chunk_size (int): The bytes read from the response at a time while streaming.
+        session (requests.Session): The pooled HTTP session.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "tts-1",
+        voice: str = "alloy",
+        response_format: str = "mp3",
+        api_base: str = OPENAI_API_BASE,
+        pool_size: int = 8,
+        timeout: float = 120.0,
+        chunk_size: int = 16384,
+    ) -> None:
+        api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "API key is required. Visit https://platform.openai.com/api-keys"
+            )
+        import requests
+
+        self.api_key = api_key
+        self.api_base = api_base.rstrip("/")
+        self.model = model
+        self.voice = voice
+        self.response_format = response_format
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=max(pool_size, 1)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def iter_speech(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        speed: Optional[float] = None,
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes speech and yields the audio in chunks as it arrives.
+
+        The request is retried until the response starts; errors while streaming are raised.
+
+        Args:
+            text (str): The text to be converted to speech.
+            voice (str, optional): Overrides the client's voice.
+            model (str, optional): Overrides the client's model.
+            speed (float, optional): The speaking speed from 0.25 to 4.0. Defaults to the API default.
+
+        Yields:
+            bytes: The audio chunks.
+        """
+        response = get_rate_limiter("openai_audio").call(
+            lambda: self._post_speech(text, voice, model, speed)
+        )
+        with response:
+            yield from response.iter_content(chunk_size=self.chunk_size)
+
+    def synthesize(self, text: str, **options) -> bytes:
+        """
+        Returns the speech audio of `text`. Takes the options of `iter_speech`.
+        """
+        return b"".join(self.iter_speech(text, **options))
+
+    def save_speech(
+        self, text: str, output: Union[str, IO[bytes]], **options
+    ) -> Optional[str]:
+        """
+        Streams the speech audio of `text` into a file path or a writable binary sink.
+
+        A path is written through a unique temporary file that is atomically renamed, so a
+        failed or retried request never leaves a partial file and concurrent calls never
+        collide. A sink, e.g. a socket file or BytesIO, receives the chunks as they arrive.
+        Takes the options of `iter_speech`.
+
+        Args:
+            text (str): The text to be converted to speech.
+            output (Union[str, IO[bytes]]): The file path, or a file-like object with `write`.
+
+        Returns:
+            Optional[str]: The path, if `output` is a path.
+        """
+        if not isinstance(output, (str, os.PathLike)):
+            for chunk in self.iter_speech(text, **options):
+                output.write(chunk)
+            return None
+
+        save_path = os.fspath(output)
+        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+        tmp_path = f"{save_path}.{uuid.uuid4().hex}.part"
+
+        def stream():
+            # Reopened on every attempt so a retry never appends to a partial file.
+            response = self._post_speech(text, **options)
+            with response, open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+
+        try:
+            get_rate_limiter("openai_audio").call(stream)
+            os.replace(tmp_path, save_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return save_path
+
+    def save_qa_dict(
+        self,
+        qa_dict: Dict[str, str],
+        save_dir: str,
+        max_workers: int = 4,
+        archive: Optional["AudioArchive"] = None,
+        **options,
+    ) -> None:
+        """
+        Synthesizes the questions and answers of a QA dictionary concurrently.
+
+        Uses the layout of `save_google_tts`, so OpenAI voices are a drop-in replacement: each pair
+        is saved in a directory named after the hex code of its key, as 'question.mp3' and
+        'answer.mp3', or appended to an AudioArchive under the same relative paths. Takes the
+        options of `iter_speech`.
+
+        Args:
+            qa_dict (Dict[str, str]): Texts keyed by 'Q_<hex>' and 'A_<hex>'.
+            save_dir (str): The base directory of the audio files.
+            max_workers (int, optional): The maximum number of clips synthesized concurrently. Defaults to 4.
+            archive (AudioArchive, optional): An archive opened for appending. If given, clips are
+                appended to it in key order instead of being written as files under `save_dir`.
+        """
+        jobs = []
+        for key, text in qa_dict.items():
+            hex_code = key.split("_")[-1]
+            file_name = "question" if key.startswith("Q") else "answer"
+            jobs.append((text, f"{hex_code}/{file_name}.{self.response_format}"))
+
+        if archive is not None:
+            for i, data in iter_ordered(
+                lambda i: self.synthesize(jobs[i][0], **options), len(jobs), max_workers
+            ):
+                archive.add(jobs[i][1], data)
+            archive.flush()
+            return
+        for _ in iter_ordered(
+            lambda i: self.save_speech(
+                jobs[i][0], os.path.join(save_dir, *jobs[i][1].split("/")), **options
+            ),
+            len(jobs),
+            max_workers,
+        ):
+            pass
+
+    def transcribe(
+        self,
+        audio: Union[str, IO[bytes]],
+        model: str = "whisper-1",
+        response_format: str = "text",
+        language: Optional[str] = None,
+    ) -> str:
+        """
+        Converts speech to text with OpenAI's transcription endpoint.
+
+        Args:
+            audio (Union[str, IO[bytes]]): The path of the audio file, or an open binary file.
+            model (str, optional): The speech-to-text model. Defaults to "whisper-1".
+            response_format (str, optional): 'text', 'json', 'srt', 'vtt' or 'verbose_json'. Defaults to "text".
+            language (str, optional): The ISO-639-1 language of the audio, which improves accuracy and latency.
+
+        Returns:
+            str: The transcription; for 'json' and 'verbose_json', its text.
+        """
+        data = {"model": model, "response_format": response_format}
+        if language:
+            data["language"] = language
+
+        def post():
+            if isinstance(audio, (str, os.PathLike)):
+                with open(audio, "rb") as f:
+                    return self._post_transcription(f, data)
+            audio.seek(0)
+            return self._post_transcription(audio, data)
+
+        response = get_rate_limiter("openai_audio").call(post)
+        if response_format in ("json", "verbose_json"):
+            return response.json()["text"]
+        return response.text
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "SpeechClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _post_speech(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        speed: Optional[float] = None,
+    ):
+        body = {
+            "model": model or self.model,
+            "voice": voice or self.voice,
+            "input": text,
+            "response_format": self.response_format,
+        }
+        if speed is not None:
+            body["speed"] = speed
+        response = self.session.post(
+            f"{self.api_base}/audio/speech",
+            json=body,
+            stream=True,
+            timeout=self.timeout,
+        )
+        if not response.ok:
+            response.close()
+        response.raise_for_status()
+        return response
+
+    def _post_transcription(self, audio_file: IO[bytes], data: Dict[str, str]):
+        name = os.path.basename(getattr(audio_file, "name", "") or "audio.mp3")
+        response = self.session.post(
+            f"{self.api_base}/audio/transcriptions",
+            data=data,
+            files={"file": (name, audio_file)},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response
+
+
+_default_client: Optional[SpeechClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_speech_client() -> SpeechClient:
+    """
+    Returns the process-wide SpeechClient used by `openai_tts` and `openai_stt`, created on
+    first use with the key in $OPENAI_API_KEY.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = SpeechClient()
+        return _default_client
 
 
 def openai_tts(
@@ -13,40 +298,42 @@ def openai_tts(
     """
     Converts text to speech using OpenAI's API. Depending on the parameters, it can save the output to a file or return the audio content.
 
+    Calls share the pooled connections of `get_speech_client()`; use a SpeechClient directly for other settings.
+
     Parameters:
     - text_input (str): The text to be converted to speech.
-    - output_file_name (str, optional): The name of the output file where the speech audio will be saved if stream_to_file is True. Defaults to None.
+    - output_file_name (str, optional): The path of the output file where the speech audio will be saved if stream_to_file is True. Defaults to None.
     - model (str, optional): The model to use for text-to-speech conversion. Defaults to "tts-1".
     - voice (str, optional): The voice model to use. Defaults to "alloy".
-    - stream_to_file (bool, optional): Whether to stream the output directly to a file. If False, returns the audio content. Defaults to True.
+    - stream_to_file (bool, optional): Whether to stream the output directly to a file. If False, returns the audio content. Defaults to False.
+
+    Returns:
+    The saved file path if stream_to_file is True, otherwise the audio content as bytes.
 
     Example:
     ```
     # Example usage to save output to a file
     text_input = "Hello world! This is a streaming test."
     output_file_name = "output.mp3"
-    openai_tts(text_input, output_file_name=output_file_name, stream_to_file=False)
+    openai_tts(text_input, output_file_name=output_file_name, stream_to_file=True)
 
     # Example usage to get audio content without saving to a file
     audio_content = openai_tts(text_input, stream_to_file=False)
     ```
     """
-    client = OpenAI()
-    response = client.audio.speech.create(model=model, voice=voice, input=text_input)
-
+    client = get_speech_client()
     if stream_to_file and output_file_name:
-        # Determine the full path for the output file
-        speech_file_path = Path(__file__).parent / output_file_name
-        response.stream_to_file(speech_file_path)
+        speech_file_path = client.save_speech(
+            text_input, output_file_name, voice=voice, model=model
+        )
         print(f"Audio file saved to: {speech_file_path}")
-    else:
-        # Return the audio content directly
-        return response.content
+        return speech_file_path
+    return client.synthesize(text_input, voice=voice, model=model)
 
 
 def openai_stt(audio_file_path, model="whisper-1", response_format="text"):
     """
-    Converts speech to text using OpenAI's API. This function opens an audio file, sends it for transcription, and either prints or returns the transcribed text.
+    Converts speech to text using OpenAI's API. This function opens an audio file, sends it for transcription, and returns the transcribed text.
 
     Parameters:
     - audio_file_path (str): The path to the audio file to be transcribed.
@@ -54,7 +341,7 @@ def openai_stt(audio_file_path, model="whisper-1", response_format="text"):
     - response_format (str, optional): The format of the response. Defaults to "text".
 
     Returns:
-    The transcribed text as a string if response_format is "text".
+    The transcribed text as a string.
 
     Example:
     ```
@@ -65,13 +352,10 @@ def openai_stt(audio_file_path, model="whisper-1", response_format="text"):
 
     # Example usage with a different model and response format
     audio_file_path = "/path/to/file/speech.mp3"
-    transcribed_text = openai_stt(audio_file_path, model="whisper-1", response_format="text")
+    transcribed_text = openai_stt(audio_file_path, model="whisper-1", response_format="json")
     print(transcribed_text)
     ```
     """
-    client = OpenAI()
-    with open(audio_file_path, "rb") as audio_file:
-        transcription = client.audio.transcriptions.create(
-            model=model, file=audio_file, response_format=response_format
-        )
-    return transcription.text
+    return get_speech_client().transcribe(
+        audio_file_path, model=model, response_format=response_format
+    )
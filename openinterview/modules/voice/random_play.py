@@ -1,73 +1,192 @@
+import io
 import os
-import time
+import queue
 import random
-import pygame
 import threading
-from typing import List
-from IPython.display import display, Audio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# Clip lists by directory, validated by the directory's modification time, so starting
+# another session over the same output does not walk it again.
+_CLIP_INDEX: Dict[str, Tuple[int, List[str]]] = {}
+_CLIP_INDEX_LOCK = threading.Lock()
+
+
+def find_question_clips(directory: str) -> List[str]:
+    """
+    Returns the paths of the MP3 files under `directory` with 'question' in their names.
+
+    The list is cached per directory until the directory's modification time changes, which
+    happens when a question folder is added or removed. Files that disappear later are
+    skipped at playback.
+
+    Parameters:
+    - directory (str): The directory to search.
+
+    Returns:
+    - List[str]: The sorted paths of the question clips.
+    """
+    key = os.path.abspath(directory)
+    mtime = os.stat(directory).st_mtime_ns
+    with _CLIP_INDEX_LOCK:
+        cached = _CLIP_INDEX.get(key)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+    clips = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".mp3") and "question" in file:
+                clips.append(os.path.join(root, file))
+    with _CLIP_INDEX_LOCK:
+        _CLIP_INDEX[key] = (mtime, clips)
+    return list(clips)
+
+
+class PygameBackend:
+    """
+    Plays clips with pygame's mixer.
+
+    Clips are decoded into a `pygame.mixer.Sound` when loaded, so starting one is immediate.
+    If the installed SDL_mixer cannot decode MP3 into a Sound, the bytes are streamed through
+    `pygame.mixer.music` instead.
+    """
+
+    def __init__(self) -> None:
+        import pygame
+
+        self.pygame = pygame
+        pygame.mixer.init()
+
+    def load(self, data: bytes) -> Any:
+        """Decodes MP3 bytes into a playable clip."""
+        try:
+            return self.pygame.mixer.Sound(file=io.BytesIO(data))
+        except self.pygame.error:
+            return data
+
+    def play(self, clip: Any) -> float:
+        """Starts a loaded clip and returns its duration in seconds."""
+        if isinstance(clip, bytes):
+            from openinterview.modules.voice.archive import mp3_duration
+
+            self.pygame.mixer.music.load(io.BytesIO(clip), "mp3")
+            self.pygame.mixer.music.play()
+            return mp3_duration(clip)
+        clip.play()
+        return clip.get_length()
+
+    def stop(self) -> None:
+        """Stops playback."""
+        self.pygame.mixer.stop()
+        self.pygame.mixer.music.stop()
 
 
 class RandomPlayer:
     """
     A class to play MP3 files in a given directory randomly. Allows user interaction to skip to the next song or quit the playback.
 
+    Playback is event-driven: a single input thread queues commands, and the player waits on
+    that queue until a command arrives or the interval ends, instead of polling the mixer.
+    While a clip plays, the next one is read and decoded in the background, so there is no
+    gap between clips.
+
     Attributes:
-        directory (str): The directory path where MP3 files are located.
-        next_song (bool): A flag to control the flow of songs, whether to skip to the next song or not.
+        directory (str): The directory path where MP3 files are located, or the path of a packed audio archive (.oiva).
+        interval (Optional[float]): The seconds after which the next clip starts, or None to wait for 'n'.
+        page_size (int): The number of clips shown per page by the notebook fallback.
+        next_song (bool): Whether the last clip was skipped with 'n'.
     """
 
-    def __init__(self, directory: str, interval: int) -> None:
+    def __init__(
+        self,
+        directory: str,
+        interval: Optional[float] = 120,
+        backend: Optional[Any] = None,
+        page_size: int = 10,
+    ) -> None:
         """
-        Initializes the MP3Player with the directory containing MP3 files.
+        Initializes the player with the directory containing MP3 files.
 
         Parameters:
-            directory (str): The directory path where MP3 files are located.
+            directory (str): The directory path where MP3 files are located, or the path of an audio archive.
+            interval (float, optional): The seconds after which the next clip starts; a clip always plays to its end. Defaults to 120.
+            backend (optional): The audio backend, with `load(data)`, `play(clip) -> duration` and `stop()`. Defaults to pygame.
+            page_size (int, optional): The number of clips shown per page by the notebook fallback. Defaults to 10.
         """
         self.directory = directory
-        self.next_song = False
         self.interval = interval
-        try:
-            pygame.mixer.init()
-        except:
-            pass
+        self.page_size = page_size
+        self.next_song = False
+        self.archive = None
+        if directory.endswith(".oiva"):
+            from openinterview.modules.voice.archive import AudioArchive
+
+            self.archive = AudioArchive(directory)
+        self._backend = backend
+        self._commands: "queue.Queue[str]" = queue.Queue()
+        self._input_thread: Optional[threading.Thread] = None
+        self._playlist: List[str] = []
 
     def find_mp3_files(self) -> List[str]:
         """
         Finds all MP3 files in the directory that contain the word 'question' in their filenames.
 
         Returns:
-            List[str]: A list of paths to the MP3 files.
+            List[str]: A list of paths to the MP3 files, or of keys in the archive.
+        """
+        if self.archive is not None:
+            return [key for key in self.archive.keys() if "question" in key]
+        return find_question_clips(self.directory)
+
+    def read_clip(self, clip: str) -> bytes:
         """
-        mp3_files = []
-        for root, dirs, files in os.walk(self.directory):
-            for file in files:
-                if file.endswith(".mp3") and "question" in file:
-                    mp3_files.append(os.path.join(root, file))
-        return mp3_files
-
-    def play_mp3_file(self, file_path: str) -> None:
+        Returns the MP3 bytes of a clip.
+
+        Parameters:
+            clip (str): The path of the MP3 file, or its key in the archive.
+        """
+        if self.archive is not None:
+            return self.archive.read(clip)
+        with open(clip, "rb") as f:
+            return f.read()
+
+    def play_mp3_file(self, file_path: str) -> float:
         """
         Loads and plays a single MP3 file.
 
         Parameters:
-            file_path (str): The path to the MP3 file to be played.
+            file_path (str): The path to the MP3 file to be played, or its key in the archive.
+
+        Returns:
+            float: The duration of the clip in seconds.
         """
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
+        backend = self._get_backend()
+        return backend.play(backend.load(self.read_clip(file_path)))
+
+    def skip(self) -> None:
+        """Starts the next clip, like pressing 'n'."""
+        self._commands.put("n")
+
+    def stop(self) -> None:
+        """Ends playback, like pressing 'q'."""
+        self._commands.put("q")
 
     def input_listener(self) -> None:
         """
-        Listens for user input to either quit the playback ('q') or skip to the next song ('n').
+        Listens for user input and queues 'q' (quit) and 'n' (next) commands.
+
+        Runs on one daemon thread for the lifetime of the player.
         """
         while True:
-            user_input = input()
-            if user_input.strip().lower() == "q":
-                pygame.mixer.music.stop()
-                return
-            elif user_input.strip().lower() == "n":
-                pygame.mixer.music.stop()
-                self.next_song = True
+            try:
+                user_input = input()
+            except (EOFError, OSError):
+                # No interactive input; playback continues on the interval.
                 return
+            command = user_input.strip().lower()
+            if command in ("q", "n"):
+                self._commands.put(command)
 
     def play_random_mp3(self) -> None:
         """
@@ -76,29 +195,94 @@ class RandomPlayer:
         print(
             "Press 'q' to quit the process, 'n' to skip to the next MP3.\nIt plays 'question.mp3' files randomly from the folder. \n\nAlthough set to a 2-minute interval, pressing 'n' immediately plays the next question."
         )
-        mp3_files = self.find_mp3_files()
-        random.shuffle(mp3_files)
+        self._playlist = self.find_mp3_files()
+        random.shuffle(self._playlist)
         try:
-            for mp3_file in mp3_files:
-                self.next_song = False
-                print(f"Now playing: {mp3_file}")
-                self.play_mp3_file(mp3_file)
+            backend = self._get_backend()
+        except Exception:
+            print("Fail to autoplay. Try to play manually.")
+            self.display_clips()
+            return
+        self._start_input_listener()
+        self._clear_commands()
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            self._play_all(backend, prefetcher)
+        print("Finished playing.")
+
+    def display_clips(self, page: int = 0) -> None:
+        """
+        Shows one page of the shuffled clips as notebook audio players.
 
-                listener_thread = threading.Thread(target=self.input_listener)
-                listener_thread.start()
+        Only the clips of the page are read, so large sessions display immediately.
 
-                while pygame.mixer.music.get_busy() and not self.next_song:
-                    time.sleep(0.1)
+        Parameters:
+            page (int, optional): The zero-based page number. Defaults to 0.
+        """
+        from IPython.display import Audio, display
 
-                listener_thread.join()
+        if not self._playlist:
+            self._playlist = self.find_mp3_files()
+            random.shuffle(self._playlist)
+        pages = max(1, -(-len(self._playlist) // self.page_size))
+        start = page * self.page_size
+        for clip in self._playlist[start : start + self.page_size]:
+            print(f"File: {clip}")
+            display(Audio(data=self.read_clip(clip), autoplay=False))
+        if page + 1 < pages:
+            print(
+                f"Page {page + 1}/{pages}. Call display_clips({page + 1}) for the next page."
+            )
 
-                if self.next_song:
-                    continue
-                if not pygame.mixer.music.get_busy():
-                    break
-            print("Finished playing.")
-        except:
-            print("Fail to autoplay. Try to play manually.")
-            for mp3_file in mp3_files:
-                print(f"File: {mp3_file}")
-                display(Audio(mp3_file, autoplay=False))
+    def _play_all(self, backend: Any, prefetcher: ThreadPoolExecutor) -> None:
+        upcoming: Optional[Future] = None
+        if self._playlist:
+            upcoming = prefetcher.submit(self._load_clip, backend, self._playlist[0])
+        for index, clip in enumerate(self._playlist):
+            current = upcoming
+            if index + 1 < len(self._playlist):
+                upcoming = prefetcher.submit(
+                    self._load_clip, backend, self._playlist[index + 1]
+                )
+            try:
+                loaded = current.result()
+            except OSError as e:
+                print(f"Skipping {clip}: {e}")
+                continue
+            self.next_song = False
+            print(f"Now playing: {clip}")
+            duration = backend.play(loaded)
+            command = self._wait_for_command(duration)
+            backend.stop()
+            if command == "q":
+                return
+            self.next_song = command == "n"
+
+    def _load_clip(self, backend: Any, clip: str) -> Any:
+        return backend.load(self.read_clip(clip))
+
+    def _wait_for_command(self, duration: float) -> Optional[str]:
+        """Blocks until a command arrives or the clip's turn ends; returns None on timeout."""
+        timeout = None if self.interval is None else max(float(self.interval), duration)
+        try:
+            return self._commands.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _get_backend(self) -> Any:
+        if self._backend is None:
+            self._backend = PygameBackend()
+        return self._backend
+
+    def _start_input_listener(self) -> None:
+        if self._input_thread is None or not self._input_thread.is_alive():
+            self._input_thread = threading.Thread(
+                target=self.input_listener, daemon=True
+            )
+            self._input_thread.start()
+
+    def _clear_commands(self) -> None:
+        while True:
+            try:
+                self._commands.get_nowait()
+            except queue.Empty:
+                return
@@ -0,0 +1,353 @@
+import sys
+import math
+import array
+import threading
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from openinterview.utils.concurrency import iter_completed
+from openinterview.utils.rate_limit import Clock, get_rate_limiter
+
+# Audio is analysed and sent as 16-bit mono PCM.
+SAMPLE_WIDTH = 2
+
+# The RMS energy of 16-bit PCM below which audio is silent regardless of the recording,
+# about -60 dBFS.
+SILENCE_RMS = 30.0
+
+
+class AudioChunk(NamedTuple):
+    """A span of speech cut from a recording."""
+
+    index: int
+    start: float
+    end: float
+    frame_data: bytes
+    sample_rate: int
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class TranscriptSegment(NamedTuple):
+    """The transcription of one AudioChunk; `error` is set if the recognizer failed."""
+
+    index: int
+    start: float
+    end: float
+    text: str
+    error: Optional[str] = None
+
+
+Recognizer = Callable[[AudioChunk], str]
+
+
+def load_pcm(audio_file_path: str) -> Tuple[bytes, int]:
+    """
+    Reads a WAV, AIFF or FLAC file as 16-bit mono PCM.
+
+    Args:
+        audio_file_path (str): The file path of the recording.
+
+    Returns:
+        Tuple[bytes, int]: The PCM data and its sample rate.
+    """
+    import speech_recognition as sr
+
+    with sr.AudioFile(audio_file_path) as source:
+        audio = sr.Recognizer().record(source)
+    return audio.get_raw_data(convert_width=SAMPLE_WIDTH), audio.sample_rate
+
+
+def frame_energies(pcm: bytes, frame_size: int) -> List[float]:
+    """
+    Returns the RMS energy of each frame of 16-bit PCM.
+
+    Example:
+    >>> frame_energies(array.array("h", [3, -4, 0, 0]).tobytes(), 2)
+    [3.5355339059327378, 0.0]
+    """
+    samples = array.array("h")
+    samples.frombytes(pcm[: len(pcm) - len(pcm) % SAMPLE_WIDTH])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    energies = []
+    for start in range(0, len(samples), frame_size):
+        frame = samples[start : start + frame_size]
+        energies.append(math.sqrt(sum(x * x for x in frame) / len(frame)))
+    return energies
+
+
+def split_on_silence(
+    pcm: bytes,
+    sample_rate: int,
+    frame_ms: int = 30,
+    min_silence: float = 0.5,
+    min_chunk: float = 2.0,
+    max_chunk: float = 30.0,
+    padding: float = 0.2,
+    silence_threshold: Optional[float] = None,
+    energy_ratio: float = 2.5,
+) -> List[AudioChunk]:
+    """
+    Splits a recording into chunks of speech at pauses, using an energy-based voice activity detector.
+
+    A frame is silent if its RMS energy is below `silence_threshold`, which by default adapts to the
+    recording. If its loud frames (90th percentile) are at least `energy_ratio` times louder than its
+    quiet frames (10th percentile), the quiet frames are background noise and the threshold is
+    `energy_ratio` times that noise floor. Otherwise the recording is speech throughout, with pauses
+    in less than a tenth of it, and frames `energy_ratio` times quieter than the median are pauses.
+    Chunks are cut in the middle of pauses of at least `min_silence` seconds once they are
+    `min_chunk` seconds long; speech without such a pause is cut at its quietest frame so no chunk
+    exceeds `max_chunk`. Silence around each chunk is trimmed to `padding` seconds. Only chunks that
+    are silent in absolute terms, below SILENCE_RMS, are dropped; a chunk in which no frame crossed
+    the threshold is kept whole.
+
+    Args:
+        pcm (bytes): 16-bit mono PCM.
+        sample_rate (int): The sample rate of `pcm`.
+        frame_ms (int, optional): The analysis frame length in milliseconds. Defaults to 30.
+        min_silence (float, optional): The shortest pause in seconds to cut at. Defaults to 0.5.
+        min_chunk (float, optional): The shortest chunk in seconds to cut at a pause. Defaults to 2.
+        max_chunk (float, optional): The longest chunk in seconds. Defaults to 30.
+        padding (float, optional): The seconds of silence kept around speech. Defaults to 0.2.
+        silence_threshold (float, optional): The RMS energy below which a frame is silent. Defaults to adaptive.
+        energy_ratio (float, optional): The adaptive threshold as a multiple of the noise floor. Defaults to 2.5.
+
+    Returns:
+        List[AudioChunk]: The chunks in recording order.
+    """
+    frame_size = max(1, sample_rate * frame_ms // 1000)
+    energies = frame_energies(pcm, frame_size)
+    if not energies:
+        return []
+    if silence_threshold is None:
+        silence_threshold = _adaptive_threshold(energies, energy_ratio)
+    voiced = [energy >= silence_threshold for energy in energies]
+
+    frame_seconds = frame_size / sample_rate
+    min_silence_frames = max(1, round(min_silence / frame_seconds))
+    min_chunk_frames = max(1, round(min_chunk / frame_seconds))
+    max_chunk_frames = max(2, round(max_chunk / frame_seconds))
+
+    bounds = []
+    start = 0
+    silent_run = 0
+    for i, is_voiced in enumerate(voiced):
+        if not is_voiced:
+            silent_run += 1
+        else:
+            cut = i - silent_run // 2
+            if silent_run >= min_silence_frames and cut - start >= min_chunk_frames:
+                bounds.append((start, cut))
+                start = cut
+            silent_run = 0
+        if i + 1 - start >= max_chunk_frames:
+            search_from = start + max_chunk_frames // 2
+            cut = min(range(search_from, i + 1), key=energies.__getitem__) + 1
+            bounds.append((start, cut))
+            start = cut
+            silent_run = 0
+    if start < len(energies):
+        bounds.append((start, len(energies)))
+
+    padding_frames = round(padding / frame_seconds)
+    chunks = []
+    for first, last in bounds:
+        speech = [i for i in range(first, last) if voiced[i]]
+        if speech:
+            first = max(first, speech[0] - padding_frames)
+            last = min(last, speech[-1] + 1 + padding_frames)
+        elif max(energies[first:last]) < SILENCE_RMS:
+            continue
+        chunks.append(
+            AudioChunk(
+                index=len(chunks),
+                start=first * frame_seconds,
+                end=min(last * frame_size, len(pcm) // SAMPLE_WIDTH) / sample_rate,
+                frame_data=pcm[
+                    first * frame_size * SAMPLE_WIDTH : last * frame_size * SAMPLE_WIDTH
+                ],
+                sample_rate=sample_rate,
+            )
+        )
+    return chunks
+
+
+def _adaptive_threshold(energies: List[float], energy_ratio: float) -> float:
+    ordered = sorted(energies)
+    noise_floor = ordered[len(ordered) // 10]
+    loud = ordered[len(ordered) * 9 // 10]
+    if loud < SILENCE_RMS:
+        return SILENCE_RMS
+    if loud >= noise_floor * energy_ratio:
+        return max(noise_floor * energy_ratio, 1.0)
+    # No quiet tenth: the 10th percentile is speech, so measure pauses against the median.
+    return max(ordered[len(ordered) // 2] / energy_ratio, 1.0)
+
+
+def google_recognizer(language: str = "en-US") -> Recognizer:
+    """
+    Returns a recognizer that sends chunks to the Google Web Speech API.
+
+    Requests go through the 'google_stt' rate limiter, which retries throttled requests. A chunk
+    without recognizable speech is transcribed as an empty string.
+
+    Args:
+        language (str, optional): The language of the speech. Defaults to "en-US".
+    """
+    import speech_recognition as sr
+
+    def recognize(chunk: AudioChunk) -> str:
+        audio = sr.AudioData(chunk.frame_data, chunk.sample_rate, SAMPLE_WIDTH)
+        try:
+            return get_rate_limiter("google_stt").call(
+                lambda: sr.Recognizer().recognize_google(audio, language=language)
+            )
+        except sr.UnknownValueError:
+            return ""
+
+    return recognize
+
+
+class MockRecognizer:
+    """
+    An offline recognizer for tests and benchmarks.
+
+    Returns the given transcripts by chunk index, or a placeholder naming the chunk's time span,
+    after `latency` seconds.
+
+    Example:
+    >>> recognize = MockRecognizer(["hello", "world"])
+    >>> recognize(AudioChunk(1, 2.0, 3.5, b"", 16000))
+    'world'
+
+    Attributes:
+        transcripts (Optional[Union[Sequence[str], Dict[int, str]]]): The text of each chunk index.
+        latency (float): The seconds every chunk takes.
+        clock (Clock): The clock used for latency; use FakeClock in tests.
+        calls (int): The number of chunks recognized.
+    """
+
+    def __init__(
+        self,
+        transcripts: Optional[Union[Sequence[str], Dict[int, str]]] = None,
+        latency: float = 0.0,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.transcripts = transcripts
+        self.latency = latency
+        self.clock = clock or Clock()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, chunk: AudioChunk) -> str:
+        with self._lock:
+            self.calls += 1
+        self.clock.sleep(self.latency)
+        if self.transcripts is None:
+            return f"[{chunk.start:.1f}-{chunk.end:.1f}s]"
+        if isinstance(self.transcripts, dict):
+            return self.transcripts.get(chunk.index, "")
+        return (
+            self.transcripts[chunk.index] if chunk.index < len(self.transcripts) else ""
+        )
+
+
+def get_recognizer(recognizer: Union[str, Recognizer], **options) -> Recognizer:
+    """
+    Returns the recognizer of a service name, or `recognizer` itself if it is callable.
+
+    Raises:
+        ValueError: If the service is not supported.
+    """
+    if callable(recognizer):
+        return recognizer
+    if recognizer == "google":
+        return google_recognizer(**options)
+    if recognizer == "mock":
+        return MockRecognizer()
+    raise ValueError(f"Recognizer '{recognizer}' is not supported.")
+
+
+def iter_transcribe_chunks(
+    chunks: Sequence[AudioChunk], recognizer: Recognizer, max_workers: int = 4
+) -> Iterator[TranscriptSegment]:
+    """
+    Transcribes chunks concurrently and yields each segment as soon as it finishes.
+
+    A failing chunk yields a segment with `error` set instead of stopping the others.
+
+    Args:
+        chunks (Sequence[AudioChunk]): The chunks to transcribe.
+        recognizer (Callable[[AudioChunk], str]): The recognizer.
+        max_workers (int, optional): The maximum number of chunks transcribed concurrently. Defaults to 4.
+
+    Yields:
+        TranscriptSegment: The segments in completion order.
+    """
+
+    def transcribe(i: int) -> TranscriptSegment:
+        chunk = chunks[i]
+        try:
+            text = recognizer(chunk).strip()
+            return TranscriptSegment(chunk.index, chunk.start, chunk.end, text)
+        except Exception as e:
+            return TranscriptSegment(chunk.index, chunk.start, chunk.end, "", str(e))
+
+    for _, segment in iter_completed(transcribe, len(chunks), max_workers):
+        yield segment
+
+
+def iter_transcription(
+    audio_file_path: str,
+    recognizer: Union[str, Recognizer] = "google",
+    max_workers: int = 4,
+    language: str = "en-US",
+    **vad_options,
+) -> Iterator[TranscriptSegment]:
+    """
+    Transcribes a long recording in chunks split at pauses, yielding partial results as chunks finish.
+
+    Example:
+    >>> done = []
+    >>> for segment in iter_transcription("answer.wav", max_workers=8):  # doctest: +SKIP
+    ...     done.append(segment)
+    ...     print(stitch_transcript(done))  # the transcript so far, in order
+
+    Args:
+        audio_file_path (str): The file path of the recording (WAV, AIFF or FLAC).
+        recognizer (Union[str, Callable[[AudioChunk], str]], optional): 'google', 'mock' or a callable. Defaults to 'google'.
+        max_workers (int, optional): The maximum number of chunks transcribed concurrently. Defaults to 4.
+        language (str, optional): The language of the speech, used by the 'google' recognizer. Defaults to "en-US".
+        **vad_options: Options of `split_on_silence`, e.g. `max_chunk` or `min_silence`.
+
+    Yields:
+        TranscriptSegment: The segments in completion order.
+    """
+    recognize = get_recognizer(recognizer, language=language)
+    pcm, sample_rate = load_pcm(audio_file_path)
+    chunks = split_on_silence(pcm, sample_rate, **vad_options)
+    yield from iter_transcribe_chunks(chunks, recognize, max_workers)
+
+
+def stitch_transcript(segments: Iterable[TranscriptSegment]) -> str:
+    """
+    Joins the text of segments in recording order, skipping failed and empty segments.
+
+    Example:
+    >>> stitch_transcript([TranscriptSegment(1, 4.0, 6.0, "world"), TranscriptSegment(0, 0.0, 3.0, "Hello")])
+    'Hello world'
+    """
+    ordered = sorted(segments, key=lambda segment: segment.index)
+    return " ".join(segment.text for segment in ordered if segment.text)
@@ -1,3 +1,15 @@
-from openinterview.utils.doc_manager import DocumentCreator
-from openinterview.utils.file_manager import load_file_content
-from openinterview.utils.prompter import create_system_prompt, create_base_prompt
+from openinterview.utils.lazy import lazy_attributes
+
+_LAZY_ATTRIBUTES = {
+    "DocumentCreator": "openinterview.utils.doc_manager",
+    "load_file_content": "openinterview.utils.file_manager",
+    "create_system_prompt": "openinterview.utils.prompter",
+    "create_base_prompt": "openinterview.utils.prompter",
+    "build_system_prompt": "openinterview.utils.prompter",
+    "enable_telemetry": "openinterview.utils.telemetry",
+    "disable_telemetry": "openinterview.utils.telemetry",
+    "span": "openinterview.utils.telemetry",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
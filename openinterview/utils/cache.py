@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class CacheMissError(KeyError):
+    """Raised in replay mode when a response is not in the cache."""
+
+
+class ResponseCache:
+    """
+    A persistent, content-addressed cache of LLM responses.
+
+    Responses are keyed by a SHA-256 hash of the model, prompts, messages and request
+    options, and stored as one JSON file per entry under `cache_dir`. Entries older than
+    `max_age` seconds since creation are ignored and removed; when `max_entries` or
+    `max_bytes` is exceeded, the least recently used entries are removed first.
+
+    Modes:
+        - "readwrite": Return cached responses and store new ones (read-through and write-through).
+        - "read": Return cached responses but never store new ones.
+        - "write": Always call the API and store the response, refreshing the cache.
+        - "replay": Only return cached responses; a miss raises CacheMissError instead of calling the API.
+        - "off": Bypass the cache.
+
+    Attributes:
+        cache_dir (str): The directory where entries are stored.
+        mode (str): One of the modes above.
+        max_entries (Optional[int]): The maximum number of entries kept. None for no limit.
+        max_bytes (Optional[int]): The maximum total size of entries in bytes. None for no limit.
+        max_age (Optional[float]): The maximum age of an entry in seconds. None for no limit.
+        hits (int): The number of responses served from the cache.
+        misses (int): The number of lookups that were not in the cache.
+    """
+
+    MODES = ("readwrite", "read", "write", "replay", "off")
+
+    def __init__(
+        self,
+        cache_dir: str = os.path.join(".openinterview", "responses"),
+        mode: str = "readwrite",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Unsupported cache mode '{mode}'. Choose one of {', '.join(self.MODES)}."
+            )
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, Tuple[int, float]]"] = None
+
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            **request: Everything that affects the response, e.g. model, system prompt, messages and request options.
+
+        Returns:
+            str: The hex SHA-256 digest of the canonical JSON form of the request.
+        """
+        payload = json.dumps(
+            request,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str, compute: Callable[[], str]) -> str:
+        """
+        Returns the response of `key` according to the cache mode, calling `compute` on a miss.
+
+        Args:
+            key (str): The cache key from `make_key`.
+            compute (Callable[[], str]): Calls the API and returns the response text.
+
+        Returns:
+            str: The cached or newly computed response text.
+
+        Raises:
+            CacheMissError: In replay mode, if the response is not cached.
+        """
+        cached = self.read(key)
+        if cached is not None:
+            return cached
+        response_text = compute()
+        self.write(key, response_text)
+        return response_text
+
+    def read(self, key: str) -> Optional[str]:
+        """
+        Looks up `key` according to the cache mode.
+
+        Returns:
+            Optional[str]: The cached response, or None if the API should be called.
+
+        Raises:
+            CacheMissError: In replay mode, if the response is not cached.
+        """
+        if self.mode not in ("readwrite", "read", "replay"):
+            return None
+        cached = self.get(key)
+        if cached is None and self.mode == "replay":
+            raise CacheMissError(
+                f"No cached response for key {key} in {self.cache_dir} (replay mode)."
+            )
+        return cached
+
+    def write(self, key: str, response_text: str) -> None:
+        """
+        Stores a newly computed response if the cache mode allows it.
+        """
+        if self.mode in ("readwrite", "write"):
+            self.set(key, response_text)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached response of `key`, or None if it is missing or expired.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get("response"), str)
+            or not isinstance(entry.get("created"), (int, float))
+        ):
+            # A hand-edited or older-format entry is treated like a corrupt file.
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self.max_age is not None and time.time() - entry["created"] > self.max_age:
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        return entry["response"]
+
+    def set(self, key: str, response_text: str, **metadata: Any) -> None:
+        """
+        Stores a response and evicts old entries if a limit is exceeded.
+
+        Args:
+            key (str): The cache key from `make_key`.
+            response_text (str): The response text to store.
+            **metadata: Extra JSON-serializable information saved with the entry.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "key": key,
+            "created": time.time(),
+            "response": response_text,
+            "metadata": metadata,
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            index = self._load_index()
+            index[key] = (os.path.getsize(path), time.time())
+            index.move_to_end(key)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes expired entries and least recently used entries over the size limits.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._lock:
+            index = self._load_index()
+            victims = []
+            if self.max_age is not None:
+                deadline = time.time() - self.max_age
+                victims = [
+                    key for key, (_, created) in index.items() if created < deadline
+                ]
+            for key in victims:
+                index.pop(key)
+            total_bytes = sum(size for size, _ in index.values())
+            while index and (
+                (self.max_entries is not None and len(index) > self.max_entries)
+                or (self.max_bytes is not None and total_bytes > self.max_bytes)
+            ):
+                key, (size, _) = index.popitem(last=False)
+                total_bytes -= size
+                victims.append(key)
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+        return len(victims)
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        with self._lock:
+            keys = list(self._load_index())
+            self._index = OrderedDict()
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._load_index().pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _load_index(self) -> "OrderedDict[str, Tuple[int, float]]":
+        # Callers must hold self._lock.
+        if self._index is None:
+            entries: Dict[str, Tuple[int, float]] = {}
+            if os.path.isdir(self.cache_dir):
+                for root, _, files in os.walk(self.cache_dir):
+                    for file in files:
+                        if file.endswith(".json"):
+                            stat = os.stat(os.path.join(root, file))
+                            entries[file[: -len(".json")]] = (
+                                stat.st_size,
+                                stat.st_mtime,
+                            )
+            self._index = OrderedDict(
+                sorted(entries.items(), key=lambda item: item[1][1])
+            )
+        return self._index
@@ -0,0 +1,119 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def iter_ordered(
+    func: Callable[[int], T], count: int, max_workers: int = 1
+) -> Iterator[Tuple[int, T]]:
+    """
+    Calls `func(i)` for every index in `range(count)` and yields `(i, result)` in index order.
+
+    With `max_workers > 1` the calls run concurrently on a thread pool, which is useful for
+    network-bound work such as API requests. Results are still yielded in index order, so
+    callers merging them get the same output as a sequential run. Closing the iterator early
+    cancels calls that have not started yet.
+
+    Args:
+        func (Callable[[int], T]): The function to call with each index.
+        count (int): The number of calls to make.
+        max_workers (int, optional): The maximum number of concurrent calls. Defaults to 1 (sequential).
+
+    Yields:
+        Tuple[int, T]: The call index and its result.
+    """
+    if max_workers <= 1 or count <= 1:
+        for i in range(count):
+            yield i, func(i)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, count))
+    futures = [_submit(executor, func, i) for i in range(count)]
+    try:
+        for i, future in enumerate(futures):
+            yield i, future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def iter_completed(
+    func: Callable[[int], T], count: int, max_workers: int = 1
+) -> Iterator[Tuple[int, T]]:
+    """
+    Calls `func(i)` for every index in `range(count)` and yields `(i, result)` as calls finish.
+
+    Unlike `iter_ordered`, a slow call does not hold back the results after it, which suits
+    progress reporting and partial results; callers that need order sort by index. Closing
+    the iterator early cancels calls that have not started yet.
+
+    Args:
+        func (Callable[[int], T]): The function to call with each index.
+        count (int): The number of calls to make.
+        max_workers (int, optional): The maximum number of concurrent calls. Defaults to 1 (sequential).
+
+    Yields:
+        Tuple[int, T]: The call index and its result, in completion order.
+    """
+    if max_workers <= 1 or count <= 1:
+        yield from iter_ordered(func, count)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, count))
+    futures = {_submit(executor, func, i): i for i in range(count)}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _submit(executor: ThreadPoolExecutor, func: Callable[[int], T], i: int):
+    # Run each call in a copy of the caller's context, so e.g. telemetry spans opened on the
+    # worker thread nest under the caller's span.
+    return executor.submit(contextvars.copy_context().run, func, i)
+
+
+async def aiter_ordered(
+    func: Callable[[int], Awaitable[T]], count: int, max_concurrency: int = 1
+) -> AsyncIterator[Tuple[int, T]]:
+    """
+    Awaits `func(i)` for every index in `range(count)` and yields `(i, result)` in index order.
+
+    The asyncio counterpart of `iter_ordered`: at most `max_concurrency` calls run at once
+    on the event loop. Closing the iterator early, or cancelling the task consuming it,
+    cancels the calls still running or waiting.
+
+    Args:
+        func (Callable[[int], Awaitable[T]]): The coroutine function to call with each index.
+        count (int): The number of calls to make.
+        max_concurrency (int, optional): The maximum number of concurrent calls. Defaults to 1 (sequential).
+
+    Yields:
+        Tuple[int, T]: The call index and its result.
+    """
+    if max_concurrency <= 1 or count <= 1:
+        for i in range(count):
+            yield i, await func(i)
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(i: int) -> T:
+        async with semaphore:
+            return await func(i)
+
+    tasks = [asyncio.ensure_future(run(i)) for i in range(count)]
+    try:
+        for i, task in enumerate(tasks):
+            yield i, await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,254 @@
+import re
+import array
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Returns the character n-grams of a question after lowercasing and removing punctuation.
+
+    Character shingles tolerate small rewordings and work for any language, including
+    ones written without spaces.
+
+    Example:
+    >>> sorted(shingles("Why, SQL?"))
+    [' sq', 'hy ', 'sql', 'why', 'y s']
+    """
+    normalized = " ".join(_NON_WORD_PATTERN.sub(" ", text.lower()).split())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+@lru_cache(maxsize=16384)
+def _shingle_hashes(shingle: str, num_perm: int, seed: int) -> array.array:
+    # One independent 32-bit hash per permutation, computed in C and reused across questions.
+    digest = hashlib.shake_128(f"{seed}:{shingle}".encode("utf-8")).digest(4 * num_perm)
+    return array.array("I", digest)
+
+
+class QuestionDeduplicator:
+    """
+    Detects near-duplicate questions across iterations with MinHash and locality-sensitive hashing.
+
+    Each question is reduced to character shingles and a MinHash signature. Signatures are
+    split into bands; questions sharing a band bucket are candidates, and a candidate is a
+    duplicate when the Jaccard similarity of the shingles reaches `threshold`. Lookups
+    therefore stay fast as the question bank grows.
+
+    Questions built from the same template ("Tell me about a project where you ...") share
+    about half of their shingles, so thresholds much below the default also drop questions
+    that only share their phrasing.
+
+    Example:
+    >>> dedup = QuestionDeduplicator()
+    >>> dedup.add("How did you scale the data pipeline at your last job?")
+    True
+    >>> dedup.add("How did you scale the data pipeline in your last job?")
+    False
+    >>> dedup.add("What motivates you to apply for this position?")
+    True
+
+    Attributes:
+        threshold (float): The Jaccard similarity from which two questions are duplicates.
+        shingle_size (int): The length of the character shingles.
+        num_perm (int): The number of MinHash permutations.
+        bands (int): The number of LSH bands; more bands find more candidates at lower similarity.
+        questions (List[str]): The accepted questions.
+        stats (List[Dict[str, Any]]): Per-batch statistics recorded by `filter_qa_dict`.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.75,
+        shingle_size: int = 3,
+        num_perm: int = 96,
+        bands: int = 32,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.questions: List[str] = []
+        self.stats: List[Dict[str, Any]] = []
+        self._rows = num_perm // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [
+            {} for _ in range(bands)
+        ]
+        self._shingles: List[Set[str]] = []
+
+    def signature(self, question_shingles: Set[str]) -> List[int]:
+        """Returns the MinHash signature of a shingle set."""
+        if not question_shingles:
+            return [_MAX_HASH] * self.num_perm
+        hashes = [
+            _shingle_hashes(shingle, self.num_perm, self.seed)
+            for shingle in question_shingles
+        ]
+        return list(map(min, zip(*hashes)))
+
+    def find_duplicate(self, question: str) -> Optional[str]:
+        """
+        Returns the accepted question that `question` duplicates, or None if it is new.
+        """
+        return self._match(shingles(question, self.shingle_size))[0]
+
+    def add(self, question: str) -> bool:
+        """
+        Accepts `question` unless it duplicates an accepted question.
+
+        Returns:
+            bool: True if the question was new and has been accepted.
+        """
+        question_shingles = shingles(question, self.shingle_size)
+        duplicate, bucket_keys = self._match(question_shingles)
+        if duplicate is not None:
+            return False
+        index = len(self.questions)
+        self.questions.append(question)
+        self._shingles.append(question_shingles)
+        for band, key in enumerate(bucket_keys):
+            self._buckets[band].setdefault(key, []).append(index)
+        return True
+
+    def filter_qa_dict(
+        self, qa_dict: Dict[str, Any], iteration: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Removes the Q/A pairs whose question duplicates an earlier one, and records the novelty rate.
+
+        Entries that are not part of a `Q_`/`A_` pair with a question are kept unchanged.
+
+        Args:
+            qa_dict (Dict[str, Any]): The QA dictionary of one batch.
+            iteration (Optional[int]): The iteration index recorded in `stats`.
+
+        Returns:
+            Dict[str, Any]: The batch without duplicates, in the original order.
+        """
+        dropped: Set[str] = set()
+        total = 0
+        for key, question in qa_dict.items():
+            prefix, _, identifier = key.partition("_")
+            if prefix != "Q" or not identifier or not isinstance(question, str):
+                continue
+            total += 1
+            if not self.add(question):
+                dropped.add(identifier)
+        kept = {
+            key: value
+            for key, value in qa_dict.items()
+            if key.partition("_")[2] not in dropped
+        }
+        self.record_batch(iteration, total, len(dropped))
+        return kept
+
+    def record_batch(
+        self, iteration: Optional[int], questions: int, duplicates: int
+    ) -> Dict[str, Any]:
+        """
+        Records the novelty rate of a batch whose questions were checked with `add`.
+
+        Returns:
+            Dict[str, Any]: The recorded 'iteration', 'questions', 'duplicates' and 'novelty'.
+        """
+        stats = {
+            "iteration": iteration,
+            "questions": questions,
+            "duplicates": duplicates,
+            "novelty": (questions - duplicates) / questions if questions else 0.0,
+        }
+        self.stats.append(stats)
+        return stats
+
+    @property
+    def novelty(self) -> Optional[float]:
+        """The novelty rate of the last filtered batch, or None before any batch."""
+        return self.stats[-1]["novelty"] if self.stats else None
+
+    def _match(self, question_shingles: Set[str]):
+        signature = self.signature(question_shingles)
+        bucket_keys = [
+            tuple(signature[band * self._rows : (band + 1) * self._rows])
+            for band in range(self.bands)
+        ]
+        checked: Set[int] = set()
+        for band, key in enumerate(bucket_keys):
+            for index in self._buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if _jaccard(question_shingles, self._shingles[index]) >= self.threshold:
+                    return self.questions[index], bucket_keys
+        return None, bucket_keys
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def dedup_batches(
+    batches: Iterable[Tuple[int, Dict[str, Any]]],
+    deduplicator: QuestionDeduplicator,
+    min_novelty: Optional[float] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Drops near-duplicate questions from iteration batches and optionally stops early.
+
+    Batches must arrive in iteration order, as yielded by `iter_interview_batches`, so the
+    result does not depend on which request finished first. Once a batch's novelty rate
+    falls below `min_novelty`, that batch is still yielded but no further batches are
+    consumed; closing the source cancels iterations that have not started.
+
+    Args:
+        batches (Iterable[Tuple[int, Dict[str, Any]]]): `(iteration, qa_dict)` batches.
+        deduplicator (QuestionDeduplicator): The detector holding the questions seen so far.
+        min_novelty (Optional[float]): The novelty rate below which iterating stops. None never stops.
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: The iteration index and the batch without duplicates.
+    """
+    batches = iter(batches)
+    try:
+        for i, qa_dict in batches:
+            kept = deduplicator.filter_qa_dict(qa_dict, iteration=i)
+            yield i, kept
+            if report_novelty(deduplicator.stats[-1], min_novelty):
+                break
+    finally:
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close()
+
+
+def report_novelty(stats: Dict[str, Any], min_novelty: Optional[float] = None) -> bool:
+    """
+    Prints the novelty rate of a batch and returns True if iterating should stop.
+
+    Batches without any parsed question never stop iterating, so one malformed response
+    does not end generation.
+    """
+    new_questions = stats["questions"] - stats["duplicates"]
+    print(
+        f"Iteration {stats['iteration']}: novelty {stats['novelty']:.0%} "
+        f"({new_questions}/{stats['questions']} new questions)"
+    )
+    if min_novelty is None or not stats["questions"]:
+        return False
+    if stats["novelty"] < min_novelty:
+        print(
+            f"Stopping after iteration {stats['iteration']}: novelty fell below {min_novelty:.0%}."
+        )
+        return True
+    return False
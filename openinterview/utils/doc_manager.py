@@ -1,17 +1,27 @@
 import os
+from copy import deepcopy
 from datetime import datetime
 from collections import defaultdict
 from docx import Document
-from docx.oxml import parse_xml
-from docx.oxml.ns import nsdecls
 from docx.shared import Inches, Pt, RGBColor
 from docx.oxml.shared import OxmlElement, qn
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_LINE_SPACING
+from openinterview.utils.telemetry import instrument, span
 
 
 class DocumentCreator:
+    """
+    Renders Q&A pairs to a Word document.
+
+    The Q&A table is styled once per document and every pair is rendered by cloning that
+    template, so rendering time and file size grow only with the text. An instance can be
+    reused: every `begin_document` (or `create_qa_document`) starts a new document.
+    """
+
     def __init__(self):
         self.doc = Document()
+        self._qa_template = None
+        self._sect_pr = None
 
     def set_default_font(self, font_name, font_size):
         style = self.doc.styles["Normal"]
@@ -21,51 +31,76 @@ class DocumentCreator:
             font.size = font_size
 
     @staticmethod
-    def set_cell_background_black(cell):
-        shading_elm = parse_xml(r'<w:shd {} w:fill="000000"/>'.format(nsdecls("w")))
-        cell._tc.get_or_add_tcPr().append(shading_elm)
+    def _replace_property(parent, element):
+        # Keep a single property element of each kind instead of stacking duplicates.
+        for existing in parent.findall(element.tag):
+            parent.remove(existing)
+        parent.append(element)
 
     @staticmethod
-    def set_cell_margins(cell, top, bottom, left, right):
-        tc_pr = cell._tc.get_or_add_tcPr()
-        tc_mar = OxmlElement("w:tcMar")
+    def _set_table_property(table, element):
+        # Table properties must precede tblLook in schema order.
+        tbl_pr = table._tbl.tblPr
+        for existing in tbl_pr.findall(element.tag):
+            tbl_pr.remove(existing)
+        tbl_look = tbl_pr.find(qn("w:tblLook"))
+        if tbl_look is not None:
+            tbl_look.addprevious(element)
+        else:
+            tbl_pr.append(element)
+
+    @staticmethod
+    def _margins_element(tag, top, bottom, left, right):
+        margins = OxmlElement(tag)
         for name, value in [
             ("top", top),
-            ("bottom", bottom),
             ("left", left),
+            ("bottom", bottom),
             ("right", right),
         ]:
             mar = OxmlElement(f"w:{name}")
             mar.set(qn("w:w"), str(value * 20))
             mar.set(qn("w:type"), "dxa")
-            tc_mar.append(mar)
-        tc_pr.append(tc_mar)
+            margins.append(mar)
+        return margins
+
+    @staticmethod
+    def set_cell_background_black(cell):
+        shading_elm = OxmlElement("w:shd")
+        shading_elm.set(qn("w:val"), "clear")
+        shading_elm.set(qn("w:color"), "auto")
+        shading_elm.set(qn("w:fill"), "000000")
+        DocumentCreator._replace_property(cell._tc.get_or_add_tcPr(), shading_elm)
+
+    @staticmethod
+    def set_cell_margins(cell, top, bottom, left, right):
+        tc_mar = DocumentCreator._margins_element("w:tcMar", top, bottom, left, right)
+        DocumentCreator._replace_property(cell._tc.get_or_add_tcPr(), tc_mar)
 
     @staticmethod
     def set_table_borders_to_light_gray(table):
-        for row in table.rows:
-            for cell in row.cells:
-                for key in ["top", "left", "bottom", "right"]:
-                    tag = f"{key}OrTblGrid"
-                    border = OxmlElement(f"w:tcBorders")
-                    border_sub = OxmlElement(f"w:{tag}")
-                    border_sub.set(qn("w:val"), "single")
-                    border_sub.set(qn("w:sz"), "7")
-                    border_sub.set(qn("w:color"), "D3D3D3")
-                    border.append(border_sub)
-                    cell._tc.get_or_add_tcPr().append(border)
+        borders = OxmlElement("w:tblBorders")
+        for key in ["top", "left", "bottom", "right", "insideH", "insideV"]:
+            border = OxmlElement(f"w:{key}")
+            border.set(qn("w:val"), "single")
+            border.set(qn("w:sz"), "7")
+            border.set(qn("w:space"), "0")
+            border.set(qn("w:color"), "D3D3D3")
+            borders.append(border)
+        DocumentCreator._set_table_property(table, borders)
+
+    @staticmethod
+    def set_table_padding(table, padding_pt=2):
+        cell_mar = DocumentCreator._margins_element(
+            "w:tblCellMar", padding_pt, padding_pt, padding_pt, padding_pt
+        )
+        DocumentCreator._set_table_property(table, cell_mar)
 
     @staticmethod
     def set_cell_padding(cell, padding_pt=2):
-        padding_twips = padding_pt * 20
-        tc_pr = cell._tc.get_or_add_tcPr()
-        for side in ["top", "left", "bottom", "right"]:
-            tc_mar = OxmlElement(f"w:tcMar")
-            side_mar = OxmlElement(f"w:{side}")
-            side_mar.set(qn("w:w"), str(padding_twips))
-            side_mar.set(qn("w:type"), "dxa")
-            tc_mar.append(side_mar)
-            tc_pr.append(tc_mar)
+        DocumentCreator.set_cell_margins(
+            cell, padding_pt, padding_pt, padding_pt, padding_pt
+        )
 
     @staticmethod
     def set_paragraph_spacing(
@@ -79,7 +114,17 @@ class DocumentCreator:
         if space_after is not None:
             paragraph.paragraph_format.space_after = Pt(space_after)
 
+    @instrument("create_qa_document")
     def create_qa_document(self, qa_dict, font_name, font_size, save_dir):
+        self.begin_document(font_name, font_size)
+        # Every Q&A pair is rendered by cloning the prebuilt table template
+        self.add_qa_pairs(qa_dict)
+        return self.save_document(save_dir)
+
+    def begin_document(self, font_name, font_size):
+        self.doc = Document()
+        self._qa_template = None
+        self._sect_pr = None
         self.set_default_font(font_name, font_size)
 
         sections = self.doc.sections
@@ -105,53 +150,88 @@ class DocumentCreator:
         author_cmd.runs[0].font.size = Pt(8)
         self.doc.add_paragraph()
 
-        # Organize Q&A pairs by the identifier after the first underscore
+    def add_qa_pairs(self, qa_dict):
+        """Adds a table for every complete or partial Q&A pair of a dict, e.g. one generated batch."""
         qa_groups = defaultdict(lambda: {"Q": None, "A": None})
         for key, value in qa_dict.items():
-            try:
-                prefix, identifier = key.split("_", 1)
+            prefix, _, identifier = key.partition("_")
+            if identifier and prefix in ("Q", "A"):
                 qa_groups[identifier][prefix] = value
-            except:
-                pass
-        # Iterate through the grouped Q&A pairs to create tables in the document
-        for identifier, qa_pair in qa_groups.items():
-            table = self.doc.add_table(rows=2, cols=1, style="Table Grid")
-            self.set_table_borders_to_light_gray(table)
-
-            # Question Cell
-            q_cell = table.cell(0, 0)
-            q_cell.text = "Q: " + (
-                qa_pair["Q"] if qa_pair["Q"] else "No question provided."
-            )
-            self.set_cell_background_black(q_cell)
-            self.set_cell_margins(q_cell, 3, 3, 3, 3)
-            self.set_cell_padding(q_cell, 4)
-            q_paragraph = q_cell.paragraphs[0]
-            q_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            self.set_paragraph_spacing(q_paragraph, line_spacing=1.5)
-            q_run = q_paragraph.runs[0]
-            q_run.font.color.rgb = RGBColor(255, 255, 255)
-            q_run.font.size = Pt(12)
-            q_run.font.bold = False
-
-            # Answer Cell
-            a_cell = table.cell(1, 0)
-            a_cell.text = "A: " + (
-                qa_pair["A"] if qa_pair["A"] else "No answer provided."
-            )
-            self.set_cell_margins(a_cell, 3, 3, 3, 3)
-            self.set_cell_padding(a_cell, 4)
-            a_paragraph = a_cell.paragraphs[0]
-            a_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            self.set_paragraph_spacing(a_paragraph, line_spacing=1.5)
-            a_run = a_paragraph.runs[0]
-            a_run.font.size = Pt(12)
-            a_run.font.bold = False
-
-            self.doc.add_paragraph()  # Add an empty paragraph for spacing between Q&A groups
+        for qa_pair in qa_groups.values():
+            self.add_qa_table(qa_pair["Q"], qa_pair["A"])
+
+    def add_qa_table(self, question, answer):
+        if self._qa_template is None:
+            self._qa_template = self._build_qa_template()
+            self._sect_pr = self.doc.element.body.sectPr
+        tbl = deepcopy(self._qa_template)
+        q_run, a_run = tbl.iter(qn("w:r"))
+        self._set_run_text(
+            q_run, "Q: " + (question if question else "No question provided.")
+        )
+        self._set_run_text(a_run, "A: " + (answer if answer else "No answer provided."))
+
+        # Insert before the section properties, looked up once per document; python-docx
+        # would rescan the whole body for every element, making long documents quadratic.
+        spacer = OxmlElement("w:p")  # An empty paragraph for spacing between Q&A groups
+        if self._sect_pr is not None:
+            self._sect_pr.addprevious(tbl)
+            self._sect_pr.addprevious(spacer)
+        else:
+            self.doc.element.body.append(tbl)
+            self.doc.element.body.append(spacer)
 
+    @staticmethod
+    def _set_run_text(run, text):
+        for child in run.findall(qn("w:t")) + run.findall(qn("w:br")):
+            run.remove(child)
+        for index, line in enumerate(text.split("\n")):
+            if index:
+                run.append(OxmlElement("w:br"))
+            t = OxmlElement("w:t")
+            t.set(qn("xml:space"), "preserve")
+            t.text = line
+            run.append(t)
+
+    def _build_qa_template(self):
+        """Builds the styled Q&A table once; `add_qa_table` clones it for every pair."""
+        table = self.doc.add_table(rows=2, cols=1, style="Table Grid")
+        self.set_table_borders_to_light_gray(table)
+        self.set_table_padding(table, 4)
+
+        # Question Cell
+        q_cell = table.cell(0, 0)
+        q_cell.text = "Q: "
+        self.set_cell_background_black(q_cell)
+        q_paragraph = q_cell.paragraphs[0]
+        q_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+        self.set_paragraph_spacing(q_paragraph, line_spacing=1.5)
+        q_run = q_paragraph.runs[0]
+        q_run.font.color.rgb = RGBColor(255, 255, 255)
+        q_run.font.size = Pt(12)
+        q_run.font.bold = False
+
+        # Answer Cell
+        a_cell = table.cell(1, 0)
+        a_cell.text = "A: "
+        a_paragraph = a_cell.paragraphs[0]
+        a_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+        self.set_paragraph_spacing(a_paragraph, line_spacing=1.5)
+        a_run = a_paragraph.runs[0]
+        a_run.font.size = Pt(12)
+        a_run.font.bold = False
+
+        tbl = table._tbl
+        tbl.getparent().remove(tbl)
+        return tbl
+
+    def save_document(self, save_dir):
         os.makedirs(save_dir, exist_ok=True)
         save_path = (
             f"{save_dir}/OpenInterview_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.docx"
         )
-        self.doc.save(save_path)
+        with span("save_document") as s:
+            self.doc.save(save_path)
+            if s.recording:
+                s.set("bytes", os.path.getsize(save_path))
+        return save_path
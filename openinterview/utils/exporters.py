@@ -0,0 +1,329 @@
+import os
+import abc
+import json
+import html
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Type, Union
+
+QAItems = Union[Dict[str, Any], Iterable[Dict[str, Any]]]
+
+
+def iter_qa_items(qa_items: QAItems) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Yields `(identifier, question, answer)` for every Q/A pair as soon as both halves are seen.
+
+    Accepts a QA dictionary or an iterable of dicts, such as the pairs yielded by
+    `iter_interview_content` or the batches of `iter_interview_batches`. Only entries whose
+    counterpart has not arrived yet are held in memory; they are yielded with None for the
+    missing half at the end.
+
+    Args:
+        qa_items (Union[Dict[str, Any], Iterable[Dict[str, Any]]]): The Q/A entries.
+
+    Yields:
+        Tuple[str, Any, Any]: The identifier, question and answer of a pair.
+
+    Example:
+    >>> list(iter_qa_items({"Q_1": "Why?", "A_1": "Because.", "Q_2": "How?"}))
+    [('1', 'Why?', 'Because.'), ('2', 'How?', None)]
+    """
+    if isinstance(qa_items, dict):
+        qa_items = [qa_items]
+    pending: Dict[str, Dict[str, Any]] = {}
+    for qa_dict in qa_items:
+        for key, value in qa_dict.items():
+            prefix, _, identifier = key.partition("_")
+            if not identifier or prefix not in ("Q", "A"):
+                continue
+            entries = pending.setdefault(identifier, {})
+            entries[prefix] = value
+            if "Q" in entries and "A" in entries:
+                del pending[identifier]
+                yield identifier, entries["Q"], entries["A"]
+    for identifier, entries in pending.items():
+        yield identifier, entries.get("Q"), entries.get("A")
+
+
+class QAExporter(abc.ABC):
+    """
+    Writes Q/A pairs to a file as they arrive.
+
+    Subclasses set `extension` and implement `write_pair`, and optionally `write_header` and
+    `write_footer`.
+    Every pair is flushed to disk when written, so a partially exported file is usable while
+    generation is still running and memory stays flat regardless of the number of pairs.
+
+    Example:
+    >>> with JsonlExporter("output/document") as exporter:  # doctest: +SKIP
+    ...     exporter.write_pairs(generator.iter_interview_content(system_prompt, user_prompt, 5, "cached"))
+
+    Attributes:
+        save_dir (str): The directory of the exported file.
+        save_path (str): The path of the exported file.
+    """
+
+    extension = ""
+
+    def __init__(self, save_dir: str, file_name: Optional[str] = None) -> None:
+        """
+        Args:
+            save_dir (str): The directory of the exported file.
+            file_name (str, optional): The file name. Defaults to a timestamped 'OpenInterview_<time>.<extension>'.
+        """
+        self.save_dir = save_dir
+        if file_name is None:
+            file_name = f"OpenInterview_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.{self.extension}"
+        self.save_path = os.path.join(save_dir, file_name)
+        self._file = None
+
+    def open(self) -> "QAExporter":
+        """Creates the file and writes the header."""
+        os.makedirs(self.save_dir, exist_ok=True)
+        self._file = open(self.save_path, "w", encoding="utf-8")
+        self.write_header()
+        self.flush()
+        return self
+
+    def flush(self) -> None:
+        """Pushes the written pairs to disk."""
+        self._file.flush()
+
+    def write_pairs(self, qa_items: QAItems) -> int:
+        """
+        Writes every pair of a QA dictionary or an iterable of pair dicts.
+
+        Returns:
+            int: The number of pairs written.
+        """
+        if self._file is None:
+            self.open()
+        count = 0
+        for identifier, question, answer in iter_qa_items(qa_items):
+            self.write_pair(identifier, question, answer)
+            self.flush()
+            count += 1
+        return count
+
+    def close(self) -> str:
+        """
+        Writes the footer and closes the file.
+
+        Returns:
+            str: The path of the exported file.
+        """
+        if self._file is None:
+            self.open()
+        self.write_footer()
+        self._file.close()
+        self._file = None
+        return self.save_path
+
+    def export(self, qa_items: QAItems) -> str:
+        """
+        Writes all pairs and closes the file.
+
+        Returns:
+            str: The path of the exported file.
+        """
+        self.open()
+        try:
+            self.write_pairs(qa_items)
+        finally:
+            path = self.close()
+        return path
+
+    def write_header(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write_pair(self, identifier: str, question: Any, answer: Any) -> None:
+        """Writes one Q/A pair; either half may be None."""
+
+    def write_footer(self) -> None:
+        pass
+
+    def __enter__(self) -> "QAExporter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class JsonlExporter(QAExporter):
+    """Writes one `{"id", "question", "answer"}` JSON object per line."""
+
+    extension = "jsonl"
+
+    def write_pair(self, identifier, question, answer):
+        record = {"id": identifier, "question": question, "answer": answer}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class MarkdownExporter(QAExporter):
+    """Writes a Markdown document with one section per Q/A pair."""
+
+    extension = "md"
+
+    def __init__(self, save_dir: str, file_name: Optional[str] = None) -> None:
+        super().__init__(save_dir, file_name)
+        self._count = 0
+
+    def write_header(self):
+        self._count = 0
+        self._file.write("# Open Interview\n\n")
+
+    def write_pair(self, identifier, question, answer):
+        self._count += 1
+        self._file.write(
+            f"## Q{self._count}. {_one_line(question, 'No question provided.')}\n\n"
+            f"{answer if answer else 'No answer provided.'}\n\n"
+        )
+
+
+class HtmlExporter(QAExporter):
+    """Writes a standalone HTML page with one block per Q/A pair."""
+
+    extension = "html"
+
+    def write_header(self):
+        self._file.write(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            "<title>Open Interview</title>\n<style>\n"
+            "body { font-family: sans-serif; max-width: 50em; margin: 2em auto; }\n"
+            ".q { background: #000; color: #fff; padding: 4pt; margin: 0; }\n"
+            ".a { border: 1px solid #d3d3d3; padding: 4pt; margin: 0 0 1em; }\n"
+            "</style>\n</head>\n<body>\n<h1>Open Interview</h1>\n"
+        )
+
+    def write_pair(self, identifier, question, answer):
+        self._file.write(
+            f'<section id="{html.escape(identifier)}">\n'
+            f'<p class="q">Q: {_html_text(question, "No question provided.")}</p>\n'
+            f'<p class="a">A: {_html_text(answer, "No answer provided.")}</p>\n'
+            "</section>\n"
+        )
+
+    def write_footer(self):
+        self._file.write("</body>\n</html>\n")
+
+
+class DocxExporter(QAExporter):
+    """
+    Adapts `DocumentCreator` to the exporter interface.
+
+    A .docx file is a zip archive that can only be written once complete, so unlike the
+    text exporters the document is kept in memory and saved on close.
+    """
+
+    extension = "docx"
+
+    def __init__(
+        self,
+        save_dir: str,
+        file_name: Optional[str] = None,
+        font_name: str = "TeamViewer15",
+        font_size: Optional[int] = 11,
+    ) -> None:
+        from openinterview.utils.doc_manager import DocumentCreator
+
+        super().__init__(save_dir, file_name)
+        self.font_name = font_name
+        self.font_size = font_size
+        self.document_creator = DocumentCreator()
+
+    def open(self):
+        self.document_creator.begin_document(self.font_name, self.font_size)
+        self._file = self.document_creator
+        return self
+
+    def write_pair(self, identifier, question, answer):
+        self.document_creator.add_qa_table(question, answer)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self._file is None:
+            self.open()
+        os.makedirs(self.save_dir, exist_ok=True)
+        self.document_creator.doc.save(self.save_path)
+        self._file = None
+        return self.save_path
+
+
+EXPORTERS: Dict[str, Type[QAExporter]] = {
+    "jsonl": JsonlExporter,
+    "md": MarkdownExporter,
+    "markdown": MarkdownExporter,
+    "html": HtmlExporter,
+    "docx": DocxExporter,
+}
+
+
+def get_exporter(export_format: str, save_dir: str, **kwargs) -> QAExporter:
+    """
+    Creates the exporter of a format.
+
+    Args:
+        export_format (str): 'jsonl', 'md'/'markdown', 'html', 'docx' or a format added with `register_exporter`.
+        save_dir (str): The directory of the exported file.
+        **kwargs: Passed to the exporter.
+
+    Returns:
+        QAExporter: The exporter, not opened yet.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    try:
+        exporter_class = EXPORTERS[export_format.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported export format '{export_format}'. Choose one of {', '.join(sorted(EXPORTERS))}."
+        )
+    return exporter_class(save_dir, **kwargs)
+
+
+def register_exporter(export_format: str, exporter_class: Type[QAExporter]) -> None:
+    """Adds or replaces the exporter of a format, e.g. a CSV writer."""
+    EXPORTERS[export_format.lower()] = exporter_class
+
+
+def export_qa(
+    qa_items: QAItems, save_dir: str, formats: Iterable[str] = ("jsonl",)
+) -> Dict[str, str]:
+    """
+    Writes Q/A pairs to several formats in a single pass over `qa_items`.
+
+    Args:
+        qa_items (Union[Dict[str, Any], Iterable[Dict[str, Any]]]): A QA dictionary or an iterable of pair dicts.
+        save_dir (str): The directory of the exported files.
+        formats (Iterable[str], optional): The export formats. Defaults to ("jsonl",).
+
+    Returns:
+        Dict[str, str]: The path of each exported file, keyed by format.
+    """
+    exporters = {
+        export_format: get_exporter(export_format, save_dir)
+        for export_format in formats
+    }
+    paths = {}
+    for exporter in exporters.values():
+        exporter.open()
+    try:
+        for identifier, question, answer in iter_qa_items(qa_items):
+            for exporter in exporters.values():
+                exporter.write_pair(identifier, question, answer)
+                exporter.flush()
+    finally:
+        for export_format, exporter in exporters.items():
+            paths[export_format] = exporter.close()
+    return paths
+
+
+def _one_line(text: Any, default: str) -> str:
+    return " ".join(str(text).split()) if text else default
+
+
+def _html_text(text: Any, default: str) -> str:
+    return html.escape(str(text) if text else default).replace("\n", "<br>\n")
@@ -1,21 +1,162 @@
-from PyPDF2 import PdfReader
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
+from openinterview.utils.telemetry import span
 
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
 
-def load_file_content(file_path):
+# Bump when the extracted text changes, e.g. v2 separates pages with form feeds instead
+# of spaces, so entries cached by earlier versions are not reused.
+_CACHE_VERSION = "v2"
+_MEMORY_CACHE_SIZE = 32
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def load_file_content(
+    file_path,
+    cache_dir: Optional[str] = None,
+    max_workers: int = 1,
+    min_pages_per_worker: int = 8,
+    hash_content: bool = False,
+):
     """
     Reads the content of a file. Supports .txt and .pdf file formats.
+
+    Extracted PDF text is cached in memory for the life of the process and, if `cache_dir`
+    is given, on disk across runs. Cache entries are keyed by the file path, modification
+    time and size, or by the file content hash if `hash_content` is True, so an edited
+    file is always parsed again.
+
+    Args:
+        file_path (str): The path of the .txt or .pdf file.
+        cache_dir (str, optional): A directory for the persistent extraction cache. Defaults to None (memory only).
+        max_workers (int, optional): The number of processes used to extract pages of long PDFs. Defaults to 1.
+        min_pages_per_worker (int, optional): The minimum number of pages given to each process. Defaults to 8.
+        hash_content (bool, optional): Key the cache by content hash instead of path, mtime and size. Defaults to False.
+
+    Returns:
+        str: The text content of the file; the pages of a PDF are separated by form feeds.
     """
+    with span("load_file_content") as s:
+        text_content = _load_file_content(
+            file_path, cache_dir, max_workers, min_pages_per_worker, hash_content
+        )
+        if s.recording:
+            s.set("format", os.path.splitext(file_path)[1])
+            s.set("bytes", len(text_content.encode("utf-8")))
+    return text_content
+
+
+def _load_file_content(
+    file_path, cache_dir, max_workers, min_pages_per_worker, hash_content
+):
     text_content = ""
     if file_path.endswith(".txt"):
         with open(file_path, "r", encoding="utf-8") as file:
             text_content = file.read()
     elif file_path.endswith(".pdf"):
-        reader = PdfReader(file_path)
-        text_content = " ".join(
-            page.extract_text()
-            for page in reader.pages
-            if page.extract_text() is not None
-        )
+        cache_key = _cache_key(file_path, hash_content)
+        text_content = _get_cached(cache_key, cache_dir)
+        if text_content is None:
+            text_content = _extract_pdf_text(
+                file_path, max_workers, min_pages_per_worker
+            )
+            _set_cached(cache_key, text_content, cache_dir)
     else:
         raise ValueError("Unsupported file format. Please use .txt or .pdf files.")
     return text_content
+
+
+def _extract_pdf_text(file_path: str, max_workers: int, min_pages_per_worker: int):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    workers = min(max_workers, page_count // max(min_pages_per_worker, 1))
+    if workers <= 1:
+        page_texts = _extract_page_texts(reader, 0, page_count)
+    else:
+        step = -(-page_count // workers)
+        ranges = [
+            (start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(
+                _extract_page_range,
+                [file_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            page_texts = [text for chunk in chunks for text in chunk]
+    # Pages are separated by form feeds so running headers and footers can be detected.
+    return "\f".join(text for text in page_texts if text is not None)
+
+
+def _extract_page_texts(reader: "PdfReader", start: int, stop: int) -> List[str]:
+    # Each page is extracted exactly once.
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    from PyPDF2 import PdfReader
+
+    return _extract_page_texts(PdfReader(file_path), start, stop)
+
+
+def _cache_key(file_path: str, hash_content: bool) -> str:
+    if hash_content:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return f"{_CACHE_VERSION}|sha256:" + digest.hexdigest()
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return f"{_CACHE_VERSION}|stat:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_path(cache_key: str, cache_dir: str) -> str:
+    file_name = cache_key.replace("|", "_").replace(":", "_")
+    return os.path.join(cache_dir, file_name + ".json")
+
+
+def _get_cached(cache_key: str, cache_dir: Optional[str]) -> Optional[str]:
+    with _memory_cache_lock:
+        if cache_key in _memory_cache:
+            _memory_cache.move_to_end(cache_key)
+            return _memory_cache[cache_key]
+    if cache_dir:
+        try:
+            with open(_cache_path(cache_key, cache_dir), "r", encoding="utf-8") as f:
+                text_content = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+        _remember(cache_key, text_content)
+        return text_content
+    return None
+
+
+def _set_cached(cache_key: str, text_content: str, cache_dir: Optional[str]) -> None:
+    _remember(cache_key, text_content)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = _cache_path(cache_key, cache_dir)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": cache_key, "text": text_content}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _remember(cache_key: str, text_content: str) -> None:
+    with _memory_cache_lock:
+        _memory_cache[cache_key] = text_content
+        _memory_cache.move_to_end(cache_key)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional
+from openinterview.utils.parser import parse_qa_response
+from openinterview.utils.tokens import estimate_message_tokens, estimate_tokens
+
+
+class ConversationHistory:
+    """
+    A bounded chat history that keeps request size flat across iterations.
+
+    The system message is stored once and replaced when it changes instead of being
+    appended again. Only the most recent turns are sent verbatim; as messages are added,
+    older turns are dropped to stay within `max_turns` and `max_tokens`. When
+    `summarize_evicted` is enabled, the questions of dropped assistant turns are kept as a
+    compact list so the model can still avoid repeating them. Reading `messages` never
+    changes the history.
+
+    Attributes:
+        max_tokens (Optional[int]): The token budget of the messages sent per request. None for no limit.
+        max_turns (Optional[int]): The number of previous user/assistant exchanges kept verbatim. None for no limit.
+        summarize_evicted (bool): Whether questions of dropped turns are sent as a compact list.
+        max_summary_tokens (int): The token budget of that list; the oldest questions are dropped first.
+        system (Optional[str]): The current system prompt.
+        turns (List[Dict[str, str]]): The user and assistant messages currently kept.
+        generated_questions (List[str]): Compact entries for questions of dropped turns.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_turns: Optional[int] = 1,
+        summarize_evicted: bool = True,
+        max_summary_tokens: int = 512,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.summarize_evicted = summarize_evicted
+        self.max_summary_tokens = max_summary_tokens
+        self.system: Optional[str] = None
+        self.turns: List[Dict[str, str]] = []
+        self.generated_questions: List[str] = []
+
+    def add(self, role: str, content: str) -> None:
+        """
+        Adds a message to the history and fits the history to its limits, see `fit`.
+
+        Args:
+            role (str): 'system', 'user' or 'assistant'. System messages replace the current system prompt.
+            content (str): The content of the message.
+        """
+        if role == "system":
+            self.system = content
+        else:
+            self.turns.append({"role": role, "content": content})
+        self.fit()
+
+    def fit(self) -> None:
+        """
+        Drops the oldest turns until the history fits `max_turns` and `max_tokens`.
+
+        The latest message is always kept. The questions of dropped assistant turns are added
+        to the compact list, which is part of the token budget.
+        """
+        if self.max_turns is not None:
+            # Keep `max_turns` complete exchanges plus the pending user message.
+            limit = 2 * self.max_turns + 1
+            while len(self.turns) > limit:
+                self._evict(self.turns.pop(0))
+        if self.max_tokens is None:
+            return
+        while (
+            len(self.turns) > 1
+            and estimate_message_tokens(self.messages) > self.max_tokens
+        ):
+            self._evict(self.turns.pop(0))
+            if self.turns[0]["role"] == "assistant" and len(self.turns) > 1:
+                self._evict(self.turns.pop(0))
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """
+        The message list to send: the system prompt, the list of earlier questions and the kept turns.
+        """
+        head: List[Dict[str, str]] = []
+        if self.system:
+            head.append({"role": "system", "content": self.system})
+        summary = self._summary_message()
+        if summary:
+            head.append(summary)
+        return head + self.turns
+
+    def reset(self) -> None:
+        """Clears the system prompt, the turns and the generated question list."""
+        self.system = None
+        self.turns = []
+        self.generated_questions = []
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def _evict(self, message: Dict[str, str]) -> None:
+        if not self.summarize_evicted or message["role"] != "assistant":
+            return
+        for key, question in parse_qa_response(message["content"]).items():
+            if key.startswith("Q_") and isinstance(question, str):
+                question = " ".join(question.split())
+                self.generated_questions.append(f"{key}: {question[:120]}")
+        while (
+            self.generated_questions
+            and estimate_tokens("\n".join(self.generated_questions))
+            > self.max_summary_tokens
+        ):
+            self.generated_questions.pop(0)
+
+    def _summary_message(self) -> Optional[Dict[str, str]]:
+        if not self.generated_questions:
+            return None
+        return {
+            "role": "user",
+            "content": "Questions already generated, do not repeat them:\n- "
+            + "\n- ".join(self.generated_questions),
+        }
@@ -0,0 +1,49 @@
+import sys
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(
+    module_name: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Returns the module-level `__getattr__` and `__dir__` that import attributes on first access.
+
+    A package re-exporting its submodules this way only pays for the submodules, and their
+    third-party dependencies, that are actually used. Each attribute is imported once and
+    then stored in the package namespace, so later lookups are plain attribute accesses.
+    A missing optional dependency raises ImportError when its attribute is touched rather
+    than when the package is imported.
+
+    Example:
+    >>> __getattr__, __dir__ = lazy_attributes(__name__, {"DocumentCreator": ".utils.doc_manager"})  # doctest: +SKIP
+
+    Args:
+        module_name (str): The `__name__` of the package.
+        attributes (Dict[str, str]): The module defining each attribute, absolute or relative to the package.
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: The `__getattr__` and `__dir__` functions.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            source = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module '{module_name}' has no attribute '{name}'"
+            ) from None
+        try:
+            module = importlib.import_module(source, module_name)
+        except ImportError as e:
+            raise ImportError(
+                f"{module_name}.{name} requires '{e.name or source}', which could not be imported: {e}"
+            ) from e
+        value = getattr(module, name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name])) | set(attributes))
+
+    return __getattr__, __dir__
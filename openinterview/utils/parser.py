@@ -0,0 +1,218 @@
+import re
+import ast
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# A complete `"Q_xxxx": "..."` or `'A_xxxx': '...'` entry of a Python/JSON dict literal.
+_ENTRY_PATTERN = re.compile(
+    r"""(["'])([QA]_[0-9A-Za-z]+)\1\s*:\s*(?P<quote>["'])(?P<value>(?:\\.|(?!(?P=quote))[^\\])*)(?P=quote)""",
+    re.DOTALL,
+)
+_SEPARATOR_PATTERN = re.compile(r"[\s,{]*")
+_FENCE_PATTERN = re.compile(r"```[ \t]*[A-Za-z]*[ \t]*\n?(.*?)(?:```|$)", re.DOTALL)
+
+
+def _decode_string(quote: str, body: str) -> str:
+    try:
+        value = ast.literal_eval(quote + body + quote)
+        if isinstance(value, str):
+            return value
+    except (SyntaxError, ValueError):
+        pass
+    return body
+
+
+class QAStreamParser:
+    """
+    Incrementally extracts Q/A pairs from a streamed dict-literal response.
+
+    Feed the response text chunk by chunk; every time both `Q_<id>` and `A_<id>` of an
+    identifier have been fully received, the pair is returned as a two-item dict.
+
+    Example:
+    >>> parser = QAStreamParser()
+    >>> parser.feed("{'Q_1a': 'Why?', 'A_1")
+    []
+    >>> parser.feed("a': 'Because.'}")
+    [{'Q_1a': 'Why?', 'A_1a': 'Because.'}]
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.text = ""
+        self._pos = 0
+        self._started = False
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._emitted: set = set()
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """
+        Adds a chunk of response text.
+
+        Args:
+            chunk (str): The next piece of the streamed response.
+
+        Returns:
+            List[Dict[str, str]]: The Q/A pairs completed by this chunk, in order.
+        """
+        self.buffer += chunk
+        self.text += chunk
+        pairs = []
+        for key, value in self._scan(final=False):
+            pair = self._add(key, value)
+            if pair:
+                pairs.append(pair)
+        return pairs
+
+    def close(self) -> Tuple[List[Dict[str, str]], Dict[str, str]]:
+        """
+        Finishes parsing once the stream has ended.
+
+        Returns:
+            Tuple[List[Dict[str, str]], Dict[str, str]]: The pairs completed by the remaining text,
+            and the entries whose counterpart never arrived.
+        """
+        pairs = []
+        for key, value in self._scan(final=True):
+            pair = self._add(key, value)
+            if pair:
+                pairs.append(pair)
+        leftovers = {}
+        for entries in self._pending.values():
+            leftovers.update(entries)
+        self._pending = {}
+        return pairs, leftovers
+
+    def _scan(self, final: bool) -> Iterator[Tuple[str, str]]:
+        if not self._started:
+            # Skip any preamble such as a code fence before the dict literal.
+            brace = self.buffer.find("{")
+            if brace == -1 and not final:
+                return
+            self._started = True
+            self._pos = brace + 1
+        while True:
+            start = _SEPARATOR_PATTERN.match(self.buffer, self._pos).end()
+            match = _ENTRY_PATTERN.match(self.buffer, start)
+            if match is None:
+                if not final:
+                    break
+                # The stream has ended: resynchronize past malformed text.
+                match = _ENTRY_PATTERN.search(self.buffer, start)
+                if match is None:
+                    break
+            self._pos = match.end()
+            yield match.group(2), _decode_string(
+                match.group("quote"), match.group("value")
+            )
+        # Drop consumed text so the buffer stays small on long streams.
+        self.buffer = self.buffer[self._pos :]
+        self._pos = 0
+
+    def _add(self, key: str, value: str):
+        prefix, identifier = key.split("_", 1)
+        if identifier in self._emitted:
+            return None
+        entries = self._pending.setdefault(identifier, {})
+        entries[key] = value
+        if f"Q_{identifier}" in entries and f"A_{identifier}" in entries:
+            self._emitted.add(identifier)
+            del self._pending[identifier]
+            return {
+                f"Q_{identifier}": entries[f"Q_{identifier}"],
+                f"A_{identifier}": entries[f"A_{identifier}"],
+            }
+        return None
+
+
+def iter_qa_pairs(chunks: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Yields Q/A pairs from an iterable of response text chunks as soon as each pair is complete.
+
+    Args:
+        chunks (Iterable[str]): The streamed response text.
+
+    Yields:
+        Dict[str, str]: A dict with the `Q_<id>` and `A_<id>` entries of one pair.
+    """
+    parser = QAStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    pairs, _ = parser.close()
+    yield from pairs
+
+
+def parse_qa_response(response_text: str) -> Dict[str, Any]:
+    """
+    Parses a model response into a Q/A dictionary without executing any code.
+
+    The dict literal is taken from a code fence if there is one, then parsed with
+    `ast.literal_eval` (Python dict form) or `json.loads`. If the literal is truncated or
+    malformed, every well-formed `"Q_xxxx": "..."`/`"A_xxxx": "..."` entry is recovered
+    instead, so one bad comma does not discard the whole response.
+
+    Args:
+        response_text (str): The raw model response.
+
+    Returns:
+        Dict[str, Any]: The parsed entries. Empty if nothing could be recovered.
+
+    Example:
+    >>> parse_qa_response('```python\\n{"Q_1": "Why?", "A_1": "Because."}\\n```')
+    {'Q_1': 'Why?', 'A_1': 'Because.'}
+    >>> parse_qa_response('{"Q_1": "Why?" "A_1": "Because.", "Q_2": "Trunc')
+    {'Q_1': 'Why?', 'A_1': 'Because.'}
+    """
+    if not response_text:
+        return {}
+    text = response_text
+    fence = _FENCE_PATTERN.search(text)
+    if fence and "{" in fence.group(1):
+        text = fence.group(1)
+
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end > start:
+        literal = text[start : end + 1]
+        for loads in (ast.literal_eval, json.loads):
+            try:
+                parsed = loads(literal)
+            except (SyntaxError, ValueError, TypeError, MemoryError, RecursionError):
+                continue
+            if isinstance(parsed, dict):
+                return {str(key): value for key, value in parsed.items()}
+
+    return {
+        match.group(2): _decode_string(match.group("quote"), match.group("value"))
+        for match in _ENTRY_PATTERN.finditer(text)
+    }
+
+
+def merge_qa_dict(
+    total_qa_dict: Dict[str, Any], batch_qa_dict: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Adds the entries of a batch whose key is not in `total_qa_dict` yet.
+
+    A key repeated by a later iteration keeps its first value, in every generation mode:
+    pipelined runs render each batch as soon as it arrives and cannot take it back.
+
+    Args:
+        total_qa_dict (Dict[str, Any]): The merged entries, updated in place.
+        batch_qa_dict (Dict[str, Any]): The entries of the next batch.
+
+    Returns:
+        Dict[str, Any]: The entries that were added.
+
+    Example:
+    >>> total = {"Q_1": "Why?", "A_1": "Because."}
+    >>> merge_qa_dict(total, {"Q_1": "How?", "A_1": "Like so.", "Q_2": "When?", "A_2": "Now."})
+    {'Q_2': 'When?', 'A_2': 'Now.'}
+    >>> total["Q_1"]
+    'Why?'
+    """
+    new_qa_dict = {
+        key: value for key, value in batch_qa_dict.items() if key not in total_qa_dict
+    }
+    total_qa_dict.update(new_qa_dict)
+    return new_qa_dict
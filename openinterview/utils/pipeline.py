@@ -0,0 +1,106 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+_DONE = object()
+
+
+class PipelineError(Exception):
+    """
+    Raised when one or more pipeline stages failed.
+
+    Stages that did not fail still processed every item, so their artifacts are complete.
+
+    Attributes:
+        errors (Dict[str, BaseException]): The first error of each failed stage, keyed by stage name.
+            The item source is reported as "source".
+        results (Dict[str, Any]): The return values of the stages' finish callbacks.
+    """
+
+    def __init__(self, errors: Dict[str, BaseException], results: Dict[str, Any]):
+        self.errors = errors
+        self.results = results
+        details = "; ".join(f"{name}: {error!r}" for name, error in errors.items())
+        super().__init__(f"Pipeline stages failed: {details}")
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: Dict[str, Tuple[Callable[[Any], None], Optional[Callable[[], Any]]]],
+    queue_size: int = 2,
+) -> Dict[str, Any]:
+    """
+    Feeds every item of `source` to all stages, each running on its own thread.
+
+    Each stage reads from a bounded queue, so the source blocks (backpressure) when a stage
+    falls `queue_size` items behind. Stages overlap with each other and with the source, so
+    the total time approaches that of the slowest stage instead of the sum of all stages.
+
+    A failing stage skips the remaining items but keeps draining its queue, so the other
+    stages run to completion. Every stage's finish callback runs once the source is exhausted
+    or has failed, so completed work is saved even after an error.
+
+    Args:
+        source (Iterable[Any]): The items to process, e.g. generated QA batches.
+        stages (Dict[str, Tuple[Callable[[Any], None], Optional[Callable[[], Any]]]]): Stage name to
+            `(handle_item, finish)`. `finish` may be None.
+        queue_size (int, optional): The maximum number of items waiting per stage. Defaults to 2.
+
+    Returns:
+        Dict[str, Any]: The return values of the finish callbacks, keyed by stage name.
+
+    Raises:
+        PipelineError: If the source or any stage failed, after all stages have finished.
+    """
+    errors: Dict[str, BaseException] = {}
+    results: Dict[str, Any] = {}
+    lock = threading.Lock()
+    queues = {name: queue.Queue(maxsize=max(queue_size, 1)) for name in stages}
+
+    def worker(name: str) -> None:
+        handle, finish = stages[name]
+        inbox = queues[name]
+        failed = False
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if failed:
+                continue
+            try:
+                handle(item)
+            except Exception as e:
+                failed = True
+                with lock:
+                    errors[name] = e
+        if finish is not None:
+            try:
+                result = finish()
+            except Exception as e:
+                with lock:
+                    errors.setdefault(name, e)
+            else:
+                with lock:
+                    results[name] = result
+
+    threads = [
+        threading.Thread(target=worker, args=(name,), name=f"pipeline-{name}")
+        for name in stages
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for item in source:
+            for inbox in queues.values():
+                inbox.put(item)
+    except Exception as e:
+        errors["source"] = e
+    finally:
+        for inbox in queues.values():
+            inbox.put(_DONE)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise PipelineError(errors, results)
+    return results
@@ -1,4 +1,138 @@
-def create_system_prompt(
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from openinterview.utils.file_manager import load_file_content
+from openinterview.utils.telemetry import add_to_span
+from openinterview.utils.tokens import estimate_tokens
+
+# Documents with higher numbers are cut first.
+SECTION_PRIORITIES: Dict[str, int] = {
+    "interviewer_resume": 3,
+    "jd": 2,
+    "candidate_resume": 1,
+}
+
+# The tokens each document keeps before any document is cut further.
+MIN_SECTION_TOKENS = 256
+
+TRUNCATION_MARKER = "\n[...]"
+
+INSTRUCTIONS: Dict[str, str] = {
+    "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
+    "techQAsFromExperts": "Create questions from your expertise related to the position.",
+    "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
+    "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
+    "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
+}
+DEFAULT_INSTRUCTION = "Inquire about both technical skills and personal qualities."
+
+_CHARACTER_FIXES = str.maketrans(
+    {
+        "\ufb00": "ff",
+        "\ufb01": "fi",
+        "\ufb02": "fl",
+        "\ufb03": "ffi",
+        "\ufb04": "ffl",
+        "\u00ad": "",  # Soft hyphen.
+        "\u200b": "",  # Zero-width space.
+        "\u00a0": " ",  # No-break space.
+        "\r": "\n",
+    }
+)
+_PAGE_NUMBER = re.compile(r"^\W*(page\s*)?\d{1,4}(\s*(of|/)\s*\d{1,4})?\W*$", re.I)
+_HYPHENATED = re.compile(r"(\w)-\n(\w)")
+_MARGIN_LINES = 2
+
+
+class SystemPrompt(NamedTuple):
+    """A system prompt assembled within a token budget."""
+
+    text: str
+    tokens: int
+    budget: Optional[int]
+    original_tokens: int
+    truncated: Tuple[str, ...]
+
+
+def normalize_document_text(text: str) -> str:
+    """
+    Cleans text extracted from a PDF resume or job description before it goes into a prompt.
+
+    In text with pages separated by form feeds, as `load_file_content` returns PDFs, page
+    numbers and the headers and footers that repeat across pages are kept only where they
+    first appear; text without form feeds keeps all its lines. Words hyphenated across line
+    breaks are joined when both parts are lowercase, so "Data-\\nDriven" keeps its hyphen.
+    Ligatures and invisible characters are replaced, runs of whitespace collapse to one
+    space, repeated lines to one line and blank lines to a single paragraph break.
+
+    Example:
+    >>> normalize_document_text("Jane Doe  CV\\nBuilt data   pipe-\\nlines\\n1\\fJane Doe  CV\\nLed a team\\n2")
+    'Jane Doe CV\\nBuilt data pipelines\\nLed a team'
+
+    Args:
+        text (str): The extracted text.
+
+    Returns:
+        str: The normalized text.
+    """
+    pages = [
+        [" ".join(line.split()) for line in page.split("\n")]
+        for page in text.replace("\r\n", "\n").translate(_CHARACTER_FIXES).split("\f")
+    ]
+    paginated = len(pages) > 1
+    repeated = _repeated_margin_lines(pages)
+    seen: Set[str] = set()
+    lines: List[str] = []
+    for page in pages:
+        margins = _margin_indices(page) if paginated else set()
+        for i, line in enumerate(page):
+            if i in margins:
+                if _PAGE_NUMBER.match(line):
+                    continue
+                key = _margin_key(line)
+                if key in repeated:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+            if line and lines and line == lines[-1]:
+                continue
+            lines.append(line)
+    text = _HYPHENATED.sub(_join_hyphenated, "\n".join(lines))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, marker: str = TRUNCATION_MARKER
+) -> str:
+    """
+    Cuts a text at a line or word boundary so that it, with `marker` appended, fits `max_tokens`.
+
+    Example:
+    >>> truncate_to_tokens("one two three four five six", 5, marker=" ...")
+    'one two ...'
+
+    Returns:
+        str: The text if it already fits, the cut text with the marker, or an empty string.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if estimate_tokens(marker) >= max_tokens:
+        return ""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle] + marker) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > low // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + marker
+
+
+def build_system_prompt(
     candidate_resume: str = None,
     jd: str = None,
     interviewer_resume: str = "",
@@ -7,30 +141,124 @@ def create_system_prompt(
     language: str = "English",
     max_sentence: int = 10,
     custom_prompt: str = "",
-) -> str:
+    instructions: Optional[Dict[str, str]] = None,
+    max_tokens: Optional[int] = None,
+    normalize: bool = True,
+) -> SystemPrompt:
     """
-    Generates a custom interview prompt.
-    """
-    base = f"You are a helpful assistant and the {interview_type} interviewer for a candidate for the {position} position. Please formulate questions based on the interviewee resume as follow:\n\n{candidate_resume}.\n\nand job description as follow:\n\n{jd}.\nWrite in {language} and create answers containing at least {max_sentence} sentences each."
-    if interviewer_resume:
-        base += f"Given the interviewer's career background, craft sharp questions for the candidate based on the interviewer's experience and expertise.\n- Resume of interviewer:\n{interviewer_resume}"
-    instructions = {
-        "techQAsFromResume": "Focus on technical skills in given resume, e.g., Unet for brain tumor segmentation.",
-        "techQAsFromExperts": "Create questions from your expertise related to the position.",
-        "techQAs": f"Create questions based on both your and the interviewee's experience. For example, detail on similar technical challenges.",
-        "personalityQAs": "Inquire about personal qualities and competencies, such as teamwork.",
-        "reviewResume": "Point out specific shortcomings in the resume, providing guidance for improvement.",
+    Assembles the interview system prompt within a token budget and reports its size.
+
+    Arguments ending in .pdf or .txt are read from the file. The resume and job description
+    are normalized with `normalize_document_text`. If the prompt exceeds the budget, the
+    documents are cut in the order of `SECTION_PRIORITIES`: the interviewer resume first, then
+    the job description, then the candidate resume, each down to `MIN_SECTION_TOKENS` before
+    the next one is cut, and further only if that is not enough. The instructions are never cut.
+
+    Example:
+    >>> prompt = build_system_prompt("Jane Doe\\n" + "Python " * 4000, "Senior Engineer", max_tokens=1000)
+    >>> prompt.tokens <= 1000 < prompt.original_tokens, prompt.truncated
+    (True, ('candidate_resume',))
+
+    Args:
+        candidate_resume (str, optional): The candidate's resume, or the path of a .pdf or .txt file.
+        jd (str, optional): The job description, or the path of a .pdf or .txt file.
+        interviewer_resume (str, optional): The interviewer's resume, or the path of a .pdf or .txt file.
+        interview_type (str, optional): The interview type, which selects the instruction. Defaults to "base".
+        position (str, optional): The position. Defaults to "AI researcher".
+        language (str, optional): The language of the questions and answers. Defaults to "English".
+        max_sentence (int, optional): The minimum number of sentences per answer. Defaults to 10.
+        custom_prompt (str, optional): Additional instructions appended to the prompt.
+        instructions (Dict[str, str], optional): The instruction of each interview type. Defaults to `INSTRUCTIONS`.
+        max_tokens (int, optional): The token budget, e.g. `prompt_budget(model)` from `openinterview.models.registry`.
+            Defaults to None (no limit).
+        normalize (bool, optional): Whether to normalize the documents. Defaults to True.
+
+    Returns:
+        SystemPrompt: The prompt text, its estimated tokens, the budget, the tokens before
+            truncation and the names of the cut documents.
+    """
+    sections = {
+        "candidate_resume": _read_document(candidate_resume),
+        "jd": _read_document(jd),
+        "interviewer_resume": _read_document(interviewer_resume),
     }
-    specific_instructions = instructions.get(
-        interview_type, "Inquire about both technical skills and personal qualities."
-    )
-    prompt = f"{base}\n\n{specific_instructions}"
-    return (
-        prompt + f"\nAdditional Instructions: {custom_prompt}"
-        if custom_prompt
-        else prompt
+    if normalize:
+        sections = {
+            name: normalize_document_text(text) if text else text
+            for name, text in sections.items()
+        }
+    instruction = (instructions or INSTRUCTIONS).get(
+        interview_type, DEFAULT_INSTRUCTION
     )
 
+    def render() -> str:
+        base = f"You are a helpful assistant and the {interview_type} interviewer for a candidate for the {position} position. Please formulate questions based on the interviewee resume as follow:\n\n{sections['candidate_resume']}.\n\nand job description as follow:\n\n{sections['jd']}.\nWrite in {language} and create answers containing at least {max_sentence} sentences each."
+        if sections["interviewer_resume"]:
+            base += f"Given the interviewer's career background, craft sharp questions for the candidate based on the interviewer's experience and expertise.\n- Resume of interviewer:\n{sections['interviewer_resume']}"
+        prompt = f"{base}\n\n{instruction}"
+        return (
+            prompt + f"\nAdditional Instructions: {custom_prompt}"
+            if custom_prompt
+            else prompt
+        )
+
+    budget = max_tokens
+    text = render()
+    original_tokens = tokens = estimate_tokens(text)
+    truncated: List[str] = []
+    # Each document first keeps at least MIN_SECTION_TOKENS, then is cut further if needed.
+    for floor in (MIN_SECTION_TOKENS, 0):
+        for name in sorted(
+            SECTION_PRIORITIES, key=SECTION_PRIORITIES.get, reverse=True
+        ):
+            while budget is not None and tokens > budget:
+                section_tokens = estimate_tokens(sections[name] or "")
+                if section_tokens <= floor:
+                    break
+                sections[name] = truncate_to_tokens(
+                    sections[name], max(section_tokens - (tokens - budget), floor)
+                )
+                if name not in truncated:
+                    truncated.append(name)
+                text = render()
+                tokens = estimate_tokens(text)
+
+    add_to_span("system_prompt_tokens", tokens)
+    if truncated:
+        add_to_span("truncated_tokens", original_tokens - tokens)
+    return SystemPrompt(text, tokens, budget, original_tokens, tuple(truncated))
+
+
+def create_system_prompt(
+    candidate_resume: str = None,
+    jd: str = None,
+    interviewer_resume: str = "",
+    interview_type: str = "base",
+    position: str = "AI researcher",
+    language: str = "English",
+    max_sentence: int = 10,
+    custom_prompt: str = "",
+    instructions: Optional[Dict[str, str]] = None,
+    max_tokens: Optional[int] = None,
+    normalize: bool = True,
+) -> str:
+    """
+    Generates a custom interview prompt. See `build_system_prompt` for the token budget.
+    """
+    return build_system_prompt(
+        candidate_resume=candidate_resume,
+        jd=jd,
+        interviewer_resume=interviewer_resume,
+        interview_type=interview_type,
+        position=position,
+        language=language,
+        max_sentence=max_sentence,
+        custom_prompt=custom_prompt,
+        instructions=instructions,
+        max_tokens=max_tokens,
+        normalize=normalize,
+    ).text
+
 
 def create_base_prompt(interview_type: str) -> str:
     """
@@ -43,3 +271,37 @@ def create_base_prompt(interview_type: str) -> str:
         "adviceResume": "Ensure responses don't duplicate. Give me Python dict form code only without anyother words. Edit parts of the resume needing correction or strengthening, focusing on job relevance.",
     }
     return prompts.get(interview_type, "")
+
+
+def _read_document(value: Optional[str]) -> Optional[str]:
+    if value and value.endswith((".pdf", ".txt")):
+        return load_file_content(value)
+    return value
+
+
+def _join_hyphenated(match: "re.Match[str]") -> str:
+    before, after = match.groups()
+    if before.islower() and after.islower():
+        return before + after
+    return match.group(0)
+
+
+def _margin_indices(page: List[str]) -> Set[int]:
+    filled = [i for i, line in enumerate(page) if line]
+    return set(filled[:_MARGIN_LINES] + filled[-_MARGIN_LINES:])
+
+
+def _margin_key(line: str) -> str:
+    # Running headers often differ only in the page number.
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def _repeated_margin_lines(pages: List[List[str]]) -> Set[str]:
+    """Returns the keys of lines found in the margins of at least half of the pages."""
+    if len(pages) < 2:
+        return set()
+    counts: Counter = Counter()
+    for page in pages:
+        counts.update({_margin_key(page[i]) for i in _margin_indices(page)})
+    threshold = max(2, (len(pages) + 1) // 2)
+    return {key for key, count in counts.items() if count >= threshold}
@@ -0,0 +1,375 @@
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from openinterview.utils.telemetry import add_to_span
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+RETRYABLE_ERROR_NAMES = (
+    "RateLimitError",
+    "APITimeoutError",
+    "Timeout",
+    "APIConnectionError",
+    "ServiceUnavailableError",
+    "InternalServerError",
+    "OverloadedError",
+    "TryAgain",
+    "ConnectionError",
+)
+
+
+class Clock:
+    """The real clock used by rate limiters."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def async_sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+
+class FakeClock(Clock):
+    """
+    A clock that only advances when slept on, for testing rate limits offline.
+
+    Example:
+    >>> clock = FakeClock()
+    >>> limiter = RateLimiter(requests_per_minute=60, clock=clock)
+    >>> waits = [limiter.acquire() for _ in range(62)]
+    >>> round(clock.monotonic(), 3)
+    2.0
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+            if seconds > 0:
+                self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+class TokenBucket:
+    """
+    A token bucket that refills continuously up to its capacity.
+
+    Reservations may take the bucket below zero; the caller then waits until its share has
+    refilled. This keeps waiting callers in FIFO order without holding the lock while sleeping.
+
+    Attributes:
+        capacity (float): The maximum number of tokens, i.e. the allowed burst.
+        rate (float): The number of tokens added per second.
+    """
+
+    def __init__(self, capacity: float, rate: float, clock: Clock) -> None:
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` tokens and returns how many seconds the caller must wait before using them.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self.clock.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff that honors Retry-After.
+
+    Attributes:
+        max_retries (int): The number of retries after the first attempt.
+        base_delay (float): The backoff ceiling of the first retry in seconds; it doubles on every retry.
+        max_delay (float): The maximum delay between attempts in seconds.
+        jitter (bool): Whether to pick the delay uniformly between 0 and the ceiling ("full jitter").
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: bool = True,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the delay before retry number `attempt` (starting at 0).
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return self.rng.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class RateLimiter:
+    """
+    A request and token rate limiter with retry for one API provider.
+
+    Requests per minute and tokens per minute are enforced by separate token buckets; either
+    may be None for no limit. When a call is rejected with a retryable error (429, 5xx,
+    timeouts), the limiter waits according to its retry policy. A Retry-After from the server
+    pauses every caller of the limiter, not only the one that received it.
+
+    Attributes:
+        requests_per_minute (Optional[float]): The request budget.
+        tokens_per_minute (Optional[float]): The token budget.
+        retry_policy (RetryPolicy): The backoff policy for retryable errors.
+        clock (Clock): The clock used for waiting; use FakeClock in tests.
+        retries (int): The number of retries made so far.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.clock = clock or Clock()
+        self.retries = 0
+        self._request_bucket = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0, self.clock)
+            if requests_per_minute
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, self.clock)
+            if tokens_per_minute
+            else None
+        )
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 0) -> float:
+        """
+        Waits until one request using `tokens` tokens fits both budgets.
+
+        Returns:
+            float: The number of seconds waited.
+        """
+        wait = self._reserve(tokens)
+        if wait <= 0:
+            return 0.0
+        self.clock.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 0) -> float:
+        """The asyncio counterpart of `acquire`; waits without blocking the event loop."""
+        wait = self._reserve(tokens)
+        if wait <= 0:
+            return 0.0
+        await self.clock.async_sleep(wait)
+        return wait
+
+    def _reserve(self, tokens: float) -> float:
+        wait = 0.0
+        if self._request_bucket is not None:
+            wait = max(wait, self._request_bucket.reserve(1))
+        if self._token_bucket is not None and tokens:
+            wait = max(wait, self._token_bucket.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self._blocked_until - self.clock.monotonic())
+        return wait
+
+    def call(self, func: Callable[[], T], tokens: float = 0) -> T:
+        """
+        Calls `func` within the rate limits, retrying retryable errors with backoff.
+
+        Args:
+            func (Callable[[], T]): The API call.
+            tokens (float, optional): The estimated tokens of the call, counted against tokens per minute. Defaults to 0.
+
+        Returns:
+            T: The return value of `func`.
+
+        Raises:
+            Exception: The last error if it is not retryable or the retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return func()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                add_to_span("retries")
+                self.clock.sleep(delay)
+                attempt += 1
+
+    async def acall(self, func: Callable[[], Awaitable[T]], tokens: float = 0) -> T:
+        """
+        The asyncio counterpart of `call`: awaits `func()` within the rate limits, retrying
+        retryable errors with backoff. Cancellation is never retried.
+        """
+        attempt = 0
+        while True:
+            await self.acquire_async(tokens)
+            try:
+                return await func()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                add_to_span("retries")
+                await self.clock.async_sleep(delay)
+                attempt += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Returns how long to sleep before retrying after `error`, or None to give up.
+
+        A Retry-After pauses every caller through `_blocked_until` instead, so the delay is 0.
+        """
+        if attempt >= self.retry_policy.max_retries or not is_retryable(error):
+            return None
+        retry_after = get_retry_after(error)
+        delay = self.retry_policy.delay(attempt, retry_after)
+        with self._lock:
+            self.retries += 1
+            if retry_after is not None:
+                self._blocked_until = max(
+                    self._blocked_until, self.clock.monotonic() + delay
+                )
+                return 0.0
+        return delay
+
+
+def _get_status_code(error: BaseException) -> Optional[int]:
+    for holder in (
+        error,
+        getattr(error, "response", None),
+        getattr(error, "rsp", None),
+    ):
+        for name in ("status_code", "http_status", "status"):
+            value = getattr(holder, name, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _get_headers(error: BaseException) -> Dict[str, Any]:
+    for holder in (
+        error,
+        getattr(error, "response", None),
+        getattr(error, "rsp", None),
+    ):
+        headers = getattr(holder, "headers", None)
+        if headers:
+            return {str(key).lower(): value for key, value in dict(headers).items()}
+    return {}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Returns True for rate-limit, overload, server and connection errors."""
+    status_code = _get_status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    return any(
+        name in cls.__name__
+        for cls in type(error).__mro__
+        for name in RETRYABLE_ERROR_NAMES
+    )
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Returns the server-requested delay in seconds from 'retry-after-ms' or 'retry-after' headers.
+    """
+    headers = _get_headers(error)
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except (TypeError, ValueError):
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Returns the process-wide rate limiter of a provider, e.g. 'openai', 'anthropic',
+    'google_tts' or 'openai_audio'. Limiters start without budgets and only retry until
+    configured with `configure_rate_limiter`.
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter()
+        return _limiters[provider]
+
+
+def configure_rate_limiter(
+    provider: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    clock: Optional[Clock] = None,
+) -> RateLimiter:
+    """
+    Replaces the process-wide rate limiter of a provider.
+
+    Example:
+    >>> limiter = configure_rate_limiter("openai", requests_per_minute=500, tokens_per_minute=160000)
+    >>> get_rate_limiter("openai") is limiter
+    True
+    """
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute, retry_policy, clock)
+    with _limiters_lock:
+        _limiters[provider] = limiter
+    return limiter
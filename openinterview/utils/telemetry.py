@@ -0,0 +1,349 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from functools import wraps
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """
+    One timed operation, e.g. a `generate_content` call.
+
+    Spans nest: the innermost open span of the current thread or asyncio task is the one
+    `add_to_span` counts into, e.g. the retries of the rate limiter.
+
+    Attributes:
+        name (str): The operation name.
+        parent (Optional[str]): The name of the enclosing span.
+        attributes (Dict[str, Any]): Labels and counters such as 'prompt_tokens', 'response_bytes' or 'retries'.
+        seconds (Optional[float]): The wall time, once the span has ended.
+        error (Optional[str]): The exception type name if the operation raised.
+    """
+
+    recording = True
+
+    def __init__(
+        self, telemetry: "Telemetry", name: str, attributes: Dict[str, Any]
+    ) -> None:
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[str] = None
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.started_at = 0.0
+        self._start = 0.0
+        self._token: Optional[contextvars.Token] = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Sets an attribute."""
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """Adds to a counter attribute."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span": self.name,
+            "parent": self.parent,
+            "started_at": round(self.started_at, 6),
+            "seconds": round(self.seconds or 0.0, 6),
+            "error": self.error,
+            **self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.parent = parent.name if parent is not None else None
+        self._token = _current_span.set(self)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current_span.reset(self._token)
+        self.telemetry._export(self)
+
+
+class _NoopSpan:
+    """The span returned while telemetry is disabled; every method does nothing."""
+
+    recording = False
+    attributes: Dict[str, Any] = {}
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "openinterview_span", default=None
+)
+
+
+class JsonLogExporter:
+    """
+    Writes every finished span as one JSON line, e.g. for log shipping.
+
+    Attributes:
+        stream (IO[str]): The text stream the lines are written to.
+    """
+
+    def __init__(self, target: Union[str, IO[str], None] = None) -> None:
+        """
+        Args:
+            target (Union[str, IO[str]], optional): A file path to append to, or a text stream. Defaults to stderr.
+        """
+        if isinstance(target, str):
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            self.stream = open(target, "a", encoding="utf-8")
+            self._owns_stream = True
+        else:
+            self.stream = target or sys.stderr
+            self._owns_stream = False
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self) -> None:
+        if self._owns_stream:
+            self.stream.close()
+
+
+class PrometheusExporter:
+    """
+    Aggregates spans into counters in the Prometheus text exposition format.
+
+    Per span name it keeps the call count, wall time, errors and the sum of every numeric
+    attribute, e.g. `openinterview_prompt_tokens_total{span="generate_content"}`. Serve
+    `render()` from a metrics endpoint or `write()` it for node_exporter's textfile collector.
+
+    Example:
+    >>> exporter = PrometheusExporter()
+    >>> with enable_telemetry(exporter):
+    ...     with span("load_file_content") as s:
+    ...         s.add("bytes", 2048)
+    >>> print(exporter.render().splitlines()[-1])
+    openinterview_bytes_total{span="load_file_content"} 2048
+
+    Attributes:
+        namespace (str): The prefix of the metric names.
+    """
+
+    def __init__(self, namespace: str = "openinterview") -> None:
+        self.namespace = namespace
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                span.name, {"count": 0, "seconds": 0.0, "errors": 0}
+            )
+            metrics["count"] += 1
+            metrics["seconds"] += span.seconds or 0.0
+            metrics["errors"] += span.error is not None
+            for key, value in span.attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics[key] = metrics.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Returns the aggregated metrics per span name."""
+        with self._lock:
+            return {name: dict(metrics) for name, metrics in self._metrics.items()}
+
+    def render(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        series: Dict[str, List[str]] = {}
+        for name, metrics in sorted(snapshot.items()):
+            label = '{span="%s"}' % name.replace("\\", "\\\\").replace('"', '\\"')
+            for key, value in metrics.items():
+                if key == "count":
+                    metric = f"{self.namespace}_span_seconds_count"
+                elif key == "seconds":
+                    metric = f"{self.namespace}_span_seconds_sum"
+                elif key == "errors":
+                    metric = f"{self.namespace}_span_errors_total"
+                else:
+                    metric = f"{self.namespace}_{key}_total"
+                text = str(int(value)) if float(value).is_integer() else repr(value)
+                series.setdefault(metric, []).append(f"{metric}{label} {text}")
+        lines = []
+        summary_types = set()
+        for metric, samples in series.items():
+            if metric.endswith(("_seconds_count", "_seconds_sum")):
+                base = metric.rsplit("_", 1)[0]
+                if base not in summary_types:
+                    summary_types.add(base)
+                    lines.append(f"# TYPE {base} summary")
+            else:
+                lines.append(f"# TYPE {metric} counter")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically writes `render()` to a file, e.g. `metrics.prom` for the textfile collector."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+class Telemetry:
+    """
+    The instrumentation switch and the exporters spans are sent to.
+
+    While disabled, `span` returns a shared no-op span and instrumented functions call straight
+    through, so the instrumentation costs one attribute check per call.
+
+    Attributes:
+        enabled (bool): Whether spans are recorded.
+        exporters (List[Any]): Objects with `export(span)`, called as each span ends.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.exporters: List[Any] = []
+        self._lock = threading.Lock()
+
+    def enable(self, *exporters: Any) -> "Telemetry":
+        """Adds exporters and starts recording; usable as a context manager that disables it again."""
+        with self._lock:
+            self.exporters.extend(exporters)
+            self.enabled = True
+        return self
+
+    def disable(self) -> None:
+        """Stops recording and closes and removes the exporters."""
+        with self._lock:
+            self.enabled = False
+            exporters, self.exporters = self.exporters, []
+        for exporter in exporters:
+            close = getattr(exporter, "close", None)
+            if close is not None:
+                close()
+
+    def _export(self, span: Span) -> None:
+        for exporter in list(self.exporters):
+            exporter.export(span)
+
+    def __enter__(self) -> "Telemetry":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.disable()
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Returns the process-wide Telemetry."""
+    return _telemetry
+
+
+def enable_telemetry(*exporters: Any) -> Telemetry:
+    """
+    Starts recording spans into the given exporters, e.g. `JsonLogExporter()` and `PrometheusExporter()`.
+
+    Returns:
+        Telemetry: The process-wide Telemetry; use it as a context manager to disable it again.
+    """
+    return _telemetry.enable(*exporters)
+
+
+def disable_telemetry() -> None:
+    """Stops recording spans and closes the exporters."""
+    _telemetry.disable()
+
+
+def span(name: str, **attributes: Any) -> Union[Span, _NoopSpan]:
+    """
+    Returns a context manager timing an operation.
+
+    Expensive attributes such as token estimates should only be computed if `recording` is True.
+
+    Example:
+    >>> with span("generate_content", engine="GPT") as s:
+    ...     if s.recording:
+    ...         s.set("response_bytes", 123)
+    """
+    if not _telemetry.enabled:
+        return _NOOP_SPAN
+    return Span(_telemetry, name, attributes)
+
+
+def record_span(name: str, seconds: float, **attributes: Any) -> None:
+    """
+    Exports an operation timed by the caller, e.g. one that yields to its consumer, without
+    making it the current span.
+    """
+    if not _telemetry.enabled:
+        return
+    finished = Span(_telemetry, name, attributes)
+    current = _current_span.get()
+    finished.parent = current.name if current is not None else None
+    finished.started_at = time.time() - seconds
+    finished.seconds = seconds
+    _telemetry._export(finished)
+
+
+def add_to_span(key: str, amount: float = 1) -> None:
+    """Adds to a counter of the innermost open span, e.g. 'retries'; does nothing without one."""
+    if not _telemetry.enabled:
+        return
+    current = _current_span.get()
+    if current is not None:
+        current.add(key, amount)
+
+
+def instrument(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorates a function to run in a span named `name`, or the function's name.
+
+    Example:
+    >>> @instrument("create_qa_document")
+    ... def create_qa_document(qa_dict):
+    ...     return len(qa_dict)
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _telemetry.enabled:
+                return func(*args, **kwargs)
+            with Span(_telemetry, span_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
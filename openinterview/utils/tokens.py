@@ -0,0 +1,42 @@
+import re
+from typing import Dict, Iterable
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Chat APIs wrap every message with a few role/separator tokens.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text without calling a tokenizer.
+
+    The estimate takes the larger of a character-based count (about 4 characters per token)
+    and a word/punctuation count, which keeps it close to BPE tokenizers for both English
+    and non-Latin scripts.
+
+    Args:
+        text (str): The text to estimate.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, len(_TOKEN_PATTERN.findall(text)))
+
+
+def estimate_message_tokens(messages: Iterable[Dict[str, str]]) -> int:
+    """
+    Estimates the number of tokens of a chat message list.
+
+    Args:
+        messages (Iterable[Dict[str, str]]): Messages with 'role' and 'content' keys.
+
+    Returns:
+        int: The estimated number of tokens, including per-message overhead.
+    """
+    return sum(
+        MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.get("content") or "")
+        for message in messages
+    )
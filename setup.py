@@ -26,7 +26,7 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "openai==0.28",
-        "anthropic",
+        "anthropic<1",
         "python-docx",
         "utilfunction",
         "python-gemini-api",
@@ -36,6 +36,11 @@ setup(
         "PyPDF2",
         "pygame",
     ],
+    entry_points={
+        "console_scripts": [
+            "open-interview=openinterview.cli:main",
+        ]
+    },
     extras_require={
         "openaivoice": [
             "openai",
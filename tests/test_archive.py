@@ -0,0 +1,37 @@
+import pytest
+from openinterview.modules.voice.archive import AudioArchive
+
+CLIPS = {
+    "1a2b3c4d/question.mp3": b"\xff\xfb" + bytes(100),
+    "1a2b3c4d/answer.mp3": b"\xff\xfb" + bytes(200),
+}
+
+
+def write_archive(path):
+    with AudioArchive(path, "a") as archive:
+        for key, data in CLIPS.items():
+            archive.add(key, data)
+
+
+def corrupt_indexes(index):
+    """Yields index files cut short or with a key that is not UTF-8."""
+    yield index[:9]
+    yield index[: len(index) - 5]
+    key = b"1a2b3c4d/question.mp3"
+    yield index.replace(key, b"\xff" * len(key))
+
+
+@pytest.mark.parametrize("case", range(3))
+@pytest.mark.parametrize("mode", ["r", "a"])
+def test_corrupt_index_is_rebuilt(tmp_path, case, mode):
+    path = str(tmp_path / "voice.oiva")
+    write_archive(path)
+    with open(path + ".idx", "rb") as f:
+        index = f.read()
+    with open(path + ".idx", "wb") as f:
+        f.write(list(corrupt_indexes(index))[case])
+
+    with AudioArchive(path, mode) as archive:
+        assert sorted(archive.keys()) == sorted(CLIPS)
+        for key, data in CLIPS.items():
+            assert archive.read(key) == data
@@ -0,0 +1,269 @@
+import json
+import asyncio
+import contextlib
+from aiohttp import web
+from openinterview.models.async_claude import AsyncClaudeGenerator
+from openinterview.models.async_gpt import AsyncGptGenerator
+
+SYSTEM_PROMPT = "You are interviewing a candidate for a data engineer position."
+USER_PROMPT = "Ask two new questions."
+LATENCY = 0.05
+
+
+def response_text(n):
+    return (
+        f'{{"Q_{n:06x}1": "What is a data lake?", "A_{n:06x}1": "A store, {n}.",'
+        f' "Q_{n:06x}2": "Why Spark?", "A_{n:06x}2": "It scales, {n}."}}'
+    )
+
+
+def split_text(text, size=7):
+    """Cuts the text into deltas that end in the middle of keys and values."""
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+class MockServer:
+    """
+    A local aiohttp stand-in for the Chat Completions and Messages APIs.
+
+    Records the peak number of requests in flight and the client ports they came from,
+    which tells how many pooled connections were used.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.client_ports = set()
+        self.url = None
+        self._runner = None
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/v1/messages", self.messages)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._runner.cleanup()
+
+    @contextlib.asynccontextmanager
+    async def _request(self, request):
+        self.requests += 1
+        n = self.requests
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.client_ports.add(request.transport.get_extra_info("peername")[1])
+        try:
+            await asyncio.sleep(LATENCY)
+            yield n
+        finally:
+            self.in_flight -= 1
+
+    async def _stream(self, request, events):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for event in events:
+            await response.write(event.encode("utf-8"))
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    async def chat_completions(self, request):
+        body = await request.json()
+        async with self._request(request) as n:
+            text = response_text(n)
+            if not body.get("stream"):
+                return web.json_response(
+                    {
+                        "id": f"chatcmpl-{n}",
+                        "object": "chat.completion",
+                        "model": body["model"],
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": text},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    }
+                )
+            chunks = [{"role": "assistant"}] + [
+                {"content": delta} for delta in split_text(text)
+            ]
+            events = [
+                "data: "
+                + json.dumps(
+                    {
+                        "id": f"chatcmpl-{n}",
+                        "object": "chat.completion.chunk",
+                        "choices": [{"index": 0, "delta": delta}],
+                    }
+                )
+                + "\n\n"
+                for delta in chunks
+            ]
+            return await self._stream(request, events + ["data: [DONE]\n\n"])
+
+    async def messages(self, request):
+        body = await request.json()
+        async with self._request(request) as n:
+            text = response_text(n)
+            usage = {"input_tokens": 10, "output_tokens": 20}
+            message = {
+                "id": f"msg_{n}",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": usage,
+            }
+            if not body.get("stream"):
+                return web.json_response(message)
+
+            def event(name, data):
+                return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+            events = [
+                event(
+                    "message_start",
+                    {"type": "message_start", "message": {**message, "content": []}},
+                ),
+                event(
+                    "content_block_start",
+                    {
+                        "type": "content_block_start",
+                        "index": 0,
+                        "content_block": {"type": "text", "text": ""},
+                    },
+                ),
+            ]
+            events += [
+                event(
+                    "content_block_delta",
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {"type": "text_delta", "text": delta},
+                    },
+                )
+                for delta in split_text(text)
+            ]
+            events += [
+                event("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                event(
+                    "message_delta",
+                    {
+                        "type": "message_delta",
+                        "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                        "usage": {"output_tokens": 20},
+                    },
+                ),
+                event("message_stop", {"type": "message_stop"}),
+            ]
+            return await self._stream(request, events)
+
+
+def gpt_generator(server, **kwargs):
+    return AsyncGptGenerator(api_key="test", api_base=f"{server.url}/v1", **kwargs)
+
+
+def claude_generator(server, **kwargs):
+    return AsyncClaudeGenerator(api_key="test", base_url=server.url, **kwargs)
+
+
+def test_gpt_requests_in_flight_are_bounded(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            async with gpt_generator(server, max_concurrent_requests=2) as generator:
+                qa_dict = await generator.generate_interview_content(
+                    SYSTEM_PROMPT, USER_PROMPT, 6, str(tmp_path), max_concurrency=6
+                )
+            return server, qa_dict
+
+    server, qa_dict = asyncio.run(main())
+    assert server.requests == 6
+    assert server.peak_in_flight == 2
+    assert len(qa_dict) == 24
+
+
+def test_gpt_connection_pool_is_bounded_and_reused(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            async with gpt_generator(server, max_connections=2) as generator:
+                await generator.generate_interview_content(
+                    SYSTEM_PROMPT, USER_PROMPT, 6, str(tmp_path), max_concurrency=6
+                )
+            return server
+
+    server = asyncio.run(main())
+    assert server.requests == 6
+    assert server.peak_in_flight == 2
+    # Six requests over two kept-alive connections.
+    assert len(server.client_ports) == 2
+
+
+def test_gpt_stream_yields_pairs_split_across_deltas(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            async with gpt_generator(server) as generator:
+                return [
+                    pair
+                    async for pair in generator.aiter_interview_content(
+                        SYSTEM_PROMPT, USER_PROMPT, 2, str(tmp_path)
+                    )
+                ]
+
+    pairs = asyncio.run(main())
+    assert pairs == [
+        {"Q_0000011": "What is a data lake?", "A_0000011": "A store, 1."},
+        {"Q_0000012": "Why Spark?", "A_0000012": "It scales, 1."},
+        {"Q_0000021": "What is a data lake?", "A_0000021": "A store, 2."},
+        {"Q_0000022": "Why Spark?", "A_0000022": "It scales, 2."},
+    ]
+
+
+def test_claude_requests_in_flight_are_bounded(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            async with claude_generator(server, max_concurrent_requests=2) as generator:
+                qa_dict = await generator.generate_interview_content(
+                    SYSTEM_PROMPT, USER_PROMPT, 6, str(tmp_path), max_concurrency=6
+                )
+                usage = dict(generator.usage)
+            return server, qa_dict, usage
+
+    server, qa_dict, usage = asyncio.run(main())
+    assert server.requests == 6
+    assert server.peak_in_flight == 2
+    assert len(qa_dict) == 24
+    assert usage["requests"] == 6
+    assert usage["output_tokens"] == 120
+
+
+def test_claude_stream_yields_pairs_split_across_deltas(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            async with claude_generator(server) as generator:
+                pairs = [
+                    pair
+                    async for pair in generator.aiter_interview_content(
+                        SYSTEM_PROMPT, USER_PROMPT, 1, str(tmp_path)
+                    )
+                ]
+                return pairs, dict(generator.usage)
+
+    pairs, usage = asyncio.run(main())
+    assert pairs == [
+        {"Q_0000011": "What is a data lake?", "A_0000011": "A store, 1."},
+        {"Q_0000012": "Why Spark?", "A_0000012": "It scales, 1."},
+    ]
+    assert usage["requests"] == 1
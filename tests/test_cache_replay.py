@@ -0,0 +1,228 @@
+import time
+import random
+import asyncio
+import threading
+from types import SimpleNamespace
+import pytest
+from openinterview.models.async_gpt import AsyncGptGenerator
+from openinterview.models.claude import ClaudeGenerator
+from openinterview.models.gemini import GeminiGenerator
+from openinterview.models.gpt import GptGenerator
+from openinterview.utils.cache import CacheMissError, ResponseCache
+
+SYSTEM_PROMPT = "You are interviewing a candidate for a data engineer position."
+USER_PROMPT = "Ask five new questions."
+
+
+class StubChatCompletion:
+    """Answers every request with new questions after a random delay, like the API."""
+
+    def __init__(self, seed=0):
+        self.requests = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def create(self, model, messages, **kwargs):
+        with self._lock:
+            self.requests.append(messages)
+            n = len(self.requests)
+            delay = self._random.uniform(0, 0.02)
+        # Later requests often finish first, so turns complete out of order.
+        time.sleep(delay)
+        content = f'{{"Q_{n:06x}": "Question {n}?", "A_{n:06x}": "Answer {n}."}}'
+        return type(
+            "Response",
+            (),
+            {"choices": [type("Choice", (), {"message": {"content": content}})]},
+        )
+
+
+class OfflineChatCompletion:
+    def create(self, model, messages, **kwargs):
+        raise AssertionError("replay mode must not call the API")
+
+
+def make_generator(client, cache):
+    generator = GptGenerator(api_key="test", cache=cache)
+    generator.client = client
+    return generator
+
+
+class StubMessages:
+    """Answers Messages API requests with new questions, like `StubChatCompletion`."""
+
+    def __init__(self, completions):
+        self._completions = completions
+
+    def create(self, messages, **kwargs):
+        response = self._completions.create(kwargs.get("model"), messages)
+        text = response.choices[0].message["content"]
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=20),
+        )
+
+
+class StubGeminiSession:
+    """Answers generateContent requests with new questions, like `StubChatCompletion`."""
+
+    def __init__(self, completions):
+        self._completions = completions
+
+    def post(self, url, json=None, **kwargs):
+        response = self._completions.create(url, json["contents"])
+        text = response.choices[0].message["content"]
+        data = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: data)
+
+
+def make_gpt(completions, cache):
+    return make_generator(completions, cache)
+
+
+def make_claude(completions, cache):
+    generator = ClaudeGenerator(api_key="test", cache=cache)
+    generator.client = SimpleNamespace(messages=StubMessages(completions))
+    return generator
+
+
+def make_gemini(completions, cache):
+    generator = GeminiGenerator(api_key="test", cache=cache)
+    generator.session = StubGeminiSession(completions)
+    return generator
+
+
+@pytest.mark.parametrize("make_engine", [make_gpt, make_claude, make_gemini])
+def test_sequential_iterations_replay_from_cache(tmp_path, make_engine):
+    cache_dir = str(tmp_path / "responses")
+    completions = StubChatCompletion()
+    recorder = make_engine(completions, ResponseCache(cache_dir, mode="write"))
+    recorded = recorder.generate_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 4, str(tmp_path / "write")
+    )
+    # Claude sends the same request on every iteration; each is still recorded.
+    assert len(completions.requests) == 4
+    assert len(recorded) == 8
+    assert len(ResponseCache(cache_dir)) == 4
+
+    replayer = make_engine(
+        OfflineChatCompletion(), ResponseCache(cache_dir, mode="replay")
+    )
+    replayed = replayer.generate_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 4, str(tmp_path / "replay")
+    )
+    assert replayed == recorded
+
+
+def test_streamed_iterations_replay_from_cache(tmp_path):
+    cache_dir = str(tmp_path / "responses")
+    recorder = make_claude(StubChatCompletion(), ResponseCache(cache_dir, mode="write"))
+    recorded = recorder.generate_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 3, str(tmp_path / "write")
+    )
+
+    replayer = make_claude(
+        OfflineChatCompletion(), ResponseCache(cache_dir, mode="replay")
+    )
+    replayed = {}
+    for qa_pair in replayer.iter_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 3, str(tmp_path / "replay")
+    ):
+        replayed.update(qa_pair)
+    assert replayed == recorded
+
+
+def test_concurrent_iterations_replay_from_cache(tmp_path):
+    cache_dir = str(tmp_path / "responses")
+    recorder = make_generator(
+        StubChatCompletion(), ResponseCache(cache_dir, mode="write")
+    )
+    recorded = recorder.generate_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 6, str(tmp_path / "write"), max_workers=4
+    )
+    assert len(recorded) == 12
+
+    for max_workers in (4, 2, 6):
+        replayer = make_generator(
+            OfflineChatCompletion(), ResponseCache(cache_dir, mode="replay")
+        )
+        replayed = replayer.generate_interview_content(
+            SYSTEM_PROMPT,
+            USER_PROMPT,
+            6,
+            str(tmp_path / f"replay-{max_workers}"),
+            max_workers=max_workers,
+        )
+        assert replayed == recorded
+        assert replayer.history.messages == recorder.history.messages
+
+
+def test_concurrent_requests_do_not_see_each_other(tmp_path):
+    client = StubChatCompletion()
+    generator = make_generator(client, None)
+    qa_dict = generator.generate_interview_content(
+        SYSTEM_PROMPT, USER_PROMPT, 6, str(tmp_path), max_workers=4
+    )
+
+    assert len(client.requests) == 6
+    assert all(messages == client.requests[0] for messages in client.requests)
+    # Turns are added in iteration order once the batch is done.
+    questions = [key for key in qa_dict if key.startswith("Q_")]
+    assert generator.history.messages[-1]["role"] == "assistant"
+    assert questions[-1] in generator.history.messages[-1]["content"]
+    assert [entry.split(":")[0] for entry in generator.history.generated_questions] == (
+        questions[:4]
+    )
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_async_iterations_replay_from_cache(tmp_path, max_concurrency):
+    cache_dir = str(tmp_path / "responses")
+
+    def make_async_generator(client, mode):
+        generator = AsyncGptGenerator(
+            api_key="test", cache=ResponseCache(cache_dir, mode=mode)
+        )
+
+        async def acreate(messages, **kwargs):
+            await asyncio.sleep(0)
+            return client.create(generator.model, messages, **kwargs)
+
+        generator._acreate = acreate
+        return generator
+
+    async def run(generator, save_dir):
+        return await generator.generate_interview_content(
+            SYSTEM_PROMPT, USER_PROMPT, 6, save_dir, max_concurrency=max_concurrency
+        )
+
+    recorded = asyncio.run(
+        run(make_async_generator(StubChatCompletion(), "write"), str(tmp_path / "a"))
+    )
+    replayed = asyncio.run(
+        run(
+            make_async_generator(OfflineChatCompletion(), "replay"), str(tmp_path / "b")
+        )
+    )
+    assert len(recorded) == 12
+    assert replayed == recorded
+
+
+def test_replay_misses_unrecorded_requests(tmp_path):
+    replayer = make_generator(
+        OfflineChatCompletion(),
+        ResponseCache(str(tmp_path / "responses"), mode="replay"),
+    )
+    with pytest.raises(CacheMissError):
+        replayer.generate_content(SYSTEM_PROMPT, USER_PROMPT)
+
+
+def test_entries_without_a_creation_time_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses"), max_age=60)
+    key = cache.make_key(model="gpt-4", messages=[])
+    cache.set(key, "response")
+    with open(cache._path(key), "w", encoding="utf-8") as f:
+        f.write('{"response": "response"}')
+
+    assert cache.get(key) is None
+    assert cache.misses == 1
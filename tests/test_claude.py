@@ -0,0 +1,144 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from openinterview.models.claude import EPHEMERAL_CACHE_CONTROL, ClaudeGenerator
+
+RESUME_BLOCK = (
+    "Resume: five years of data engineering.\nJob description: platform engineer."
+)
+INSTRUCTION_BLOCK = "Create questions based on the candidate's experience."
+USER_PROMPT = "Ask one new question."
+PROMPT_TOKENS = 1200
+
+
+class MessagesStub(BaseHTTPRequestHandler):
+    """A local stub of the Messages API that reports prompt cache usage like the API."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append(body)
+            first = len(server.requests) == 1
+        n = len(server.requests)
+        payload = {
+            "id": f"msg_{n}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [
+                {
+                    "type": "text",
+                    "text": f'{{"Q_{n:06x}": "Q{n}?", "A_{n:06x}": "A{n}."}}',
+                }
+            ],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": 10,
+                "output_tokens": 20,
+                "cache_creation_input_tokens": PROMPT_TOKENS if first else 0,
+                "cache_read_input_tokens": 0 if first else PROMPT_TOKENS,
+            },
+        }
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def messages_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MessagesStub)
+    server.requests = []
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_generator(server, prompt_caching):
+    return ClaudeGenerator(
+        api_key="test",
+        prompt_caching=prompt_caching,
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+    )
+
+
+def test_prompt_caching_marks_system_blocks_and_last_message(messages_server):
+    generator = make_generator(messages_server, prompt_caching=True)
+    generator.generate_content([RESUME_BLOCK, INSTRUCTION_BLOCK], USER_PROMPT)
+
+    request = messages_server.requests[0]
+    assert request["system"] == [
+        {
+            "type": "text",
+            "text": RESUME_BLOCK,
+            "cache_control": EPHEMERAL_CACHE_CONTROL,
+        },
+        {
+            "type": "text",
+            "text": INSTRUCTION_BLOCK,
+            "cache_control": EPHEMERAL_CACHE_CONTROL,
+        },
+    ]
+    assert request["messages"] == [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": USER_PROMPT,
+                    "cache_control": EPHEMERAL_CACHE_CONTROL,
+                }
+            ],
+        }
+    ]
+    # The history keeps the plain message; only the request carries the breakpoint.
+    assert generator.messages == [{"role": "user", "content": USER_PROMPT}]
+
+
+def test_without_prompt_caching_sends_plain_prompts(messages_server):
+    generator = make_generator(messages_server, prompt_caching=False)
+    generator.generate_content(RESUME_BLOCK, USER_PROMPT)
+
+    request = messages_server.requests[0]
+    assert request["system"] == RESUME_BLOCK
+    assert request["messages"] == [{"role": "user", "content": USER_PROMPT}]
+
+
+def test_usage_is_accumulated_across_iterations(messages_server, tmp_path):
+    generator = make_generator(messages_server, prompt_caching=True)
+    qa_dict = generator.generate_interview_content(
+        [RESUME_BLOCK, INSTRUCTION_BLOCK], USER_PROMPT, 3, str(tmp_path)
+    )
+
+    assert len(qa_dict) == 6
+    assert generator.last_usage == {
+        "input_tokens": 10,
+        "output_tokens": 20,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": PROMPT_TOKENS,
+    }
+    assert generator.usage == {
+        "input_tokens": 30,
+        "output_tokens": 60,
+        "cache_creation_input_tokens": PROMPT_TOKENS,
+        "cache_read_input_tokens": 2 * PROMPT_TOKENS,
+        "requests": 3,
+    }
+    assert generator.cache_hit_rate == pytest.approx(2400 / 3630)
+
+
+def test_at_most_three_system_blocks_are_cached():
+    generator = ClaudeGenerator(api_key="test", prompt_caching=True)
+    with pytest.raises(ValueError):
+        generator._system_param(["a", "b", "c", "d"])
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import glob
+import threading
+from openinterview.models.base import GeneratorMixin
+from openinterview.utils.concurrency import iter_ordered
+
+
+class InFlight:
+    """Counts the calls running at once."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+class SlowFirstGenerator(GeneratorMixin):
+    """Answers each request with one pair; the first request finishes last."""
+
+    def __init__(self):
+        self.in_flight = InFlight()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, system_prompt, user_prompt="", stream=False):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        with self.in_flight:
+            time.sleep(0.1 if n == 0 else 0.01)
+        return f'{{"Q_{n:06x}": "Question {n}?", "A_{n:06x}": "Answer {n}."}}'
+
+
+def test_results_are_yielded_in_index_order_with_bounded_workers():
+    in_flight = InFlight()
+    finished = []
+
+    def call(i):
+        with in_flight:
+            time.sleep(0.05 if i == 0 else 0.01)
+        finished.append(i)
+        return i * i
+
+    results = list(iter_ordered(call, 8, max_workers=3))
+
+    assert results == [(i, i * i) for i in range(8)]
+    assert finished[0] != 0
+    assert 1 < in_flight.peak <= 3
+
+
+def test_closing_early_cancels_calls_that_have_not_started():
+    started = []
+
+    def call(i):
+        started.append(i)
+        time.sleep(0.02)
+        return i
+
+    results = iter_ordered(call, 20, max_workers=2)
+    assert next(results) == (0, 0)
+    results.close()
+
+    assert len(started) < 20
+
+
+def test_concurrent_iterations_merge_in_iteration_order(tmp_path):
+    generator = SlowFirstGenerator()
+    qa_dict = generator.generate_interview_content(
+        "system", "user", 6, str(tmp_path), max_workers=4
+    )
+
+    assert 1 < generator.in_flight.peak <= 4
+    batches = {}
+    for path in glob.glob(os.path.join(tmp_path, "cached", "batch_output_*.json")):
+        i = int(os.path.basename(path).split("_")[2])
+        with open(path, encoding="utf-8") as f:
+            batches[i] = json.load(f)
+    assert sorted(batches) == list(range(6))
+    merged = {}
+    for i in range(6):
+        merged.update(batches[i])
+    assert list(qa_dict.items()) == list(merged.items())
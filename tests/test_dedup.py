@@ -0,0 +1,71 @@
+import pytest
+from openinterview.utils.dedup import QuestionDeduplicator, dedup_batches
+
+REWORDED = [
+    (
+        "How did you scale the data pipeline at your last job?",
+        "How did you scale the data pipeline in your last job?",
+    ),
+    (
+        "Can you describe a time when you optimized a slow SQL query?",
+        "Describe a time you optimized a slow SQL query.",
+    ),
+    (
+        "What is the difference between a data lake and a data warehouse?",
+        "What's the difference between a data warehouse and a data lake?",
+    ),
+]
+
+SHARED_PHRASING = [
+    (
+        "Tell me about a project where you used Apache Spark.",
+        "Tell me about a project where you missed a deadline.",
+    ),
+    (
+        "Can you describe a time when you optimized a slow SQL query?",
+        "Can you describe a time when you resolved a conflict with a teammate?",
+    ),
+    (
+        "What is the difference between a data lake and a data warehouse?",
+        "What is the difference between batch and stream processing?",
+    ),
+    (
+        "How did you scale the data pipeline at your last job?",
+        "How did you handle on-call incidents at your last job?",
+    ),
+]
+
+
+@pytest.mark.parametrize("question, rewording", REWORDED)
+def test_reworded_questions_are_duplicates(question, rewording):
+    dedup = QuestionDeduplicator()
+    assert dedup.add(question)
+    assert dedup.find_duplicate(rewording) == question
+    assert not dedup.add(rewording)
+
+
+@pytest.mark.parametrize("question, other", SHARED_PHRASING)
+def test_distinct_questions_sharing_phrasing_are_kept(question, other):
+    dedup = QuestionDeduplicator()
+    assert dedup.add(question)
+    assert dedup.add(other)
+    assert dedup.questions == [question, other]
+
+
+def test_batches_are_filtered_in_order_and_stop_on_low_novelty():
+    first, rewording = REWORDED[0]
+    batches = [
+        (0, {"Q_1": first, "A_1": "a", "Q_2": SHARED_PHRASING[0][0], "A_2": "b"}),
+        (1, {"Q_3": rewording, "A_3": "c", "Q_4": SHARED_PHRASING[0][1], "A_4": "d"}),
+        (2, {"Q_5": rewording, "A_5": "e", "Q_6": first, "A_6": "f"}),
+        (3, {"Q_7": "Why Kafka?", "A_7": "g"}),
+    ]
+    dedup = QuestionDeduplicator()
+    kept = list(dedup_batches(batches, dedup, min_novelty=0.5))
+
+    assert kept == [
+        batches[0],
+        (1, {"Q_4": SHARED_PHRASING[0][1], "A_4": "d"}),
+        (2, {}),
+    ]
+    assert [stats["novelty"] for stats in dedup.stats] == [1.0, 0.5, 0.0]
@@ -0,0 +1,62 @@
+from docx import Document
+from docx.oxml.shared import qn
+from openinterview.utils.doc_manager import DocumentCreator
+
+QA_DICT = {
+    "Q_1a2b": "Why Spark?",
+    "A_1a2b": "It scales,\nand it is fast.",
+    "Q_3c4d": "What is idempotency?",
+    "A_5e6f": "An answer without a question.",
+    "A_3c4d": "Running it twice changes nothing.",
+}
+CELLS = [
+    ("Q: Why Spark?", "A: It scales,\nand it is fast."),
+    ("Q: What is idempotency?", "A: Running it twice changes nothing."),
+    ("Q: No question provided.", "A: An answer without a question."),
+]
+
+
+def table_texts(doc):
+    return [tuple(row.cells[0].text for row in table.rows) for table in doc.tables]
+
+
+def test_pairs_are_rendered_in_order_from_the_template(tmp_path):
+    creator = DocumentCreator()
+    path = creator.create_qa_document(QA_DICT, "Arial", None, str(tmp_path))
+    doc = Document(path)
+
+    assert table_texts(doc) == CELLS
+    # The section properties stay the last element of the body.
+    assert doc.element.body[-1].tag == qn("w:sectPr")
+
+
+def test_every_table_keeps_the_template_style(tmp_path):
+    creator = DocumentCreator()
+    creator.begin_document("Arial", None)
+    creator.add_qa_pairs(QA_DICT)
+    tables = creator.doc.tables
+
+    assert len({id(table._tbl) for table in tables}) == len(CELLS)
+    for table in tables:
+        q_cell, a_cell = (row.cells[0] for row in table.rows)
+        assert table.style.name == "Table Grid"
+        assert table._tbl.tblPr.find(qn("w:tblBorders")) is not None
+        assert table._tbl.tblPr.find(qn("w:tblCellMar")) is not None
+        shading = q_cell._tc.tcPr.findall(qn("w:shd"))
+        assert [shd.get(qn("w:fill")) for shd in shading] == ["000000"]
+        assert a_cell._tc.tcPr is None or a_cell._tc.tcPr.find(qn("w:shd")) is None
+        q_run = q_cell.paragraphs[0].runs[0]
+        assert str(q_run.font.color.rgb) == "FFFFFF"
+        assert q_run.font.size.pt == 12
+        assert a_cell.paragraphs[0].runs[0].font.size.pt == 12
+
+
+def test_a_creator_can_render_several_documents(tmp_path):
+    creator = DocumentCreator()
+    first = creator.create_qa_document(QA_DICT, "Arial", None, str(tmp_path / "a"))
+    second = creator.create_qa_document(
+        {"Q_1": "Why?", "A_1": "Because."}, "Arial", None, str(tmp_path / "b")
+    )
+
+    assert table_texts(Document(first)) == CELLS
+    assert table_texts(Document(second)) == [("Q: Why?", "A: Because.")]
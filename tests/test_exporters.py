@@ -0,0 +1,23 @@
+import json
+import pytest
+from openinterview.utils.exporters import JsonlExporter, QAExporter
+
+
+def test_exporter_without_write_pair_cannot_be_created(tmp_path):
+    class CsvExporter(QAExporter):
+        extension = "csv"
+
+    with pytest.raises(TypeError):
+        CsvExporter(str(tmp_path))
+
+
+def test_jsonl_exporter_writes_pairs(tmp_path):
+    path = JsonlExporter(str(tmp_path), "qa.jsonl").export(
+        {"Q_1": "Why?", "A_1": "Because.", "Q_2": "How?"}
+    )
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records == [
+        {"id": "1", "question": "Why?", "answer": "Because."},
+        {"id": "2", "question": "How?", "answer": None},
+    ]
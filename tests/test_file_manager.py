@@ -0,0 +1,87 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from PyPDF2 import PdfWriter
+from openinterview.utils import file_manager
+from openinterview.utils.file_manager import load_file_content
+
+
+def write_pdf(path, pages=2):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_entries_cached_before_form_feed_pages_are_not_reused(tmp_path):
+    pdf_path = str(tmp_path / "resume.pdf")
+    cache_dir = str(tmp_path / "cache")
+    write_pdf(pdf_path)
+    # An entry in the earlier key format, whose text had pages joined by spaces.
+    stat = os.stat(pdf_path)
+    raw = f"{os.path.abspath(pdf_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    old_key = "stat:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    os.makedirs(cache_dir)
+    with open(os.path.join(cache_dir, old_key.replace(":", "_") + ".json"), "w") as f:
+        json.dump({"key": old_key, "text": "page one page two"}, f)
+
+    assert load_file_content(pdf_path, cache_dir=cache_dir) == "\f"
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def count_extractions(monkeypatch):
+    calls = []
+    extract = file_manager._extract_pdf_text
+
+    def counting_extract(file_path, *args):
+        calls.append(file_path)
+        return extract(file_path, *args)
+
+    monkeypatch.setattr(file_manager, "_extract_pdf_text", counting_extract)
+    return calls
+
+
+def test_changed_file_is_extracted_again(tmp_path, monkeypatch):
+    calls = count_extractions(monkeypatch)
+    pdf_path = str(tmp_path / "resume.pdf")
+    write_pdf(pdf_path, pages=2)
+    assert load_file_content(pdf_path) == "\f"
+    assert load_file_content(pdf_path) == "\f"
+    assert len(calls) == 1
+
+    write_pdf(pdf_path, pages=3)
+    assert load_file_content(pdf_path) == "\f\f"
+    assert len(calls) == 2
+
+
+def test_disk_cache_is_reused_across_processes(tmp_path, monkeypatch):
+    calls = count_extractions(monkeypatch)
+    pdf_path = str(tmp_path / "resume.pdf")
+    cache_dir = str(tmp_path / "cache")
+    write_pdf(pdf_path, pages=2)
+    for hash_content in (False, True):
+        load_file_content(pdf_path, cache_dir=cache_dir, hash_content=hash_content)
+        # A new process starts with an empty memory cache.
+        monkeypatch.setattr(file_manager, "_memory_cache", OrderedDict())
+        assert (
+            load_file_content(pdf_path, cache_dir=cache_dir, hash_content=hash_content)
+            == "\f"
+        )
+    assert len(calls) == 2
+
+    write_pdf(pdf_path, pages=4)
+    monkeypatch.setattr(file_manager, "_memory_cache", OrderedDict())
+    assert load_file_content(pdf_path, cache_dir=cache_dir, hash_content=True) == (
+        "\f\f\f"
+    )
+    assert len(calls) == 3
+
+
+def test_pages_extracted_in_parallel_keep_their_order(tmp_path):
+    pdf_path = str(tmp_path / "long.pdf")
+    write_pdf(pdf_path, pages=6)
+    assert load_file_content(
+        pdf_path, max_workers=3, min_pages_per_worker=2
+    ) == "\f".join([""] * 6)
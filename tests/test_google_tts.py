@@ -0,0 +1,76 @@
+import os
+import time
+import threading
+import pytest
+from gtts import gTTS
+from openinterview.modules.voice.archive import AudioArchive
+from openinterview.modules.voice.google import google_tts_bytes, save_google_tts
+
+AUDIO = b"\xff\xfb\x90\xc4" + bytes(60)
+
+QA_DICT = {
+    "Q_1a2b": "Tell me about yourself.",
+    "A_1a2b": "I build data platforms.",
+    "Q_3c4d": "Why this team?",
+    "A_3c4d": "I like the product.",
+}
+
+
+class FakeWriteToFp:
+    """Stands in for `gTTS.write_to_fp` and records how many clips were fetched at once."""
+
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.texts = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, tts, fp):
+        with self._lock:
+            self.texts.append(tts.text)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        fp.write(AUDIO + tts.text.encode("utf-8"))
+
+
+@pytest.fixture
+def write_to_fp(monkeypatch):
+    fake = FakeWriteToFp()
+    monkeypatch.setattr(gTTS, "write_to_fp", lambda tts, fp: fake(tts, fp))
+    return fake
+
+
+def test_google_tts_bytes_uses_write_to_fp(write_to_fp):
+    data = google_tts_bytes("Tell me about yourself.", lang="ko")
+    assert data == AUDIO + b"Tell me about yourself."
+    assert write_to_fp.texts == ["Tell me about yourself."]
+
+
+def test_clips_are_synthesized_concurrently_to_their_own_files(tmp_path, write_to_fp):
+    save_google_tts(QA_DICT, str(tmp_path), max_workers=4)
+
+    assert write_to_fp.peak_in_flight > 1
+    assert sorted(os.listdir(tmp_path)) == ["1a2b", "3c4d"]
+    for hex_code in ("1a2b", "3c4d"):
+        assert sorted(os.listdir(tmp_path / hex_code)) == ["answer.mp3", "question.mp3"]
+    with open(tmp_path / "3c4d" / "question.mp3", "rb") as f:
+        assert f.read() == AUDIO + b"Why this team?"
+
+
+def test_clips_are_appended_to_the_archive_in_key_order(tmp_path, write_to_fp):
+    path = str(tmp_path / "voice.oiva")
+    with AudioArchive(path, "a") as archive:
+        save_google_tts(QA_DICT, str(tmp_path), max_workers=4, archive=archive)
+
+    with AudioArchive(path) as archive:
+        assert archive.keys() == [
+            "1a2b/question.mp3",
+            "1a2b/answer.mp3",
+            "3c4d/question.mp3",
+            "3c4d/answer.mp3",
+        ]
+        assert archive.read("1a2b/answer.mp3") == AUDIO + b"I build data platforms."
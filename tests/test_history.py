@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from openinterview.models.gpt import GptGenerator
+from openinterview.utils.history import ConversationHistory
+
+SYSTEM_PROMPT = "You are interviewing a candidate for a data engineer position. " * 20
+USER_PROMPT = "Ask three new questions."
+
+
+def response_text(n):
+    return (
+        "{"
+        + ", ".join(
+            f'"Q_{n:04x}{k}": "What did you learn from migration {n}, step {k}?",'
+            f' "A_{n:04x}{k}": "{"I kept the pipeline running while moving it. " * 8}"'
+            for k in range(3)
+        )
+        + "}"
+    )
+
+
+class StubChatCompletion:
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model, messages, **kwargs):
+        self.requests.append(messages)
+        content = response_text(len(self.requests))
+        return SimpleNamespace(choices=[SimpleNamespace(message={"content": content})])
+
+
+def test_request_tokens_stay_flat_across_iterations(tmp_path):
+    history = ConversationHistory(max_tokens=1500, max_turns=None)
+    generator = GptGenerator(api_key="test", history=history)
+    generator.client = StubChatCompletion()
+    generator.generate_interview_content(SYSTEM_PROMPT, USER_PROMPT, 30, str(tmp_path))
+
+    tokens = generator.request_tokens
+    assert len(tokens) == 30
+    assert max(tokens) <= 1500
+    # Once the list of earlier questions is full, every request has the same size.
+    assert max(tokens[-10:]) - min(tokens[-10:]) < 20
+
+    # The questions of dropped turns are still sent, newest last.
+    summary = generator.client.requests[-1][1]["content"]
+    assert summary.startswith("Questions already generated")
+    assert "Q_001b2: What did you learn from migration 27, step 2?" in summary
+    assert summary.count("\n- ") == len(history.generated_questions) > 20
+
+
+def test_messages_does_not_change_the_history():
+    history = ConversationHistory(max_tokens=400, max_turns=None)
+    history.add("system", "Interview a data engineer.")
+    for n in range(1, 4):
+        history.add("user", USER_PROMPT)
+        history.add("assistant", response_text(n))
+    turns = list(history.turns)
+    questions = list(history.generated_questions)
+
+    assert history.messages == history.messages
+    assert history.turns == turns
+    assert history.generated_questions == questions
+
+
+def test_add_keeps_max_turns_exchanges_and_the_pending_message():
+    history = ConversationHistory(max_turns=1)
+    history.add("system", "Interview a data engineer.")
+    for n in range(1, 4):
+        history.add("user", USER_PROMPT)
+        history.add("assistant", response_text(n))
+    history.add("user", USER_PROMPT)
+
+    assert [message["role"] for message in history.messages] == [
+        "system",
+        "user",
+        "user",
+        "assistant",
+        "user",
+    ]
+    assert len(history.generated_questions) == 6
+    assert history.generated_questions[0].startswith("Q_00010: ")
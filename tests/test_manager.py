@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from openinterview.manager import InterviewManager
+from openinterview.models.mock import AsyncMockGenerator, MockGenerator
+from openinterview.modules.voice.archive import AudioArchive
+from openinterview.modules.voice.mock import MockSpeechClient
+
+# The second iteration repeats Q_1/A_1 with new text.
+RESPONSES = [
+    '{"Q_1": "What is a data lake?", "A_1": "A raw data store."}',
+    '{"Q_1": "What is a warehouse?", "A_1": "A modeled store.", "Q_2": "Why Spark?", "A_2": "It scales."}',
+]
+
+
+FIRST_VALUES = {
+    "Q_1": "What is a data lake?",
+    "A_1": "A raw data store.",
+    "Q_2": "Why Spark?",
+    "A_2": "It scales.",
+}
+
+
+def generate_interview(tmp_path, **options):
+    jd = tmp_path / "jd.txt"
+    resume = tmp_path / "resume.txt"
+    jd.write_text("Data engineer. Builds pipelines with Spark.", encoding="utf-8")
+    resume.write_text("Five years of data engineering.", encoding="utf-8")
+    manager = InterviewManager(
+        api_key=None,
+        engine=MockGenerator(responses=RESPONSES),
+        speech_client=MockSpeechClient(),
+    )
+    return manager.generate_interview(
+        str(jd),
+        str(resume),
+        "Data Engineer",
+        "techQAs",
+        output_dir=str(tmp_path / "output"),
+        iteration=2,
+        **options,
+    )
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_repeated_keys_keep_their_first_value(tmp_path, pipeline):
+    assert generate_interview(tmp_path, pipeline=pipeline) == FIRST_VALUES
+
+
+def test_generators_keep_the_first_value_of_repeated_keys(tmp_path):
+    # Before pipelining, generate_interview_content let the last value win.
+    qa_dict = MockGenerator(responses=RESPONSES).generate_interview_content(
+        "system", "user", 2, str(tmp_path / "sync"), max_workers=2
+    )
+    async_qa_dict = asyncio.run(
+        AsyncMockGenerator(responses=RESPONSES).generate_interview_content(
+            "system", "user", 2, str(tmp_path / "async")
+        )
+    )
+    assert qa_dict == async_qa_dict == FIRST_VALUES
+
+
+def test_pipelined_audio_archive_is_closed_once(tmp_path, monkeypatch):
+    closes = []
+    close = AudioArchive.close
+
+    def counting_close(archive):
+        closes.append(archive.path)
+        close(archive)
+
+    monkeypatch.setattr(AudioArchive, "close", counting_close)
+    generate_interview(tmp_path, pipeline=True, audio_archive=True)
+
+    assert len(closes) == 1
+    with AudioArchive(closes[0]) as archive:
+        assert sorted(archive.keys()) == [
+            "1/answer.mp3",
+            "1/question.mp3",
+            "2/answer.mp3",
+            "2/question.mp3",
+        ]
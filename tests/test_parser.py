@@ -0,0 +1,112 @@
+import pytest
+from openinterview.models.mock import MockGenerator
+from openinterview.utils.parser import QAStreamParser, iter_qa_pairs, parse_qa_response
+
+RESPONSE = (
+    "Here are the questions:\n```python\n{\n"
+    '    "Q_1a2b": "What is \\"idempotency\\"?",\n'
+    "    \"A_1a2b\": 'Running it twice changes nothing, {so} retries are safe.',\n"
+    '    "Q_3c4d": "Why Spark?", "A_3c4d": "It scales,\\nand it is fast."\n'
+    "}\n```"
+)
+PAIRS = [
+    {
+        "Q_1a2b": 'What is "idempotency"?',
+        "A_1a2b": "Running it twice changes nothing, {so} retries are safe.",
+    },
+    {"Q_3c4d": "Why Spark?", "A_3c4d": "It scales,\nand it is fast."},
+]
+
+
+def split_text(text, size):
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(RESPONSE)])
+def test_pairs_are_the_same_for_any_chunking(size):
+    assert list(iter_qa_pairs(split_text(RESPONSE, size))) == PAIRS
+
+
+def test_pair_is_yielded_once_its_answer_has_arrived():
+    parser = QAStreamParser()
+    cut = RESPONSE.index("retries") + len("retries")
+    assert parser.feed(RESPONSE[:cut]) == []
+    assert parser.feed(RESPONSE[cut : RESPONSE.index('"Q_3c4d"')]) == PAIRS[:1]
+    assert parser.feed(RESPONSE[RESPONSE.index('"Q_3c4d"') :]) == PAIRS[1:]
+    assert parser.close() == ([], {})
+    assert parser.text == RESPONSE
+
+
+def test_answers_may_arrive_before_questions_and_unpaired_entries_are_left_over():
+    parser = QAStreamParser()
+    pairs = parser.feed('{"A_1": "Because.", "Q_2": "How?", "Q_1": "Why?"}')
+    assert pairs == [{"Q_1": "Why?", "A_1": "Because."}]
+    assert parser.close() == ([], {"Q_2": "How?"})
+
+
+def test_streamed_pairs_match_the_parsed_response(tmp_path):
+    streamed = MockGenerator(pairs_per_response=4)
+    pairs = list(streamed.iter_interview_content("system", "user", 2, str(tmp_path)))
+    parsed = MockGenerator(pairs_per_response=4).generate_interview_content(
+        "system", "user", 2, str(tmp_path / "parsed")
+    )
+
+    assert len(pairs) == 8
+    assert all(len(pair) == 2 for pair in pairs)
+    merged = {}
+    for pair in pairs:
+        merged.update(pair)
+    assert merged == parsed
+    assert parse_qa_response(RESPONSE) == {**PAIRS[0], **PAIRS[1]}
+
+
+@pytest.mark.parametrize(
+    "response_text, expected",
+    [
+        ("", {}),
+        (None, {}),
+        ("I cannot help with that.", {}),
+        ('["Q_1", "A_1"]', {}),
+        ("{" * 5000 + "}" * 5000, {}),
+        # A missing comma and a truncated last entry.
+        (
+            '{"Q_1": "Why?" "A_1": "Because.", "Q_2": "Trunc',
+            {"Q_1": "Why?", "A_1": "Because."},
+        ),
+        # Python literals with escapes, and JSON literals.
+        (
+            "{'Q_1': 'It\\'s\\tfine?', 'A_1': 'Yes.'}",
+            {"Q_1": "It's\tfine?", "A_1": "Yes."},
+        ),
+        (
+            '{"Q_1": "Why?", "A_1": "Because.", "done": true}',
+            {"Q_1": "Why?", "A_1": "Because.", "done": True},
+        ),
+    ],
+)
+def test_malformed_responses_are_parsed_leniently(response_text, expected):
+    assert parse_qa_response(response_text) == expected
+
+
+def test_responses_are_never_executed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    payload = "__import__('pathlib').Path('executed').touch()"
+    for response_text in (
+        f"{{'Q_1': {payload}, 'A_1': 'Because.'}}",
+        f"{{'Q_1': 'Why?', 'A_1': 'Because.', **{payload}}}",
+        f"({payload}, {{'Q_1': 'Why?'}})",
+    ):
+        parse_qa_response(response_text)
+        list(iter_qa_pairs([response_text]))
+    assert not (tmp_path / "executed").exists()
+
+
+def test_unparsed_responses_are_kept_for_inspection(tmp_path):
+    generator = MockGenerator(responses=["Sorry, here is a list instead: 1. Why?"])
+    qa_dict = generator.generate_interview_content("system", "user", 1, str(tmp_path))
+
+    assert qa_dict == {}
+    unparsed = list((tmp_path / "cached").glob("batch_output_0_*_unparsed.txt"))
+    assert [path.read_text(encoding="utf-8") for path in unparsed] == [
+        "Sorry, here is a list instead: 1. Why?"
+    ]
@@ -0,0 +1,65 @@
+import sys
+import subprocess
+from openinterview.models.gpt import GptGenerator
+from openinterview.models.registry import prompt_budget
+from openinterview.utils.prompter import build_system_prompt, normalize_document_text
+from openinterview.utils.tokens import estimate_tokens
+
+
+def test_plain_text_keeps_numbers_and_first_and_last_lines():
+    text = "Jane Doe\nExperience\n2019\nBuilt pipelines\nPage 2\n12"
+    assert normalize_document_text(text) == text
+
+
+def test_pages_drop_page_numbers_and_repeated_headers():
+    pages = [
+        "Jane Doe - Resume\nBuilt data pipelines\nPage 1 of 3",
+        "Jane Doe - Resume\nLed a team of four\nPage 2 of 3",
+        "Jane Doe - Resume\nMentored interns\n3",
+    ]
+    assert normalize_document_text("\f".join(pages)) == (
+        "Jane Doe - Resume\nBuilt data pipelines\nLed a team of four\nMentored interns"
+    )
+
+
+def test_only_lowercase_continuations_are_joined():
+    text = "Built data pipe-\nlines in Zü-\nrich with Data-\nDriven tests on Java-\n8"
+    assert normalize_document_text(text) == (
+        "Built data pipelines in Zürich with Data-\nDriven tests on Java-\n8"
+    )
+
+
+def test_documents_are_cut_to_the_budget_in_priority_order():
+    prompt = build_system_prompt(
+        "Jane Doe\n" + "Python " * 2000,
+        "Senior Engineer\n" + "Spark " * 2000,
+        max_tokens=1500,
+    )
+    assert prompt.budget == 1500
+    assert prompt.tokens <= 1500 < prompt.original_tokens
+    assert prompt.truncated == ("jd", "candidate_resume")
+    assert estimate_tokens(prompt.text) == prompt.tokens
+
+
+def test_engines_pass_the_budget_of_their_model():
+    resume = "Jane Doe\n" + "Python " * 4000
+    budget = prompt_budget("gpt-4")
+    text = GptGenerator.create_system_prompt(
+        "Data engineer", candidate_resume=resume, model="gpt-4"
+    )
+    assert estimate_tokens(text) <= budget
+    unbounded = GptGenerator.create_system_prompt(
+        "Data engineer", candidate_resume=resume
+    )
+    assert estimate_tokens(unbounded) > budget
+
+
+def test_prompter_does_not_import_the_engine_registry():
+    code = (
+        "import sys, openinterview.utils.prompter; "
+        "print('openinterview.models.registry' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
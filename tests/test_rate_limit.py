@@ -0,0 +1,131 @@
+import random
+import asyncio
+from types import SimpleNamespace
+import pytest
+from openinterview.utils.rate_limit import FakeClock, RateLimiter, RetryPolicy
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class FailingCall:
+    """Raises the given errors in turn, then returns 'ok'; records when it was called."""
+
+    def __init__(self, clock, *errors):
+        self.clock = clock
+        self.errors = list(errors)
+        self.times = []
+
+    def __call__(self):
+        self.times.append(self.clock.monotonic())
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def make_limiter(**policy):
+    clock = FakeClock()
+    limiter = RateLimiter(retry_policy=RetryPolicy(jitter=False, **policy), clock=clock)
+    return limiter, clock
+
+
+@pytest.mark.parametrize(
+    "headers, delay",
+    [({"Retry-After": "5"}, 5.0), ({"retry-after-ms": "1500"}, 1.5)],
+)
+def test_retry_after_is_waited_before_the_retry(headers, delay):
+    limiter, clock = make_limiter(base_delay=60.0, max_delay=120.0)
+    call = FailingCall(clock, APIStatusError(429, headers))
+
+    assert limiter.call(call) == "ok"
+    assert call.times == [0.0, delay]
+    assert limiter.retries == 1
+
+
+def test_retry_after_is_capped_at_the_maximum_delay():
+    limiter, clock = make_limiter(max_delay=10.0)
+    call = FailingCall(clock, APIStatusError(429, {"Retry-After": "3600"}))
+
+    assert limiter.call(call) == "ok"
+    assert call.times == [0.0, 10.0]
+
+
+def test_backoff_doubles_up_to_the_maximum_delay():
+    limiter, clock = make_limiter(max_retries=4, base_delay=1.0, max_delay=5.0)
+    call = FailingCall(clock, *(APIStatusError(500) for _ in range(4)))
+
+    assert limiter.call(call) == "ok"
+    assert clock.sleeps == [1.0, 2.0, 4.0, 5.0]
+    assert call.times == [0.0, 1.0, 3.0, 7.0, 12.0]
+
+
+def test_jittered_backoff_stays_below_the_ceiling():
+    clock = FakeClock()
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, rng=random.Random(7))
+    limiter = RateLimiter(retry_policy=policy, clock=clock)
+    call = FailingCall(clock, *(APIStatusError(429) for _ in range(3)))
+
+    assert limiter.call(call) == "ok"
+    assert len(clock.sleeps) == 3
+    assert all(0 <= s <= 2**n for n, s in enumerate(clock.sleeps))
+
+
+def test_the_last_error_is_raised_when_retries_are_exhausted():
+    limiter, clock = make_limiter(max_retries=2, base_delay=1.0)
+    call = FailingCall(clock, *(APIStatusError(429) for _ in range(3)))
+
+    with pytest.raises(APIStatusError, match="HTTP 429"):
+        limiter.call(call)
+    assert len(call.times) == 3
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    limiter, clock = make_limiter()
+    call = FailingCall(clock, APIStatusError(400, {"Retry-After": "5"}), ValueError())
+
+    with pytest.raises(APIStatusError, match="HTTP 400"):
+        limiter.call(call)
+    with pytest.raises(ValueError):
+        limiter.call(call)
+    assert clock.sleeps == []
+    assert limiter.retries == 0
+
+
+def test_async_calls_back_off_on_the_same_clock():
+    limiter, clock = make_limiter(base_delay=2.0)
+    call = FailingCall(
+        clock, APIStatusError(529), APIStatusError(429, {"Retry-After": "1"})
+    )
+
+    async def acall():
+        return call()
+
+    assert asyncio.run(limiter.acall(acall)) == "ok"
+    assert call.times == [0.0, 2.0, 3.0]
+
+
+def test_request_budget_spaces_calls_after_the_burst():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, clock=clock)
+
+    for _ in range(60):
+        limiter.call(lambda: None)
+    assert clock.now == 0.0
+    limiter.call(lambda: None)
+    limiter.call(lambda: None)
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+
+
+def test_token_budget_waits_for_the_estimated_tokens():
+    clock = FakeClock()
+    limiter = RateLimiter(tokens_per_minute=600, clock=clock)
+
+    limiter.call(lambda: None, tokens=600)
+    limiter.call(lambda: None)
+    assert clock.now == 0.0
+    limiter.call(lambda: None, tokens=20)
+    assert clock.now == pytest.approx(2.0)
@@ -0,0 +1,74 @@
+import warnings
+import pytest
+from openinterview.manager import AsyncInterviewManager, InterviewManager
+from openinterview.models.mock import MockGenerator
+from openinterview.models.registry import create_generator
+from openinterview.models.router import EngineRouter
+
+BASE_URL = "http://127.0.0.1:8080"
+RESPONSE = '{"Q_1": "Why Spark?", "A_1": "It scales."}'
+
+
+def test_unsupported_options_are_dropped_with_a_warning():
+    with pytest.warns(UserWarning, match="'GPT' does not support prompt_caching"):
+        generator = create_generator("GPT", api_key="test", prompt_caching=True)
+    assert not hasattr(generator, "prompt_caching")
+
+
+def test_unset_options_do_not_warn():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        generator = create_generator("Mock", cache=None, prompt_caching=None)
+    assert isinstance(generator, MockGenerator)
+
+
+def test_base_url_is_passed_as_api_base_to_the_openai_generator():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        gpt = create_generator(
+            "GPT", api_key="test", asynchronous=True, base_url=BASE_URL
+        )
+        claude = create_generator(
+            "Claude", api_key="test", asynchronous=True, base_url=BASE_URL
+        )
+    assert gpt.api_base == BASE_URL
+    assert str(claude.client.base_url).rstrip("/") == BASE_URL
+
+
+@pytest.mark.parametrize("engine", ["GPT", "Claude", "Mock"])
+def test_managers_pass_only_supported_options(engine):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        InterviewManager(api_key="test", engine=engine)
+        manager = AsyncInterviewManager(api_key="test", engine=engine)
+    if engine == "GPT":
+        assert manager.interviewer.api_base is None
+
+
+def test_router_drops_options_per_engine():
+    with pytest.warns(UserWarning) as record:
+        router = EngineRouter.from_engines(
+            ["Claude", "GPT"],
+            api_key={"Claude": "claude-key", "GPT": "gpt-key"},
+            policy="failover",
+            prompt_caching=True,
+        )
+    assert [str(warning.message) for warning in record] == [
+        "Engine 'GPT' does not support prompt_caching; ignored."
+    ]
+    assert router.engines["Claude"].prompt_caching
+    assert router.engines["Claude"].api_key == "claude-key"
+    assert router.engines["GPT"].api_key == "gpt-key"
+
+
+def test_router_fails_over_to_the_next_engine():
+    router = EngineRouter(
+        {
+            "RegistryBroken": MockGenerator(error_rate=1.0),
+            "RegistryHealthy": MockGenerator(responses=[RESPONSE]),
+        },
+        policy="failover",
+    )
+    assert router.generate_content("system", "user") == RESPONSE
+    assert router.last_engine == "RegistryHealthy"
+    assert router.stats["RegistryBroken"]["errors"] == 1
@@ -0,0 +1,79 @@
+import math
+import array
+import random
+import wave
+from openinterview.modules.voice.google import google_stt
+from openinterview.modules.voice.transcribe import (
+    MockRecognizer,
+    iter_transcribe_chunks,
+    split_on_silence,
+    stitch_transcript,
+)
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_audio(pattern, seed=0):
+    """Returns 16-bit PCM of ('speech' | 'pause', seconds) segments."""
+    rng = random.Random(seed)
+    samples = array.array("h")
+    for kind, seconds in pattern:
+        for n in range(int(seconds * SAMPLE_RATE)):
+            if kind == "speech":
+                # A voiced tone with a syllable-rate envelope and noise.
+                envelope = 0.85 + 0.15 * math.sin(2 * math.pi * 4 * n / SAMPLE_RATE)
+                value = 6000 * envelope * math.sin(2 * math.pi * 180 * n / SAMPLE_RATE)
+                value += rng.gauss(0, 300)
+            else:
+                value = rng.gauss(0, 20)
+            samples.append(max(-32768, min(32767, int(value))))
+    return samples.tobytes()
+
+
+def test_continuous_speech_is_not_dropped():
+    pcm = synthetic_audio([("speech", 60)])
+    chunks = split_on_silence(pcm, SAMPLE_RATE)
+    assert chunks
+    assert all(chunk.duration <= 30.0 + 1e-6 for chunk in chunks)
+    assert sum(chunk.duration for chunk in chunks) > 59
+
+
+def test_mostly_speech_is_cut_at_short_pauses():
+    pattern = []
+    for _ in range(4):
+        pattern += [("speech", 9), ("pause", 0.6)]
+    chunks = split_on_silence(synthetic_audio(pattern), SAMPLE_RATE)
+    assert len(chunks) == 4
+    for i, chunk in enumerate(chunks):
+        assert abs(chunk.start - i * 9.6) < 0.5
+        assert 8.5 < chunk.duration < 10.0
+
+
+def test_silence_is_trimmed_and_dropped():
+    pcm = synthetic_audio([("pause", 5), ("speech", 4), ("pause", 40)])
+    chunks = split_on_silence(pcm, SAMPLE_RATE)
+    assert len(chunks) == 1
+    assert 4.5 < chunks[0].start < 5.0 and chunks[0].end < 9.5
+    assert split_on_silence(bytes(SAMPLE_RATE * 2 * 10), SAMPLE_RATE) == []
+
+
+def test_chunks_are_transcribed_and_stitched_in_order():
+    pattern = []
+    for _ in range(4):
+        pattern += [("speech", 9), ("pause", 0.6)]
+    chunks = split_on_silence(synthetic_audio(pattern), SAMPLE_RATE)
+    recognizer = MockRecognizer(["one", "two", "three", "four"])
+    segments = list(iter_transcribe_chunks(chunks, recognizer, max_workers=4))
+    assert recognizer.calls == 4
+    assert stitch_transcript(segments) == "one two three four"
+
+
+def test_chunked_google_stt_transcribes_long_answers(tmp_path):
+    path = str(tmp_path / "answer.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(synthetic_audio([("speech", 60)]))
+    text = google_stt(path, recognizer=MockRecognizer(), chunked=True)
+    assert text.startswith("[0.0-")